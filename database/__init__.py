@@ -1,3 +1,3 @@
 # database/__init__.py
 
-from .connection import database, metadata
+from .connection import database, metadata, schema
@@ -0,0 +1,195 @@
+# database/instrument.py
+"""
+쿼리별 계측 (RoutingDatabase 가 호출).
+
+- SQL 을 정규화(리터럴 → ?, 공백 정리)한 문장별로 횟수 / 누적·최대 시간 / 반환 행 수 / 지연 히스토그램
+- 문장마다 처음 한 번, 그리고 느릴 때(QUERY_EXPLAIN_SEC 간격) EXPLAIN QUERY PLAN 을 백그라운드로 받아 둠
+  → 테이블 전체 스캔(SCAN t), 임시 정렬(TEMP B-TREE) 표시
+- SLOW_QUERY_MS 를 넘은 실행은 최근 SLOW_LOG_SIZE 건까지 보관 + 로그 출력
+  (바인딩 값은 보관/표시하지 않고 파라미터 이름·타입만 - 세션 ID, 비밀번호 해시가 관리자 화면에 남지 않게)
+- 요청 경로에서 하는 일은 perf_counter 2번 + dict 갱신뿐 (정규화 결과는 SQL 문자열별로 캐시)
+- 시간은 커넥션을 잡은 뒤 문장 실행 구간만 (풀 대기는 db_pool_wait_seconds 로 따로 봄)
+"""
+import asyncio
+import contextvars
+import os
+import re
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SLOW_LOG_SIZE = int(os.getenv("SLOW_LOG_SIZE", "200"))
+QUERY_EXPLAIN_SEC = float(os.getenv("QUERY_EXPLAIN_SEC", "300"))
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS", "1") == "1"
+QUERY_STATS_MAX = int(os.getenv("QUERY_STATS_MAX", "2000"))   # 정규화 문장 최대 개수
+
+# 히스토그램 상한 (ms), 마지막 칸은 그 이상
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w:])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+_TABLE_SCAN = re.compile(r"SCAN (?!CONSTANT ROW)\w+(?: |$)(?!VIRTUAL TABLE)")   # 서브쿼리/가상 테이블 순회 제외
+
+
+def normalize_sql(sql: str) -> str:
+    s = _STRING.sub("?", sql)
+    s = _NUMBER.sub("?", s)
+    s = _IN_LIST.sub("(?)", s)
+    return _SPACE.sub(" ", s).strip()
+
+
+def plan_flags(plan: List[str]) -> List[str]:
+    flags = []
+    if any(_TABLE_SCAN.match(d) and " USING " not in d for d in plan):
+        flags.append("full scan")
+    if any("TEMP B-TREE" in d for d in plan):
+        flags.append("temp b-tree")
+    return flags
+
+
+class StatementStats:
+    __slots__ = ("sql", "count", "total_ms", "max_ms", "rows", "buckets",
+                 "plan", "explained_at")
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.plan: Optional[List[str]] = None
+        self.explained_at = 0.0
+
+    def percentile(self, p: float) -> Optional[float]:
+        """히스토그램 칸 상한 기준 근사 백분위 (ms)"""
+        if not self.count:
+            return None
+        target, acc = p * self.count, 0
+        for i, n in enumerate(self.buckets):
+            acc += n
+            if acc >= target:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "rows": self.rows,
+            "histogram": dict(zip([f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"], self.buckets)),
+            "plan": self.plan,
+            "flags": plan_flags(self.plan or []),
+        }
+
+
+class QueryStats:
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS, slow_log_size: int = SLOW_LOG_SIZE):
+        self.slow_ms = slow_ms
+        self.enabled = QUERY_STATS_ENABLED
+        self.started_at = time.time()
+        self._stats: Dict[str, StatementStats] = {}
+        self._normalized: Dict[str, str] = {}
+        self.slow_log: "deque[Dict[str, Any]]" = deque(maxlen=slow_log_size)
+        self._explaining: set = set()
+
+    def _key(self, sql: str) -> str:
+        key = self._normalized.get(sql)
+        if key is None:
+            if len(self._normalized) >= QUERY_STATS_MAX:
+                self._normalized.clear()   # 값이 박힌 동적 SQL 이 많으면 캐시만 비움
+            key = self._normalized[sql] = normalize_sql(sql)
+        return key
+
+    def observe(self, reader, query: Any, values: Optional[dict], elapsed: float, rows: int) -> None:
+        """실행 1건 기록. 처음 본 문장 / 느린 실행이면 실행 계획 수집 예약"""
+        sql = query if isinstance(query, str) else str(query)
+        key = self._key(sql)
+        st = self._stats.get(key)
+        if st is None:
+            if len(self._stats) >= QUERY_STATS_MAX:
+                return
+            st = self._stats[key] = StatementStats(key)
+        ms = elapsed * 1000.0
+        st.count += 1
+        st.total_ms += ms
+        st.rows += rows
+        if ms > st.max_ms:
+            st.max_ms = ms
+        st.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+
+        slow = ms >= self.slow_ms
+        if slow:
+            self.slow_log.append({
+                "at": time.time(), "time": time.strftime("%m-%d %H:%M:%S"), "ms": round(ms, 3), "sql": key, "rows": rows,
+                # 값은 남기지 않음 (세션 ID, 비밀번호 해시 등) - 파라미터 이름과 타입만
+                "values": {k: type(v).__name__ for k, v in (values or {}).items()},
+                "plan": st.plan,
+            })
+        if (st.plan is None and st.explained_at == 0.0) or (slow and time.time() - st.explained_at >= QUERY_EXPLAIN_SEC):
+            if self._schedule_explain(reader, st, sql, values, ms if slow else None):
+                return
+        if slow:
+            print(f"느린 쿼리 {ms:.1f}ms: {key}")
+
+    def _schedule_explain(self, reader, st: StatementStats, sql: str, values: Optional[dict],
+                          slow_ms: Optional[float]) -> bool:
+        """실행 계획 수집 태스크 예약 (느린 실행이면 계획과 함께 로그). 예약했으면 True"""
+        head = sql.lstrip().split(None, 1)
+        if not head or head[0].upper() not in _EXPLAINABLE or st.sql in self._explaining:
+            return False
+        st.explained_at = time.time()
+        self._explaining.add(st.sql)
+        # 빈 컨텍스트에서 실행 → 호출한 태스크의 트랜잭션/writer 커넥션을 물려받지 않음
+        # 바인딩 값은 EXPLAIN 에만 넘기고 보관하지 않음
+        asyncio.get_running_loop().create_task(
+            self._explain(reader, st, sql, dict(values or {}), slow_ms), context=contextvars.Context()
+        )
+        return True
+
+    async def _explain(self, reader, st: StatementStats, sql: str, values: dict, slow_ms: Optional[float]) -> None:
+        try:
+            rows = await reader.fetch_all("EXPLAIN QUERY PLAN " + sql, values)
+            st.plan = [r["detail"] for r in rows]
+            if slow_ms is not None:
+                for entry in reversed(self.slow_log):
+                    if entry["sql"] == st.sql:
+                        entry["plan"] = st.plan
+                        break
+                print(f"느린 쿼리 {slow_ms:.1f}ms: {st.sql}\n  계획: {' / '.join(st.plan)}")
+        except Exception as e:
+            st.plan = [f"(EXPLAIN 실패: {e})"]
+            if slow_ms is not None:
+                print(f"느린 쿼리 {slow_ms:.1f}ms: {st.sql}")
+        finally:
+            self._explaining.discard(st.sql)
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self.slow_log.clear()
+        self.started_at = time.time()
+
+    def snapshot(self, order: str = "total_ms", limit: int = 100) -> Dict[str, Any]:
+        stats = [s.to_dict() for s in self._stats.values()]
+        stats.sort(key=lambda s: s.get(order) or 0, reverse=True)
+        return {
+            "since": self.started_at,
+            "slow_ms": self.slow_ms,
+            "statements": stats[:limit],
+            "slow_log": list(reversed(self.slow_log)),
+        }
+
+
+query_stats = QueryStats()
@@ -0,0 +1,628 @@
+# database/migrations.py
+"""
+버전 기반 스키마 마이그레이션.
+
+- 현재 버전은 PRAGMA user_version 에 기록
+- 번호순으로 아직 적용되지 않은 마이그레이션만 트랜잭션 안에서 1회 실행
+- 스키마가 최신이면 부팅 시 쿼리 1번(버전 + 컬럼 목록 동시 조회)으로 끝남
+- 조회한 컬럼 목록은 `schema` 에 보관 → 런타임 컬럼 확인은 메모리 조회
+"""
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+MigrationFn = Callable[[object], Awaitable[None]]
+
+# (버전, 이름, 함수) — 버전은 1부터 빈틈없이 증가
+MIGRATIONS: List[Tuple[int, str, MigrationFn]] = []
+
+
+def migration(version: int, name: str):
+    """마이그레이션 등록 데코레이터"""
+    def deco(fn: MigrationFn) -> MigrationFn:
+        assert all(v != version for v, _, _ in MIGRATIONS), f"중복 마이그레이션 버전: {version}"
+        MIGRATIONS.append((version, name, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return deco
+
+
+class Schema:
+    """DB 에 실제로 존재하는 테이블/컬럼 (부팅 시 1회 로드)"""
+
+    def __init__(self):
+        self.version = 0
+        self.tables: Dict[str, Set[str]] = {}
+
+    def load(self, version: int, rows) -> None:
+        tables: Dict[str, Set[str]] = {}
+        for r in rows:
+            if r["tbl"] is not None:
+                tables.setdefault(r["tbl"], set()).add(r["col"])
+        self.version = version
+        self.tables = tables
+
+    def has_table(self, table: str) -> bool:
+        return table in self.tables
+
+    def has_column(self, table: str, column: str) -> bool:
+        return column in self.tables.get(table, ())
+
+
+schema = Schema()
+
+# 버전 + 전체 컬럼 목록을 한 번에 조회 (테이블이 하나도 없어도 버전 행은 1개 나오도록 LEFT JOIN)
+_SCHEMA_QUERY = """
+    SELECT v.user_version AS version, m.name AS tbl, p.name AS col
+    FROM pragma_user_version v
+    LEFT JOIN sqlite_master m ON m.type = 'table' AND m.name NOT LIKE 'sqlite_%%'
+    LEFT JOIN pragma_table_info(m.name) p
+"""
+
+
+async def _load_schema(db) -> int:
+    rows = await db.fetch_all(_SCHEMA_QUERY)
+    version = rows[0]["version"] if rows else 0
+    schema.load(version, rows)
+    return version
+
+
+async def run_migrations(db) -> int:
+    """미적용 마이그레이션 실행 후 현재 버전 반환"""
+    version = await _load_schema(db)
+    pending = [m for m in MIGRATIONS if m[0] > version]
+    if not pending:
+        return version
+
+    for v, name, fn in pending:
+        async with db.transaction():
+            await fn(db)
+            # PRAGMA 는 바인딩 불가 → 정수만 포맷
+            await db.execute(f"PRAGMA user_version = {int(v)}")
+        print(f"✅ 마이그레이션 적용: {v:03d} {name}")
+
+    return await _load_schema(db)
+
+
+# =========================
+# 헬퍼 (마이그레이션 내부 전용)
+# =========================
+async def _columns(db, table: str) -> Set[str]:
+    rows = await db.fetch_all("SELECT name FROM pragma_table_info(:t)", {"t": table})
+    return {r["name"] for r in rows}
+
+
+async def _add_column_if_missing(db, table: str, column: str, ddl: str) -> None:
+    """구버전 DB(과거 try/except ALTER 체인으로 만들어진 DB) 호환용"""
+    if column not in await _columns(db, table):
+        await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl};")
+
+
+# =========================
+# 마이그레이션 목록
+# =========================
+@migration(1, "base tables")
+async def _m001_base_tables(db):
+    # users
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL UNIQUE,
+        name TEXT NOT NULL,
+        nickname TEXT NOT NULL UNIQUE,
+        email TEXT UNIQUE,
+        password TEXT NOT NULL,
+        role TEXT DEFAULT 'user',
+        status TEXT DEFAULT 'active',
+        joined_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        two_factor BOOLEAN DEFAULT 0,
+        last_login DATETIME,
+        deleted BOOLEAN DEFAULT 0,
+        level INTEGER DEFAULT 1,
+        exp INTEGER DEFAULT 0,
+        total_posts INTEGER DEFAULT 0,
+        total_comments INTEGER DEFAULT 0,
+        total_likes INTEGER DEFAULT 0,
+        points INTEGER DEFAULT 0
+    );
+    """)
+
+    # posts (유저/관리자 공용)
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        board TEXT NOT NULL,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        author TEXT NOT NULL,
+        category TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        views INTEGER NOT NULL DEFAULT 0,
+        likes INTEGER NOT NULL DEFAULT 0,
+        dislikes INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT,
+        deleted INTEGER NOT NULL DEFAULT 0,
+        user_id INTEGER,
+        is_published INTEGER NOT NULL DEFAULT 1
+    );
+    """)
+
+    # 댓글
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS comments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER NOT NULL,
+        author TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        updated_at TEXT,
+        deleted INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY(post_id) REFERENCES posts(id)
+    );
+    """)
+
+    # 투표 (히트/폭망 구분)
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS post_votes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        vote_type TEXT NOT NULL CHECK (vote_type IN ('hit', 'bomb')),
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        UNIQUE(post_id, user_id),
+        FOREIGN KEY(post_id) REFERENCES posts(id),
+        FOREIGN KEY(user_id) REFERENCES users(id)
+    );
+    """)
+
+
+@migration(2, "legacy columns")
+async def _m002_legacy_columns(db):
+    # 기존 DB 에만 빠져 있을 수 있는 컬럼 (새 DB 는 001 에서 이미 생성됨)
+    for column, ddl in [
+        ("updated_at", "TEXT"),
+        ("deleted", "INTEGER NOT NULL DEFAULT 0"),
+        ("dislikes", "INTEGER NOT NULL DEFAULT 0"),
+        ("user_id", "INTEGER"),
+        ("is_published", "INTEGER NOT NULL DEFAULT 1"),
+    ]:
+        await _add_column_if_missing(db, "posts", column, ddl)
+
+    await _add_column_if_missing(db, "comments", "updated_at", "TEXT")
+
+    for column, ddl in [
+        ("level", "INTEGER DEFAULT 1"),
+        ("exp", "INTEGER DEFAULT 0"),
+        ("total_posts", "INTEGER DEFAULT 0"),
+        ("total_comments", "INTEGER DEFAULT 0"),
+        ("total_likes", "INTEGER DEFAULT 0"),
+        ("points", "INTEGER DEFAULT 0"),
+    ]:
+        await _add_column_if_missing(db, "users", column, ddl)
+
+
+@migration(3, "backfill posts.user_id / is_published")
+async def _m003_backfill_posts(db):
+    # 기존 게시글들의 user_id 설정 (author 이름을 기준으로) — 1회만 실행
+    await db.execute("""
+        UPDATE posts
+        SET user_id = (
+            SELECT id FROM users
+            WHERE users.name = posts.author
+        )
+        WHERE user_id IS NULL
+    """)
+    await db.execute("UPDATE posts SET is_published = 1 WHERE is_published IS NULL")
+
+
+@migration(4, "board / comment / vote indexes")
+async def _m004_indexes(db):
+    for ddl in [
+        "CREATE INDEX IF NOT EXISTS idx_posts_board_created ON posts(board, created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_posts_board_category ON posts(board, category)",
+        "CREATE INDEX IF NOT EXISTS idx_posts_board_views ON posts(board, views DESC, created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_posts_board_likes ON posts(board, likes DESC, created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_posts_board_dislikes ON posts(board, dislikes DESC, created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_comments_post ON comments(post_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_post_votes_post_user ON post_votes(post_id, user_id)",
+    ]:
+        await db.execute(ddl)
+
+
+@migration(5, "keyset pagination indexes / page anchors")
+async def _m005_keyset_pagination(db):
+    # 목록 정렬 키 끝에 id 를 붙인 부분 인덱스 (deleted = 0 만) → 커서 seek 1번
+    for ddl in [
+        "CREATE INDEX IF NOT EXISTS idx_posts_list_new ON posts(board, created_at DESC, id DESC) WHERE deleted = 0",
+        "CREATE INDEX IF NOT EXISTS idx_posts_list_view ON posts(board, views DESC, created_at DESC, id DESC) WHERE deleted = 0",
+        "CREATE INDEX IF NOT EXISTS idx_posts_list_like ON posts(board, likes DESC, created_at DESC, id DESC) WHERE deleted = 0",
+        "CREATE INDEX IF NOT EXISTS idx_posts_list_cat_new ON posts(board, category, created_at DESC, id DESC) WHERE deleted = 0",
+        "CREATE INDEX IF NOT EXISTS idx_posts_list_cat_view ON posts(board, category, views DESC, created_at DESC, id DESC) WHERE deleted = 0",
+        "CREATE INDEX IF NOT EXISTS idx_posts_list_cat_like ON posts(board, category, likes DESC, created_at DESC, id DESC) WHERE deleted = 0",
+    ]:
+        await db.execute(ddl)
+    # 위 인덱스로 대체된 기존 정렬 인덱스 (쓰기 비용만 증가)
+    for name in ["idx_posts_board_created", "idx_posts_board_views", "idx_posts_board_likes"]:
+        await db.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # "N페이지로 이동"용 앵커 (ANCHOR_STRIDE 행마다 정렬 키 저장, category '' = 전체)
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS post_page_anchors (
+        board TEXT NOT NULL,
+        category TEXT NOT NULL DEFAULT '',
+        sort TEXT NOT NULL,
+        row_offset INTEGER NOT NULL,
+        k1 INTEGER,
+        created_at TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        PRIMARY KEY (board, category, sort, row_offset)
+    ) WITHOUT ROWID;
+    """)
+
+
+@migration(6, "posts full-text search (fts5 trigram)")
+async def _m006_posts_fts(db):
+    # posts 를 외부 콘텐츠로 쓰는 FTS5 색인 (본문은 posts 에만 저장)
+    await db.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content,
+        content='posts', content_rowid='id',
+        tokenize='trigram'
+    );
+    """)
+
+    # 색인에는 deleted = 0 인 글만 유지 (작성/수정/소프트 삭제/복구 모두 트리거로 반영)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_posts_fts_insert AFTER INSERT ON posts
+    WHEN new.deleted = 0
+    BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END;
+    """)
+    # 한 트리거 안에서 '기존 색인 제거 → 새 값 색인' 순서를 보장
+    # (트리거를 둘로 나누면 SQLite 는 나중에 만든 트리거를 먼저 실행해 색인이 깨짐)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_posts_fts_update AFTER UPDATE OF title, content, deleted ON posts
+    BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        SELECT 'delete', old.id, old.title, old.content WHERE old.deleted = 0;
+        INSERT INTO posts_fts(rowid, title, content)
+        SELECT new.id, new.title, new.content WHERE new.deleted = 0;
+    END;
+    """)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_posts_fts_delete AFTER DELETE ON posts
+    WHEN old.deleted = 0
+    BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END;
+    """)
+
+    await db.execute("""
+        INSERT INTO posts_fts(rowid, title, content)
+        SELECT id, title, content FROM posts WHERE deleted = 0
+    """)
+
+
+@migration(7, "board_counters (trigger-maintained post counts)")
+async def _m007_board_counters(db):
+    # 목록에 보이는 글(deleted = 0 AND is_published 1/NULL) 수를 (board, category) 별로 유지
+    # category NULL 은 '' 로 저장, 보드 전체 수는 SUM(post_count)
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS board_counters (
+        board TEXT NOT NULL,
+        category TEXT NOT NULL DEFAULT '',
+        post_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (board, category)
+    ) WITHOUT ROWID;
+    """)
+
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_board_counters_insert AFTER INSERT ON posts
+    WHEN new.deleted = 0 AND COALESCE(new.is_published, 1) = 1
+    BEGIN
+        INSERT INTO board_counters (board, category, post_count)
+        VALUES (new.board, COALESCE(new.category, ''), 1)
+        ON CONFLICT(board, category) DO UPDATE SET post_count = post_count + 1;
+    END;
+    """)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_board_counters_update AFTER UPDATE OF board, category, deleted, is_published ON posts
+    BEGIN
+        UPDATE board_counters SET post_count = post_count - 1
+        WHERE board = old.board AND category = COALESCE(old.category, '')
+          AND old.deleted = 0 AND COALESCE(old.is_published, 1) = 1;
+        INSERT INTO board_counters (board, category, post_count)
+        SELECT new.board, COALESCE(new.category, ''), 1
+        WHERE new.deleted = 0 AND COALESCE(new.is_published, 1) = 1
+        ON CONFLICT(board, category) DO UPDATE SET post_count = post_count + 1;
+    END;
+    """)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_board_counters_delete AFTER DELETE ON posts
+    WHEN old.deleted = 0 AND COALESCE(old.is_published, 1) = 1
+    BEGIN
+        UPDATE board_counters SET post_count = post_count - 1
+        WHERE board = old.board AND category = COALESCE(old.category, '');
+    END;
+    """)
+
+    await db.execute("DELETE FROM board_counters")
+    await db.execute("""
+        INSERT INTO board_counters (board, category, post_count)
+        SELECT board, COALESCE(category, ''), COUNT(*)
+        FROM posts
+        WHERE deleted = 0 AND COALESCE(is_published, 1) = 1
+        GROUP BY board, COALESCE(category, '')
+    """)
+
+
+@migration(8, "post_votes transition columns (vote upsert)")
+async def _m008_post_votes_upsert(db):
+    # 투표 취소를 행 삭제 대신 vote_type = NULL 로 남기고, 직전 상태를 prev_type 에 기록
+    # → INSERT ... ON CONFLICT DO UPDATE ... RETURNING 한 문장으로 전이(없음/히트/폭망)를 판정
+    # CHECK 제약을 바꿔야 하므로 테이블을 다시 만든다
+    await db.execute("""
+    CREATE TABLE post_votes_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        vote_type TEXT CHECK (vote_type IN ('hit', 'bomb')),
+        prev_type TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        UNIQUE(post_id, user_id),
+        FOREIGN KEY(post_id) REFERENCES posts(id),
+        FOREIGN KEY(user_id) REFERENCES users(id)
+    );
+    """)
+    await db.execute("""
+        INSERT INTO post_votes_new (id, post_id, user_id, vote_type, created_at)
+        SELECT id, post_id, user_id, vote_type, created_at FROM post_votes
+    """)
+    await db.execute("DROP TABLE post_votes")
+    await db.execute("ALTER TABLE post_votes_new RENAME TO post_votes")
+    # UNIQUE(post_id, user_id) 자동 인덱스가 있으므로 idx_post_votes_post_user 는 다시 만들지 않음
+
+
+@migration(9, "post_reactions ledger (likes + votes)")
+async def _m009_post_reactions(db):
+    # (post_id, user_id) 당 반응 1개: 'like' / 'hit' / 'bomb', 취소는 kind = NULL
+    # WITHOUT ROWID + PK 라 내 반응 조회는 PK 인덱스만 읽음
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS post_reactions (
+        post_id INTEGER NOT NULL REFERENCES posts(id),
+        user_id INTEGER NOT NULL REFERENCES users(id),
+        kind TEXT CHECK (kind IN ('like', 'hit', 'bomb')),
+        prev_kind TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        PRIMARY KEY (post_id, user_id)
+    ) WITHOUT ROWID;
+    """)
+    await db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_post_reactions_user ON post_reactions(user_id, post_id, kind)"
+    )
+
+    # 히트/폭망 먼저 옮김
+    await db.execute("""
+        INSERT OR IGNORE INTO post_reactions (post_id, user_id, kind, created_at)
+        SELECT post_id, user_id, vote_type, created_at
+        FROM post_votes
+        WHERE vote_type IS NOT NULL
+    """)
+
+    # post_likes 는 create_tables() 가 만든 적이 없어 구버전 DB 에만 있음
+    if await _columns(db, "post_likes"):
+        # 같은 사람이 추천과 투표를 둘 다 했으면 투표만 남기고, 이중으로 올라간 likes 를 되돌림
+        await db.execute("""
+            UPDATE posts
+            SET likes = MAX(likes - (
+                SELECT COUNT(*) FROM post_likes l
+                JOIN post_reactions r ON r.post_id = l.post_id AND r.user_id = l.user_id
+                WHERE l.post_id = posts.id
+            ), 0)
+            WHERE id IN (
+                SELECT l.post_id FROM post_likes l
+                JOIN post_reactions r ON r.post_id = l.post_id AND r.user_id = l.user_id
+            )
+        """)
+        await db.execute("""
+            INSERT OR IGNORE INTO post_reactions (post_id, user_id, kind, created_at)
+            SELECT post_id, user_id, 'like', created_at FROM post_likes
+        """)
+        await db.execute("DROP TABLE post_likes")
+
+    await db.execute("DROP TABLE IF EXISTS post_votes")
+
+
+@migration(10, "exp_events (exp award log)")
+async def _m010_exp_events(db):
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS exp_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        reason TEXT NOT NULL,
+        exp_delta INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    """)
+    await db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_exp_events_user ON exp_events(user_id, created_at)"
+    )
+
+
+@migration(11, "sessions (server-side session store)")
+async def _m011_sessions(db):
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS sessions (
+        id TEXT PRIMARY KEY,
+        user_id INTEGER,
+        data TEXT NOT NULL,
+        expires_at INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)")
+
+
+@migration(12, "post_trending (time-decayed trending ranking)")
+async def _m012_post_trending(db):
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS post_trending (
+        post_id INTEGER PRIMARY KEY,
+        board TEXT NOT NULL,
+        score REAL NOT NULL,
+        comment_count INTEGER NOT NULL DEFAULT 0,
+        created_ts INTEGER NOT NULL
+    );
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_post_trending_score ON post_trending(score DESC)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_post_trending_board ON post_trending(board, score DESC)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_post_trending_created ON post_trending(created_ts)")
+
+    # 점수를 다시 계산할 글 (트리거가 기록, 인기글 갱신 작업이 비움)
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS trending_dirty (
+        post_id INTEGER PRIMARY KEY
+    );
+    """)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_trending_post_insert AFTER INSERT ON posts
+    BEGIN
+        INSERT OR IGNORE INTO trending_dirty (post_id) VALUES (new.id);
+    END;
+    """)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_trending_post_update
+    AFTER UPDATE OF board, views, likes, dislikes, deleted, is_published, created_at ON posts
+    BEGIN
+        INSERT OR IGNORE INTO trending_dirty (post_id) VALUES (new.id);
+    END;
+    """)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_trending_post_delete AFTER DELETE ON posts
+    BEGIN
+        INSERT OR IGNORE INTO trending_dirty (post_id) VALUES (old.id);
+    END;
+    """)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_trending_comment_insert AFTER INSERT ON comments
+    BEGIN
+        INSERT OR IGNORE INTO trending_dirty (post_id) VALUES (new.post_id);
+    END;
+    """)
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_trending_comment_update AFTER UPDATE OF deleted ON comments
+    BEGIN
+        INSERT OR IGNORE INTO trending_dirty (post_id) VALUES (new.post_id);
+    END;
+    """)
+
+    # 기간 안의 글은 첫 갱신에서 계산
+    await db.execute("""
+        INSERT OR IGNORE INTO trending_dirty (post_id)
+        SELECT id FROM posts
+        WHERE deleted = 0 AND created_at >= datetime('now', '-30 days')
+    """)
+
+
+@migration(13, "trending_dirty generation (mark survives concurrent refresh)")
+async def _m013_trending_dirty_gen(db):
+    # 갱신 작업은 reader 에서 읽고 계산한 뒤 짧은 쓰기 트랜잭션에서 표시를 지움
+    # → 읽은 뒤에 다시 바뀐 글의 표시까지 지우지 않도록, 표시할 때마다 gen 을 올리고 읽은 gen 과 같을 때만 지움
+    await db.execute("ALTER TABLE trending_dirty ADD COLUMN gen INTEGER NOT NULL DEFAULT 0")
+    mark = """
+        INSERT INTO trending_dirty (post_id) VALUES ({id})
+        ON CONFLICT(post_id) DO UPDATE SET gen = gen + 1;
+    """
+    triggers = (
+        ("trg_trending_post_insert", "AFTER INSERT ON posts", "new.id"),
+        ("trg_trending_post_update",
+         "AFTER UPDATE OF board, views, likes, dislikes, deleted, is_published, created_at ON posts", "new.id"),
+        ("trg_trending_post_delete", "AFTER DELETE ON posts", "old.id"),
+        ("trg_trending_comment_insert", "AFTER INSERT ON comments", "new.post_id"),
+        ("trg_trending_comment_update", "AFTER UPDATE OF deleted ON comments", "new.post_id"),
+    )
+    for name, event, post_id in triggers:
+        await db.execute(f"DROP TRIGGER IF EXISTS {name}")
+        await db.execute(f"""
+        CREATE TRIGGER {name} {event}
+        BEGIN
+            {mark.format(id=post_id).strip()}
+        END;
+        """)
+
+
+def bigram_sql(expr: str) -> str:
+    """expr(글 제목/본문 SQL 식) → 공백 없는 두 글자 조각을 정렬·중복 제거해 공백으로 이은 문자열 (SQL 식, 트리거용)
+    posts_bigram 은 내용을 저장하지 않아 삭제 때 같은 값을 다시 만들어 넘김 → bigrams() 와 결과가 같아야 함"""
+    return f"""(
+        WITH RECURSIVE n(i, t) AS (
+            SELECT 1, replace(replace(replace(COALESCE({expr}, ''), char(10), ' '), char(13), ' '), char(9), ' ')
+            UNION ALL SELECT i + 1, t FROM n WHERE i < length(t) - 1
+        )
+        SELECT group_concat(g, ' ') FROM (
+            SELECT DISTINCT substr(t, i, 2) AS g FROM n
+            WHERE length(g) = 2 AND instr(g, ' ') = 0
+            ORDER BY g
+        )
+    )"""
+
+
+def bigrams(text: Optional[str]) -> Optional[str]:
+    """bigram_sql 의 파이썬 버전 (대량 색인용, SQL 보다 훨씬 빠름)"""
+    t = (text or "").replace("\n", " ").replace("\r", " ").replace("\t", " ")
+    grams = sorted({t[i:i + 2] for i in range(len(t) - 1)})
+    return " ".join(g for g in grams if " " not in g) or None
+
+
+@migration(14, "posts bigram index (2-letter search terms)")
+async def _m014_posts_bigram(db):
+    # trigram(posts_fts) 으로는 찾을 수 없는 두 글자 검색어(주식, 코인, 금리 …)용 색인
+    # 두 글자 조각을 미리 만들어 unicode61 토큰으로 넣음, 본문은 posts 에만 있으므로 contentless
+    await db.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_bigram USING fts5(
+        title, content,
+        content='',
+        tokenize='unicode61'
+    );
+    """)
+
+    # posts_fts 와 같은 조건/순서로 유지 (deleted = 0 인 글만)
+    await db.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_posts_bigram_insert AFTER INSERT ON posts
+    WHEN new.deleted = 0
+    BEGIN
+        INSERT INTO posts_bigram(rowid, title, content)
+        VALUES (new.id, {bigram_sql('new.title')}, {bigram_sql('new.content')});
+    END;
+    """)
+    await db.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_posts_bigram_update AFTER UPDATE OF title, content, deleted ON posts
+    BEGIN
+        INSERT INTO posts_bigram(posts_bigram, rowid, title, content)
+        SELECT 'delete', old.id, {bigram_sql('old.title')}, {bigram_sql('old.content')} WHERE old.deleted = 0;
+        INSERT INTO posts_bigram(rowid, title, content)
+        SELECT new.id, {bigram_sql('new.title')}, {bigram_sql('new.content')} WHERE new.deleted = 0;
+    END;
+    """)
+    await db.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_posts_bigram_delete AFTER DELETE ON posts
+    WHEN old.deleted = 0
+    BEGIN
+        INSERT INTO posts_bigram(posts_bigram, rowid, title, content)
+        VALUES ('delete', old.id, {bigram_sql('old.title')}, {bigram_sql('old.content')});
+    END;
+    """)
+
+    # 기존 글 색인은 파이썬에서 만들어 나눠 넣음 (행마다 재귀 CTE 는 대량에서 느림)
+    last = 0
+    while True:
+        rows = await db.fetch_all(
+            "SELECT id, title, content FROM posts WHERE id > :last AND deleted = 0 ORDER BY id LIMIT 5000",
+            {"last": last},
+        )
+        if not rows:
+            break
+        await db.execute_many(
+            "INSERT INTO posts_bigram(rowid, title, content) VALUES (:id, :title, :content)",
+            [{"id": r["id"], "title": bigrams(r["title"]), "content": bigrams(r["content"])} for r in rows],
+        )
+        last = rows[-1]["id"]
@@ -0,0 +1,268 @@
+# database/pool.py
+"""
+SQLite 전용 커넥션 풀 / 읽기·쓰기 라우팅.
+
+- databases 기본 SQLite 백엔드는 쿼리마다 aiosqlite 커넥션(=스레드)을 새로 연다.
+  여기서는 커넥션을 미리 열어두고 재사용하며, 열 때 PRAGMA를 한 번만 적용한다.
+- 쓰기 커넥션은 1개(프로세스 내 writer 직렬화), 읽기 커넥션은 N개(mode=ro).
+- WAL 모드에서는 리더가 라이터를 기다리지 않는다.
+"""
+import asyncio
+import time
+import typing
+
+import aiosqlite
+from databases import Database
+from databases.backends.sqlite import SQLiteBackend, SQLiteConnection
+
+from models.metrics import db_pool_wait, db_pool_waiting
+
+
+class PooledSQLitePool:
+    """고정 크기 aiosqlite 커넥션 풀 (databases SQLitePool 인터페이스 호환)"""
+
+    def __init__(self, path: str, size: int = 1, readonly: bool = False,
+                 pragmas: typing.Optional[typing.Dict[str, typing.Any]] = None):
+        self._path = path
+        self._size = max(int(size), 1)
+        self._readonly = readonly
+        self.name = "reader" if readonly else "writer"   # 메트릭 라벨
+        self._pragmas = pragmas or {}
+        self._idle: typing.Optional[asyncio.Queue] = None
+        self._all: typing.List[aiosqlite.Connection] = []
+        self._memref = None  # SQLiteBackend.disconnect() 호환용
+
+    async def _open_one(self) -> aiosqlite.Connection:
+        if self._readonly:
+            conn = aiosqlite.connect(f"file:{self._path}?mode=ro", uri=True, isolation_level=None)
+        else:
+            conn = aiosqlite.connect(self._path, isolation_level=None)
+        await conn.__aenter__()
+        if not self._readonly:
+            # journal_mode 는 DB 파일에 영구 저장되므로 writer 에서만 설정
+            await conn.execute("PRAGMA journal_mode=WAL")
+        for name, value in self._pragmas.items():
+            await conn.execute(f"PRAGMA {name}={value}")
+        if self._readonly:
+            await conn.execute("PRAGMA query_only=1")
+        return conn
+
+    async def open(self) -> None:
+        if self._idle is not None:
+            return
+        idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(self._size):
+            conn = await self._open_one()
+            self._all.append(conn)
+            idle.put_nowait(conn)
+        self._idle = idle
+
+    async def close(self) -> None:
+        if self._idle is None:
+            return
+        for conn in self._all:
+            try:
+                await conn.__aexit__(None, None, None)
+            except Exception:
+                pass
+        self._all.clear()
+        self._idle = None
+
+    async def acquire(self) -> aiosqlite.Connection:
+        if self._idle is None:
+            await self.open()
+        if not self._idle.empty():
+            db_pool_wait.observe(0.0, self.name)
+            return self._idle.get_nowait()
+        # 빈 커넥션이 없음 → 기다린 시간 기록
+        started = time.perf_counter()
+        db_pool_waiting.inc(self.name)
+        try:
+            return await self._idle.get()
+        finally:
+            db_pool_waiting.dec(self.name)
+            db_pool_wait.observe(time.perf_counter() - started, self.name)
+
+    async def release(self, connection: aiosqlite.Connection) -> None:
+        # 트랜잭션이 열린 채 반환되면(예외 등) 롤백 후 풀에 되돌림
+        if connection.in_transaction:
+            try:
+                await connection.rollback()
+            except Exception:
+                pass
+        if self._idle is not None:
+            self._idle.put_nowait(connection)
+
+    @property
+    def waiting(self) -> int:
+        """커넥션을 기다리는 중인 코루틴 수(대략값)"""
+        if self._idle is None:
+            return 0
+        return len(getattr(self._idle, "_getters", ()) or ())
+
+
+class PooledSQLiteConnection(SQLiteConnection):
+    async def execute_many(self, queries: typing.List[typing.Any]) -> None:
+        """같은 SQL 이면 aiosqlite executemany 한 번으로 처리 (기본 구현은 행마다 execute)"""
+        assert self._connection is not None, "Connection is not acquired"
+        compiled = [self._compile(q) for q in queries]
+        if not compiled:
+            return
+        sql = compiled[0][0]
+        if any(c[0] != sql for c in compiled):
+            for query_str, args, _, _ in compiled:
+                await self._connection.execute(query_str, args)
+            return
+        await self._connection.executemany(sql, [c[1] for c in compiled])
+
+
+class PooledSQLiteBackend(SQLiteBackend):
+    """databases SQLiteBackend 에 고정 풀을 꽂은 버전"""
+
+    def __init__(self, database_url, **options: typing.Any) -> None:
+        super().__init__(database_url)
+        self._options = options
+        self._pool = PooledSQLitePool(
+            self._database_url.database,
+            size=options.get("pool_size", 1),
+            readonly=options.get("readonly", False),
+            pragmas=options.get("pragmas"),
+        )
+
+    async def connect(self) -> None:
+        await self._pool.open()
+
+    async def disconnect(self) -> None:
+        await self._pool.close()
+
+    def connection(self) -> PooledSQLiteConnection:
+        return PooledSQLiteConnection(self._pool, self._dialect)
+
+
+class PooledDatabase(Database):
+    SUPPORTED_BACKENDS = {
+        **Database.SUPPORTED_BACKENDS,
+        "sqlite": "database.pool:PooledSQLiteBackend",
+    }
+
+
+def is_read_query(query: typing.Any) -> bool:
+    """SELECT 만 읽기 전용으로 판단 (UPDATE ... RETURNING 등은 writer)"""
+    if isinstance(query, str):
+        head = query.lstrip().split(None, 1)
+        return bool(head) and head[0].upper() == "SELECT"
+    return bool(getattr(query, "is_select", False))
+
+
+class RoutingDatabase:
+    """
+    databases.Database 와 같은 인터페이스.
+    - SELECT → reader 풀
+    - 그 외(INSERT/UPDATE/DELETE/DDL/트랜잭션) → writer 커넥션
+    - 현재 태스크가 writer 커넥션/트랜잭션을 잡고 있으면 SELECT 도 writer 로 보내
+      자기 트랜잭션의 미커밋 변경을 읽을 수 있게 한다.
+    - stats(database/instrument.QueryStats)가 있으면 모든 실행의 시간/행 수를 기록
+    """
+
+    def __init__(self, writer: Database, reader: Database, stats: typing.Any = None):
+        self.writer = writer
+        self.reader = reader
+        self.stats = stats
+
+    @property
+    def is_connected(self) -> bool:
+        return self.writer.is_connected and self.reader.is_connected
+
+    @property
+    def url(self):
+        return self.writer.url
+
+    async def connect(self) -> None:
+        # writer 가 먼저 열려야 WAL 전환 + -shm 파일이 생겨 mode=ro 리더가 열린다
+        await self.writer.connect()
+        await self.reader.connect()
+
+    async def disconnect(self) -> None:
+        await self.reader.disconnect()
+        await self.writer.disconnect()
+
+    async def __aenter__(self) -> "RoutingDatabase":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        await self.disconnect()
+
+    def _in_writer(self) -> bool:
+        return self.writer._connection is not None
+
+    def _route(self, query: typing.Any) -> Database:
+        if self._in_writer() or not is_read_query(query):
+            return self.writer
+        return self.reader
+
+    def _observe(self, query, values, elapsed: float, rows: int) -> None:
+        stats = self.stats
+        if stats is not None and stats.enabled:
+            stats.observe(self.reader, query, values, elapsed, rows)
+
+    # 시간은 커넥션을 잡은 뒤 실행 구간만 잰다 (풀 대기는 db_pool_wait_seconds 에 따로 기록)
+    async def fetch_all(self, query, values: typing.Optional[dict] = None):
+        async with self._route(query).connection() as conn:
+            started = time.perf_counter()
+            rows = await conn.fetch_all(query, values)
+            self._observe(query, values, time.perf_counter() - started, len(rows))
+        return rows
+
+    async def fetch_one(self, query, values: typing.Optional[dict] = None):
+        async with self._route(query).connection() as conn:
+            started = time.perf_counter()
+            row = await conn.fetch_one(query, values)
+            self._observe(query, values, time.perf_counter() - started, row is not None)
+        return row
+
+    async def fetch_val(self, query, values: typing.Optional[dict] = None, column: typing.Any = 0):
+        async with self._route(query).connection() as conn:
+            started = time.perf_counter()
+            value = await conn.fetch_val(query, values, column=column)
+            self._observe(query, values, time.perf_counter() - started, value is not None)
+        return value
+
+    async def execute(self, query, values: typing.Optional[dict] = None):
+        async with self.writer.connection() as conn:
+            started = time.perf_counter()
+            result = await conn.execute(query, values)
+            self._observe(query, values, time.perf_counter() - started, 0)
+        return result
+
+    async def execute_many(self, query, values: list) -> None:
+        async with self.writer.connection() as conn:
+            started = time.perf_counter()
+            await conn.execute_many(query, values)
+            self._observe(query, values[0] if values else None, time.perf_counter() - started, 0)
+
+    async def iterate(self, query, values: typing.Optional[dict] = None):
+        # 호출 측이 행을 처리하는 시간은 빼고 다음 행을 가져오는 시간만 합산
+        elapsed, rows = 0.0, 0
+        async with self._route(query).connection() as conn:
+            records = conn.iterate(query, values).__aiter__()
+            try:
+                while True:
+                    started = time.perf_counter()
+                    try:
+                        record = await records.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        elapsed += time.perf_counter() - started
+                    rows += 1
+                    yield record
+            finally:
+                await records.aclose()
+        self._observe(query, values, elapsed, rows)
+
+    def connection(self):
+        return self.writer.connection()
+
+    def transaction(self, **kwargs: typing.Any):
+        return self.writer.transaction(**kwargs)
@@ -0,0 +1,472 @@
+# loadtest.py
+"""
+HTTP 부하 테스트 (시나리오 혼합, 엔드포인트별 처리량/지연 백분위 → JSON, 기준선 비교).
+
+    python seed.py --db /tmp/big.sqlite3 --users 20000 --posts 500000           # 먼저 데이터
+    python loadtest.py --db /tmp/big.sqlite3 --duration 30 --out result.json    # 앱을 같은 프로세스에서 실행
+    python loadtest.py --db /tmp/big.sqlite3 --uvicorn --save-baseline bench.json
+    python loadtest.py --db /tmp/big.sqlite3 --uvicorn --baseline bench.json    # 회귀면 종료 코드 1
+    python loadtest.py --db /tmp/big.sqlite3 --url http://127.0.0.1:8000        # 이미 떠 있는 서버
+
+- 실행 방식
+  · 기본: httpx.ASGITransport 로 main.app 을 같은 이벤트 루프에서 호출 (lifespan 포함).
+    클라이언트 비용도 같은 루프에서 들므로 절대값보다 전후 비교용
+  · --uvicorn: uvicorn 서브프로세스(DB_PATH=--db)로 띄워서 실제 소켓으로 측정
+  · --url: 외부 서버. --db 는 게시판/글/계정 목록을 읽는 데만 사용 (같은 DB 파일이어야 함)
+- 가상 사용자(--concurrency) 중 --login-ratio 만큼은 시드 계정(seed.py, SEED_PASSWORD)으로 로그인한 상태.
+  쓰기 시나리오(comment/vote/like)는 로그인 사용자만, 나머지는 비율대로 섞임 (비로그인 GET 은 페이지 캐시를 탐)
+- 시나리오 (--mix 이름=가중치,...)
+  list    목록 앞쪽 페이지 (sort new/view/like, 가끔 말머리)
+  deep    깊은 페이지 (FRAGMENT_MAX_PAGE 이후, 오프셋/앵커 경로)
+  search  목록 검색 q
+  view    글 보기
+  comment 댓글 작성 (303)
+  vote    히트/폭망 투표 토글 (같은 글 다시 누르면 취소). 사용할 계정 포인트는 시작 전에 채워 둠
+  like    추천 토글
+  login   로그인 (bcrypt 검증 비용 포함, 별도 클라이언트)
+- 기준선 비교: 시나리오별 p50/p99 가 --tolerance 이상 느려지거나(그리고 --min-ms 이상 차이),
+  처리량이 --tolerance 이상 줄거나, 오류율이 1%p 넘게 늘면 회귀
+- 쓰기 시나리오가 DB 를 바꾸므로 운영 DB 가 아닌 시드 DB 사본에 돌릴 것
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+import httpx
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+SEED_PASSWORD = os.getenv("SEED_PASSWORD", "seed1234")
+FRAGMENT_MAX_PAGE = int(os.getenv("FRAGMENT_MAX_PAGE", "3"))
+PAGE_SIZE = 20
+
+DEFAULT_MIX = "list=30,deep=5,search=8,view=35,comment=5,vote=6,like=6,login=5"
+WRITES = {"comment", "vote", "like"}
+SEARCH_WORDS = ["비트코인", "삼성전자", "손흥민", "롤", "고양이", "점심", "후기", "질문", "정리", "버그", "패치", "여행"]
+COMMENT_WORDS = ["좋은 글 감사합니다", "공감합니다", "정보 감사해요", "ㅋㅋㅋ", "저도 같은 생각"]
+
+
+# ── 대상 데이터 ──
+
+class Dataset:
+    """게시판별 글 수 / 글 id 표본 / 로그인 계정 (--db 에서 읽음)"""
+
+    def __init__(self, db_path: str, sample: int, accounts: int, prefix: str, rng: random.Random):
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            self.boards: Dict[str, int] = {
+                b: n for b, n in conn.execute(
+                    "SELECT board, SUM(post_count) FROM board_counters GROUP BY board HAVING SUM(post_count) > 0")
+            }
+            self.categories: Dict[str, List[str]] = {}
+            for b, c in conn.execute("SELECT board, category FROM board_counters WHERE category != '' AND post_count > 0"):
+                self.categories.setdefault(b, []).append(c)
+            lo, hi = conn.execute("SELECT MIN(id), MAX(id) FROM posts WHERE deleted = 0").fetchone()
+            if lo is None:
+                sys.exit(f"{db_path} 에 글이 없습니다 (seed.py 로 먼저 생성)")
+            # 전체 정렬 없이 id 범위에서 무작위로 뽑아 조회 (삭제/빈 id 는 건너뜀)
+            ids = sorted({rng.randint(lo, hi) for _ in range(sample * 2)})
+            self.posts: List[tuple] = []
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                self.posts += conn.execute(
+                    f"SELECT id, board FROM posts WHERE deleted = 0 AND id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+            self.posts = self.posts[:sample]
+            self.accounts: List[str] = [r[0] for r in conn.execute(
+                "SELECT user_id FROM users WHERE user_id LIKE ? AND COALESCE(deleted, 0) = 0 ORDER BY id LIMIT ?",
+                (prefix + "%", accounts))]
+        finally:
+            conn.close()
+
+    def top_up_points(self, db_path: str, accounts: List[str], points: int = 1_000_000) -> None:
+        """투표 시나리오가 포인트 부족(400)으로 끝나지 않도록"""
+        if not accounts:
+            return
+        conn = sqlite3.connect(db_path, timeout=30)
+        with conn:
+            conn.executemany("UPDATE users SET points = MAX(COALESCE(points, 0), ?) WHERE user_id = ?",
+                             [(points, a) for a in accounts])
+        conn.close()
+
+
+# ── 가상 사용자 / 시나리오 ──
+
+class User:
+    def __init__(self, client: httpx.AsyncClient, account: Optional[str]):
+        self.client = client
+        self.account = account
+        self.voted: Dict[int, str] = {}   # 토글용: 투표한 글 → 종류
+        self.liked: Dict[int, str] = {}   # 추천한 글 → 게시판
+
+
+class Scenarios:
+    """각 메서드는 (응답, 기대 상태 코드) 를 돌려줌"""
+
+    def __init__(self, data: Dataset, rng: random.Random, make_client):
+        self.data = data
+        self.rng = rng
+        self.make_client = make_client
+        self.boards = list(data.boards)
+
+    def _post(self):
+        return self.rng.choice(self.data.posts)
+
+    async def list(self, u: User):
+        board = self.rng.choice(self.boards)
+        params = {"sort": self.rng.choice(("new", "view", "like")), "page": self.rng.randint(1, FRAGMENT_MAX_PAGE)}
+        cats = self.data.categories.get(board)
+        if cats and self.rng.random() < 0.3:
+            params["category"] = self.rng.choice(cats)
+        return await u.client.get(f"/{board}", params=params), 200
+
+    async def deep(self, u: User):
+        board = self.rng.choice(self.boards)
+        pages = max(1, -(-self.data.boards[board] // PAGE_SIZE))
+        page = self.rng.randint(min(FRAGMENT_MAX_PAGE + 1, pages), pages)
+        params = {"sort": self.rng.choice(("new", "view", "like")), "page": page}
+        return await u.client.get(f"/{board}", params=params), 200
+
+    async def search(self, u: User):
+        board = self.rng.choice(self.boards)
+        return await u.client.get(f"/{board}", params={"q": self.rng.choice(SEARCH_WORDS)}), 200
+
+    async def view(self, u: User):
+        pid, board = self._post()
+        return await u.client.get(f"/{board}/view/{pid}"), 200
+
+    async def comment(self, u: User):
+        pid, board = self._post()
+        data = {"content": f"{self.rng.choice(COMMENT_WORDS)} ({int(time.time() * 1000) % 100000})"}
+        return await u.client.post(f"/{board}/comment/{pid}", data=data), 303
+
+    async def vote(self, u: User):
+        # 절반은 이전에 투표한 글을 같은 종류로 다시 눌러 취소
+        if u.voted and self.rng.random() < 0.5:
+            pid = self.rng.choice(list(u.voted))
+            kind = u.voted.pop(pid)
+        else:
+            pid, _ = self._post()
+            kind = self.rng.choice(("hit", "bomb"))
+            u.voted[pid] = kind
+        return await u.client.post("/vote", data={"post_id": pid, "vote_type": kind}), 200
+
+    async def like(self, u: User):
+        if u.liked and self.rng.random() < 0.5:
+            pid = self.rng.choice(list(u.liked))
+            board = u.liked.pop(pid)
+        else:
+            pid, board = self._post()
+            u.liked[pid] = board
+        return await u.client.post(f"/{board}/like/{pid}"), 200
+
+    async def login(self, u: User):
+        account = self.rng.choice(self.data.accounts)
+        async with self.make_client() as c:
+            r = await c.post("/login", data={"user_id": account, "password": SEED_PASSWORD, "next": "/"})
+        return r, 303
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, name: str, ms: float, status: str, ok: bool) -> None:
+        self.latencies.setdefault(name, []).append(ms)
+        codes = self.statuses.setdefault(name, {})
+        codes[status] = codes.get(status, 0) + 1
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def _pct(sorted_ms: List[float], p: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(p * len(sorted_ms)))]
+
+
+def summarize(stats: Stats, elapsed: float) -> Dict:
+    scenarios = {}
+    every: List[float] = []
+    for name, lat in sorted(stats.latencies.items()):
+        lat = sorted(lat)
+        every += lat
+        n = len(lat)
+        scenarios[name] = {
+            "count": n,
+            "rps": round(n / elapsed, 2),
+            "errors": stats.errors.get(name, 0),
+            "error_rate": round(stats.errors.get(name, 0) / n, 4),
+            "p50_ms": round(_pct(lat, 0.50), 2),
+            "p90_ms": round(_pct(lat, 0.90), 2),
+            "p99_ms": round(_pct(lat, 0.99), 2),
+            "max_ms": round(lat[-1], 2),
+            "mean_ms": round(sum(lat) / n, 2),
+            "status": stats.statuses.get(name, {}),
+        }
+    every.sort()
+    total_errors = sum(stats.errors.values())
+    return {
+        "total": {
+            "count": len(every),
+            "rps": round(len(every) / elapsed, 2),
+            "errors": total_errors,
+            "error_rate": round(total_errors / len(every), 4) if every else 0.0,
+            "p50_ms": round(_pct(every, 0.50), 2),
+            "p99_ms": round(_pct(every, 0.99), 2),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float, min_ms: float) -> List[str]:
+    """회귀 항목 설명 목록 (비어 있으면 통과)"""
+    problems = []
+    rows = [("total", result["total"], baseline.get("total", {}))]
+    rows += [(n, s, baseline.get("scenarios", {}).get(n)) for n, s in result["scenarios"].items()]
+    for name, cur, base in rows:
+        if not base:
+            continue
+        for key in ("p50_ms", "p99_ms"):
+            if cur[key] > base[key] * (1 + tolerance) and cur[key] - base[key] >= min_ms:
+                problems.append(f"{name} {key}: {base[key]} → {cur[key]} (+{(cur[key] / max(base[key], 1e-9) - 1) * 100:.0f}%)")
+        if base["rps"] and cur["rps"] < base["rps"] * (1 - tolerance):
+            problems.append(f"{name} rps: {base['rps']} → {cur['rps']} ({(cur['rps'] / base['rps'] - 1) * 100:.0f}%)")
+        if cur["error_rate"] > base["error_rate"] + 0.01:
+            problems.append(f"{name} error_rate: {base['error_rate']} → {cur['error_rate']}")
+    return problems
+
+
+def print_report(summary: Dict, baseline: Optional[Dict]) -> None:
+    base = (baseline or {}).get("scenarios", {})
+    print(f"{'시나리오':<10}{'요청':>8}{'rps':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'오류':>7}   기준 p50/p99")
+    for name, s in summary["scenarios"].items():
+        b = base.get(name)
+        ref = f"   {b['p50_ms']}/{b['p99_ms']}" if b else ""
+        print(f"{name:<10}{s['count']:>8}{s['rps']:>9}{s['p50_ms']:>9}{s['p90_ms']:>9}{s['p99_ms']:>9}"
+              f"{s['max_ms']:>9}{s['errors']:>7}{ref}")
+    t = summary["total"]
+    print(f"{'전체':<10}{t['count']:>8}{t['rps']:>9}{t['p50_ms']:>9}{'':>9}{t['p99_ms']:>9}{'':>9}{t['errors']:>7}")
+
+
+# ── 앱 실행 ──
+
+@asynccontextmanager
+async def lifespan(app):
+    """ASGI lifespan startup/shutdown 을 직접 보냄 (같은 프로세스 실행용)"""
+    inbox: asyncio.Queue = asyncio.Queue()
+    started, stopped = asyncio.Event(), asyncio.Event()
+    failed: List[str] = []
+
+    async def receive():
+        return await inbox.get()
+
+    async def send(message):
+        if message["type"] == "lifespan.startup.complete":
+            started.set()
+        elif message["type"] == "lifespan.startup.failed":
+            failed.append(message.get("message", ""))
+            started.set()
+        elif message["type"].startswith("lifespan.shutdown"):
+            stopped.set()
+
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, receive, send))
+    await inbox.put({"type": "lifespan.startup"})
+    await started.wait()
+    if failed:
+        raise RuntimeError(f"lifespan 시작 실패: {failed[0]}")
+    try:
+        yield
+    finally:
+        await inbox.put({"type": "lifespan.shutdown"})
+        await asyncio.wait_for(stopped.wait(), timeout=30)
+        await task
+
+
+@asynccontextmanager
+async def uvicorn_server(db_path: str, port: int, workers: int):
+    env = dict(os.environ, DB_PATH=db_path)
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--log-level", "warning", "--no-access-log", "--workers", str(workers)]
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=env)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=url) as c:
+            for _ in range(300):
+                if proc.poll() is not None:
+                    raise RuntimeError(f"uvicorn 종료됨 (코드 {proc.returncode})")
+                try:
+                    await c.get("/static/")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn 이 30초 안에 뜨지 않음")
+        yield url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# ── 실행 ──
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        if not hasattr(Scenarios, name) or name.startswith("_"):
+            raise SystemExit(f"알 수 없는 시나리오: {name}")
+        mix[name] = float(weight or 1)
+    return {k: v for k, v in mix.items() if v > 0}
+
+
+async def run(args) -> Dict:
+    rng = random.Random(args.seed)
+    n_logged = round(args.concurrency * args.login_ratio)
+    data = Dataset(args.db, args.sample, max(n_logged, 50), args.prefix, rng)
+    mix = parse_mix(args.mix)
+    if not data.accounts:
+        mix = {k: v for k, v in mix.items() if k not in WRITES and k != "login"}
+        n_logged = 0
+        print(f"⚠️ '{args.prefix}' 계정이 없어 로그인/쓰기 시나리오 제외")
+    if "vote" in mix:
+        data.top_up_points(args.db, data.accounts)
+
+    async def drive(make_client) -> Dict:
+        scenarios = Scenarios(data, rng, make_client)
+        users: List[User] = []
+        for i in range(args.concurrency):
+            account = data.accounts[i % len(data.accounts)] if i < n_logged else None
+            u = User(make_client(), account)
+            if account:
+                r = await u.client.post("/login", data={"user_id": account, "password": SEED_PASSWORD, "next": "/"})
+                if r.status_code != 303:
+                    raise SystemExit(f"{account} 로그인 실패 ({r.status_code}) - SEED_PASSWORD 확인")
+            users.append(u)
+
+        stats = Stats()
+        recording = False
+        deadline = 0.0
+
+        async def worker(u: User):
+            choices = {k: w for k, w in mix.items() if u.account or (k not in WRITES)}
+            names, weights = list(choices), list(choices.values())
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                t0 = time.perf_counter()
+                try:
+                    r, expected = await getattr(scenarios, name)(u)
+                    status, ok = str(r.status_code), r.status_code == expected
+                except httpx.HTTPError as e:
+                    status, ok = type(e).__name__, False
+                if recording:
+                    stats.record(name, (time.perf_counter() - t0) * 1000.0, status, ok)
+
+        try:
+            if args.warmup > 0:
+                deadline = time.perf_counter() + args.warmup
+                await asyncio.gather(*(worker(u) for u in users))
+            recording = True
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(worker(u) for u in users))
+            elapsed = time.perf_counter() - started
+        finally:
+            for u in users:
+                await u.client.aclose()
+        return summarize(stats, elapsed)
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if args.url:
+        summary = await drive(lambda: httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout))
+        mode = "url"
+    elif args.uvicorn:
+        async with uvicorn_server(args.db, args.port, args.workers) as url:
+            summary = await drive(lambda: httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout))
+        mode = "uvicorn"
+    else:
+        import main   # DB_PATH 설정 후 import
+        transport = httpx.ASGITransport(app=main.app)
+        async with lifespan(main.app):
+            summary = await drive(lambda: httpx.AsyncClient(transport=transport, base_url="http://loadtest",
+                                                            timeout=args.timeout))
+        mode = "inprocess"
+
+    summary["meta"] = {
+        "mode": mode, "db": args.db, "concurrency": args.concurrency, "login_ratio": args.login_ratio,
+        "duration": args.duration, "warmup": args.warmup, "mix": mix, "seed": args.seed,
+        "posts": sum(data.boards.values()), "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    return summary
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="HTTP 부하 테스트")
+    p.add_argument("--db", required=True, help="시드 DB (앱 실행 + 대상 글/계정 목록)")
+    p.add_argument("--url", help="이미 떠 있는 서버 주소 (지정하면 앱을 띄우지 않음)")
+    p.add_argument("--uvicorn", action="store_true", help="uvicorn 서브프로세스로 실행")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    p.add_argument("--concurrency", type=int, default=32, help="동시 가상 사용자 수")
+    p.add_argument("--login-ratio", type=float, default=0.3, help="로그인한 가상 사용자 비율")
+    p.add_argument("--duration", type=float, default=30.0, help="측정 시간(초)")
+    p.add_argument("--warmup", type=float, default=5.0, help="측정 전 예열 시간(초)")
+    p.add_argument("--mix", default=DEFAULT_MIX, help="시나리오=가중치,... (기본 %(default)s)")
+    p.add_argument("--sample", type=int, default=5000, help="대상 글 id 표본 수")
+    p.add_argument("--prefix", default="seed", help="로그인에 쓸 시드 계정 아이디 접두사")
+    p.add_argument("--timeout", type=float, default=30.0)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--out", help="결과 JSON 저장 경로")
+    p.add_argument("--baseline", help="비교할 기준선 JSON (회귀면 종료 코드 1)")
+    p.add_argument("--save-baseline", help="이번 결과를 기준선으로 저장")
+    p.add_argument("--tolerance", type=float, default=0.2, help="허용 변화율 (0.2 = 20%%)")
+    p.add_argument("--min-ms", type=float, default=2.0, help="이보다 작은 지연 차이는 무시")
+    args = p.parse_args()
+
+    args.db = os.path.abspath(args.db)
+    if not os.path.exists(args.db):
+        p.error(f"{args.db} 없음")
+    os.environ["DB_PATH"] = args.db   # 같은 프로세스 실행 시 main import 전에
+
+    summary = asyncio.run(run(args))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(summary, baseline)
+
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"저장: {path}")
+
+    if baseline is not None:
+        base_meta = baseline.get("meta", {})
+        for key in ("mode", "concurrency", "login_ratio", "mix"):
+            if base_meta.get(key) != summary["meta"][key]:
+                print(f"⚠️ 기준선과 {key} 가 다름: {base_meta.get(key)} → {summary['meta'][key]}")
+        problems = compare(summary, baseline, args.tolerance, args.min_ms)
+        if problems:
+            print(f"❌ 기준선 대비 회귀 {len(problems)}건:")
+            for line in problems:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("✅ 기준선 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from starlette.middleware.sessions import SessionMiddleware
-from fastapi.templating import Jinja2Templates
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
 from database.connection import database, create_tables
@@ -16,24 +16,90 @@ from routers.users.board import router as board_router
 from routers.users import auth as user_auth
 from routers.users import profile as user_profile
 from routers.users.board import vote as vote_router
+from routers.users.board.pagination import anchor_refresh_loop
+from routers.users.board.view_counter import view_counter
+from routers.users.board.trending import trending
+from models.exp_events import exp_queue
+from models.passwords import passwords, PasswordBusy
+from models.user_repo import UserMemoMiddleware
+from models.sessions import ServerSessionMiddleware, session_store
+from models.availability import availability
+from routers.templating import templates, precompile
+from models.page_cache import PageCacheMiddleware, page_cache
+from models.metrics import MetricsMiddleware, loop_lag_monitor
+from models.profiler import ProfileMiddleware, sampler
+from models.background import shutdown
+
+SHUTDOWN_TIMEOUT = float(os.getenv("SHUTDOWN_TIMEOUT", "10"))   # 백그라운드 작업 / 마지막 flush 대기 상한(초)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await passwords.start()                           # 비밀번호 해시 워커 (fork 는 스레드가 생기기 전에)
     await database.connect()
     await create_tables()
+    await availability.load()                         # 회원가입 중복 검사 색인
+    print(f"✅ 템플릿 {precompile()}개 미리 컴파일")      # 첫 요청 전에 전부 컴파일 (바이트코드 캐시 사용)
+
+    # 백그라운드 작업 - DB 를 쓰는 루프는 cancel 하지 않고 shutdown 신호로 스스로 끝나게 함
+    # (트랜잭션 도중 cancel 되면 writer 커넥션이 풀로 돌아오지 않음, models/background.py)
+    shutdown.reset()
+    tasks = [
+        asyncio.create_task(anchor_refresh_loop()),   # 게시판 "N페이지 이동" 앵커 갱신
+        asyncio.create_task(view_counter.run()),      # 조회수 일괄 반영
+        asyncio.create_task(exp_queue.run()),         # 경험치/활동 통계 일괄 반영
+        asyncio.create_task(session_store.run()),     # 만료 세션 정리
+        asyncio.create_task(trending.run()),          # 인기글 순위 (바뀐 글만) 갱신
+    ]
+    lag_task = asyncio.create_task(loop_lag_monitor())  # 이벤트 루프 지연 측정 (/metrics, DB 안 씀 → cancel)
     yield
-    await database.disconnect()
+    shutdown.set()
+    lag_task.cancel()
+    _, pending = await asyncio.wait(tasks, timeout=SHUTDOWN_TIMEOUT)
+    for t in pending:
+        print(f"백그라운드 작업이 {SHUTDOWN_TIMEOUT:.0f}초 안에 끝나지 않아 취소: {t.get_coro().__qualname__}")
+        t.cancel()
+    await asyncio.gather(lag_task, *tasks, return_exceptions=True)
+    try:
+        # 남은 조회수/경험치 반영 (writer 가 막혀 있어도 종료는 되도록 시간 제한)
+        for name, flush in (("조회수", view_counter.flush), ("경험치", exp_queue.flush)):
+            try:
+                await asyncio.wait_for(flush(), timeout=SHUTDOWN_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"종료 시 {name} 반영 시간 초과 ({SHUTDOWN_TIMEOUT:.0f}초) - 남은 분량 유실")
+            except Exception as e:
+                print(f"종료 시 {name} 반영 오류: {e}")
+    finally:
+        passwords.shutdown()                          # 비밀번호 해시 워커 종료
+        await database.disconnect()
 
 app = FastAPI(lifespan=lifespan)
 
+@app.exception_handler(PasswordBusy)
+async def password_busy_handler(request, exc):
+    # 비밀번호 해시 대기열이 가득 차면 기다리게 하지 않고 바로 거절 (다른 요청 지연 방지)
+    return JSONResponse(
+        {"detail": "접속자가 많습니다. 잠시 후 다시 시도해주세요."},
+        status_code=429, headers={"Retry-After": "1"},
+    )
+
 # 세션/정적/템플릿
 app.add_middleware(
-    SessionMiddleware,
-    secret_key=os.getenv("SESSION_SECRET", "dev-secret"),
+    ServerSessionMiddleware,                      # 쿠키에는 세션 ID 만, 데이터는 sessions 테이블
+    store=session_store,
     same_site="lax",
+    https_only=os.getenv("SESSION_COOKIE_SECURE", "0") == "1",
+)
+app.add_middleware(UserMemoMiddleware)            # 요청 단위 사용자 조회 memo
+app.add_middleware(                               # 비로그인 GET 전체 응답 캐시 (세션 미들웨어보다 바깥)
+    PageCacheMiddleware,
+    cache=page_cache,
+    paths=(r"^/$", r"^/\w+/?$", r"^/\w+/view/\d+/?$"),   # 홈, 게시판 목록, 글 보기
+    skip_paths=("/static", "/admin", "/login", "/logout", "/register", "/profile", "/check-duplicate", "/metrics"),
 )
+app.add_middleware(ProfileMiddleware, sampler=sampler)  # /admin/profile/requests 대상 요청 표시
+app.add_middleware(MetricsMiddleware)             # 라우트별 요청 수/지연 (맨 바깥, /metrics 로 노출)
 app.mount("/static", StaticFiles(directory="static"), name="static")
-app.state.templates = Jinja2Templates(directory="templates")
+app.state.templates = templates                   # 라우터들과 같은 Jinja2 환경
 
 # ✅ 라우터 등록 — 순서 중요!
 app.include_router(admin_router)          # 1) admin (더 구체적인 경로 먼저)
@@ -0,0 +1,280 @@
+# microbench.py
+"""
+목록 한 페이지에서 행마다 반복 호출되는 작은 함수들의 마이크로 벤치마크 (고정 입력, 기준선 비교).
+
+    python microbench.py                                   # 전체 측정 + 표
+    python microbench.py --save-baseline bench_micro.json  # 기준선 저장
+    python microbench.py --baseline bench_micro.json       # 비교, 회귀면 종료 코드 1
+    python microbench.py --alloc                           # 호출당 메모리 할당 (tracemalloc)
+    python microbench.py -k render                         # 이름에 정규식이 맞는 것만
+
+- 대상: format_dt_to_kst (입력 형식별), calculate_level / get_level_name, databases Record → dict(r),
+  50행 페이지 가공(board_list_context 의 행 루프와 같은 일), boards/*_content.html 렌더링(50행)
+- 측정: timeit 방식. 한 라운드가 --min-time 이상 되도록 반복 횟수를 정하고 --rounds 라운드, GC 끈 상태.
+  라운드별 호출당 시간의 중앙값/최솟값 기록 (비교는 중앙값)
+- 기준선 비교: 중앙값이 --tolerance 이상 느려지면 회귀. 같은 기계/같은 파이썬에서 만든 기준선끼리만 의미 있음
+- --alloc: 호출 1번 동안의 tracemalloc 최대 증가량(임시 할당 포함)과 호출 뒤에도 남는 양, 행 단위 값
+  (할당 추적이 켜지면 느려지므로 시간 측정과 따로 실행)
+- 레코드 변환용 행은 앱과 같은 PooledDatabase 로 임시 SQLite 파일에서 읽어 옴 (운영 DB 는 건드리지 않음)
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+os.chdir(BASE_DIR)   # templates/ 상대 경로
+
+PAGE_ROWS = 50
+
+# 고정 입력
+DT_INPUTS = {
+    "iso_offset": "2025-03-14T09:26:53+00:00",   # 앱이 쓰는 형식
+    "iso_z":      "2025-03-14T09:26:53.123456Z",
+    "space":      "2025-03-14 09:26:53",          # SQLite datetime('now')
+    "invalid":    "14/03/2025 09:26",             # 두 파서 모두 실패 → 원문
+}
+EXP_INPUTS = (0, 7, 120, 480, 1500, 4200, 9000, 25000, 60000, 150000)
+
+
+def _rows_source(path: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE posts (id INTEGER PRIMARY KEY, title TEXT, author TEXT, category TEXT,
+                            created_at TEXT, updated_at TEXT, views INTEGER, likes INTEGER)
+    """)
+    conn.executemany("INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [
+        (i, f"[비트코인] 오늘 흐름 정리해봤습니다 {i}", f"행복한고양이{i}", "비트코인",
+         f"2025-03-14T09:{i % 60:02d}:53+00:00", f"2025-03-14T10:{i % 60:02d}:01+00:00", i * 37, i % 13)
+        for i in range(1, PAGE_ROWS + 2)
+    ])
+    conn.commit()
+    conn.close()
+
+
+def load_records() -> list:
+    """목록 SELECT 와 같은 컬럼의 databases Record PAGE_ROWS+1 개 (앱은 size+1 건을 읽음)"""
+    from database.pool import PooledDatabase
+
+    async def fetch(path):
+        db = PooledDatabase(f"sqlite+aiosqlite:///{path}")
+        await db.connect()
+        try:
+            return await db.fetch_all("""
+                SELECT p.id, p.title, p.author, p.category, p.created_at, p.updated_at, p.views, p.likes
+                FROM posts p ORDER BY p.id DESC LIMIT :limit
+            """, {"limit": PAGE_ROWS + 1})
+        finally:
+            await db.disconnect()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rows.sqlite3")
+        _rows_source(path)
+        return asyncio.run(fetch(path))
+
+
+def build_benchmarks() -> Dict[str, Tuple[Callable[[], object], int]]:
+    """이름 → (인자 없는 함수, 호출 1번이 처리하는 행 수)"""
+    # 앱 모듈 import 시 운영 DB 경로가 잡히지 않도록 (연결은 하지 않음)
+    os.environ.setdefault("DB_PATH", os.path.join(tempfile.gettempdir(), "microbench.sqlite3"))
+    from starlette.requests import Request
+    from models.users import calculate_level, get_level_name
+    from routers.users.board.utils import format_dt_to_kst
+    from routers.templating import env
+
+    records = load_records()
+    benches: Dict[str, Tuple[Callable[[], object], int]] = {}
+
+    for label, value in DT_INPUTS.items():
+        benches[f"format_dt_to_kst[{label}]"] = (lambda v=value: format_dt_to_kst(v), 1)
+
+    def levels():
+        for exp in EXP_INPUTS:
+            calculate_level(exp)
+    benches["calculate_level"] = (levels, len(EXP_INPUTS))
+
+    def level_names():
+        for lv in range(0, 12):
+            get_level_name(lv)
+    benches["get_level_name"] = (level_names, 12)
+
+    benches["row_to_dict"] = (lambda: [dict(r) for r in records], len(records))
+
+    def page_rows():
+        # read.py board_list_context: dict(r) → 행마다 날짜 2개 포맷 + 등급 기본값
+        rows = [dict(r) for r in records][:PAGE_ROWS]
+        for d in rows:
+            d["created_at_fmt"] = format_dt_to_kst(d.get("created_at"))
+            d["updated_at_fmt"] = format_dt_to_kst(d.get("updated_at"))
+            d["level"] = 1
+            d["level_name"] = "새내기"
+        return rows
+    benches["page_rows"] = (page_rows, PAGE_ROWS)
+
+    request = Request({"type": "http", "method": "GET", "path": "/invest", "query_string": b"category=%EB%B9%84%ED%8A%B8%EC%BD%94%EC%9D%B8",
+                       "headers": [], "root_path": ""})
+    posts = page_rows()
+    context = {
+        "request": request, "posts": posts, "tabs": [], "selected_category": "비트코인",
+        "page": 3, "size": PAGE_ROWS, "total": 12345, "total_pages": 247, "sort": "new", "q": None,
+        "next_cursor": "bmV4dHw", "prev_cursor": "cHJldnw",
+    }
+    for name in sorted(os.listdir(os.path.join("templates", "boards"))):
+        if name.endswith("_content.html"):
+            template = env.get_template(f"boards/{name}")
+            benches[f"render[{name}]"] = (lambda t=template: t.render(context), PAGE_ROWS)
+    return benches
+
+
+# ── 측정 ──
+
+def _autorange(fn: Callable[[], object], min_time: float) -> int:
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= min_time:
+            return number
+        number *= 2 if time.perf_counter() - t0 > min_time / 10 else 10
+
+
+def time_bench(fn: Callable[[], object], rounds: int, min_time: float) -> Dict:
+    fn()   # 첫 호출(캐시 채우기) 제외
+    number = _autorange(fn, min_time / 4)
+    per_call: List[float] = []
+    gc_was = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                fn()
+            per_call.append((time.perf_counter() - t0) / number * 1e6)
+    finally:
+        if gc_was:
+            gc.enable()
+    return {
+        "median_us": round(statistics.median(per_call), 3),
+        "min_us": round(min(per_call), 3),
+        "stdev_us": round(statistics.stdev(per_call), 3) if len(per_call) > 1 else 0.0,
+        "number": number,
+        "rounds": rounds,
+    }
+
+
+def alloc_bench(fn: Callable[[], object], calls: int = 20) -> Dict:
+    """호출 1번의 최대 할당 증가량과 호출 뒤에도 남는 양 (바이트, calls 번 중앙값/평균)"""
+    fn()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peaks = []
+        start, _ = tracemalloc.get_traced_memory()
+        for _ in range(calls):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = fn()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+            del result
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes": int(statistics.median(peaks)), "retained_bytes": round((end - start) / calls, 1)}
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    problems = []
+    for name, cur in result["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base or "median_us" not in base or "median_us" not in cur:
+            continue
+        if cur["median_us"] > base["median_us"] * (1 + tolerance):
+            problems.append(f"{name}: {base['median_us']}µs → {cur['median_us']}µs "
+                            f"(+{(cur['median_us'] / base['median_us'] - 1) * 100:.0f}%)")
+    return problems
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="행 단위 헬퍼 마이크로 벤치마크")
+    p.add_argument("-k", dest="pattern", help="이름 필터 (정규식)")
+    p.add_argument("--rounds", type=int, default=7)
+    p.add_argument("--min-time", type=float, default=0.2, help="라운드당 최소 시간(초)")
+    p.add_argument("--alloc", action="store_true", help="시간 대신 호출당 메모리 할당 측정")
+    p.add_argument("--out", help="결과 JSON 저장 경로")
+    p.add_argument("--baseline", help="비교할 기준선 JSON (회귀면 종료 코드 1)")
+    p.add_argument("--save-baseline", help="이번 결과를 기준선으로 저장")
+    p.add_argument("--tolerance", type=float, default=0.25, help="허용 변화율 (0.25 = 25%%)")
+    args = p.parse_args()
+
+    benches = build_benchmarks()
+    if args.pattern:
+        match = re.compile(args.pattern)
+        benches = {k: v for k, v in benches.items() if match.search(k)}
+        if not benches:
+            sys.exit(f"'{args.pattern}' 에 맞는 벤치마크 없음")
+    baseline: Optional[Dict] = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    base = (baseline or {}).get("benchmarks", {})
+
+    results: Dict[str, Dict] = {}
+    width = max(len(k) for k in benches) + 2
+    if args.alloc:
+        print(f"{'이름':<{width}}{'최대 할당':>12}{'행당':>10}{'남는 양':>10}")
+    else:
+        print(f"{'이름':<{width}}{'중앙값 µs':>12}{'최소 µs':>10}{'행당 µs':>10}{'±':>8}   기준")
+    for name, (fn, rows) in benches.items():
+        if args.alloc:
+            r = alloc_bench(fn)
+            r["rows"] = rows
+            print(f"{name:<{width}}{r['peak_bytes']:>10,}B{r['peak_bytes'] // rows:>9,}B{r['retained_bytes']:>9}B")
+        else:
+            r = time_bench(fn, args.rounds, args.min_time)
+            r["rows"] = rows
+            r["per_row_us"] = round(r["median_us"] / rows, 3)
+            ref = ""
+            if name in base and "median_us" in base[name]:
+                ref = f"   {base[name]['median_us']} ({(r['median_us'] / base[name]['median_us'] - 1) * 100:+.0f}%)"
+            print(f"{name:<{width}}{r['median_us']:>12}{r['min_us']:>10}{r['per_row_us']:>10}{r['stdev_us']:>8}{ref}")
+        results[name] = r
+
+    summary = {
+        "meta": {
+            "mode": "alloc" if args.alloc else "time",
+            "python": sys.version.split()[0], "platform": sys.platform,
+            "rounds": args.rounds, "min_time": args.min_time, "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "benchmarks": results,
+    }
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"저장: {path}")
+
+    if baseline is not None and not args.alloc:
+        if baseline.get("meta", {}).get("python") != summary["meta"]["python"]:
+            print(f"⚠️ 기준선과 파이썬 버전이 다름: {baseline['meta'].get('python')} → {summary['meta']['python']}")
+        problems = compare(summary, baseline, args.tolerance)
+        if problems:
+            print(f"❌ 기준선 대비 회귀 {len(problems)}건:")
+            for line in problems:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("✅ 기준선 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
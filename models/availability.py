@@ -0,0 +1,79 @@
+# models/availability.py
+"""
+회원가입 중복 검사(/check-duplicate)용 메모리 색인.
+
+- 시작 시 users 의 user_id / nickname / email 을 한 번 읽어 값 → id 사전으로 보관
+- 가입(create_user), 관리자 생성/수정 시 set_user() 로 갱신 (id → 값 역색인으로 옛 값 제거)
+- users 의 UNIQUE 제약은 소프트 삭제된 행에도 걸려 있으므로 삭제된 사용자의 값도 "사용 중"
+- 색인이 준비되기 전(또는 적재 실패)에는 비밀번호 없이 SELECT 1 로 확인
+- IP 별 요청 수 제한 (타이핑 중 검사가 DB/서버 부하로 번지지 않도록)
+"""
+import os
+from typing import Dict, Optional, Tuple
+
+from database.connection import database
+from models.passwords import AttemptLimiter
+
+KINDS = ("user_id", "nickname", "email")
+
+CHECK_WINDOW_SEC = int(os.getenv("CHECK_WINDOW_SEC", "60"))
+CHECK_MAX_PER_IP = int(os.getenv("CHECK_MAX_PER_IP", "120"))
+
+
+def normalize(kind: str, value: str) -> str:
+    value = value.strip()
+    # 회원가입은 이메일을 소문자로 저장
+    return value.lower() if kind == "email" else value
+
+
+class AvailabilityIndex:
+    def __init__(self):
+        self._taken: Dict[str, Dict[str, int]] = {k: {} for k in KINDS}
+        self._owned: Dict[int, Tuple[Optional[str], ...]] = {}
+        self.ready = False
+        self.lookups = 0
+        self.db_fallbacks = 0
+        # 키별 요청 시각 슬라이딩 윈도우 (로그인 시도 제한과 같은 구조)
+        self.limiter = AttemptLimiter(CHECK_MAX_PER_IP, CHECK_WINDOW_SEC)
+
+    async def load(self) -> None:
+        rows = await database.fetch_all("SELECT id, user_id, nickname, email FROM users")
+        self._taken = {k: {} for k in KINDS}
+        self._owned = {}
+        for r in rows:
+            self.set_user(r["id"], r["user_id"], r["nickname"], r["email"])
+        self.ready = True
+        print(f"✅ 중복 검사 색인 적재: 사용자 {len(self._owned)}명")
+
+    def set_user(self, id: int, user_id: Optional[str], nickname: Optional[str], email: Optional[str]) -> None:
+        """사용자 id 가 가진 값을 새 값으로 교체"""
+        old = self._owned.pop(id, None)
+        if old:
+            for kind, value in zip(KINDS, old):
+                if value is not None and self._taken[kind].get(value) == id:
+                    del self._taken[kind][value]
+        new = (user_id, nickname, email)
+        for kind, value in zip(KINDS, new):
+            if value is not None:
+                self._taken[kind][value] = id
+        self._owned[id] = new
+
+    async def is_taken(self, kind: str, value: str) -> bool:
+        if kind not in KINDS:
+            raise ValueError(f"잘못된 검사 타입: {kind}")
+        self.lookups += 1
+        if self.ready:
+            return value in self._taken[kind]
+        self.db_fallbacks += 1
+        row = await database.fetch_one(f"SELECT 1 FROM users WHERE {kind} = :v LIMIT 1", {"v": value})
+        return row is not None
+
+    def check_rate(self, client: str) -> int:
+        """제한 중이면 남은 초, 아니면 0 (요청을 한 번 센다)"""
+        wait = self.limiter.retry_after(client)
+        if not wait:
+            self.limiter.fail(client)
+        return wait
+
+
+availability = AvailabilityIndex()
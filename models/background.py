@@ -0,0 +1,41 @@
+# models/background.py
+"""
+lifespan 백그라운드 루프 종료 신호.
+
+- 종료 시 태스크를 cancel 하면 트랜잭션(BEGIN/COMMIT) 도중에 끊길 수 있고, 그러면 databases 가
+  writer 커넥션을 풀에 돌려주지 못해 이후 flush/disconnect 가 영원히 기다림
+- 그래서 DB 를 쓰는 루프는 cancel 대신 shutdown 신호를 작업 단위(게시판, 배치) 사이에서 확인하고 스스로 끝남
+- lifespan: 시작 시 reset(), 종료 시 set() 후 태스크가 끝나기를 기다림
+"""
+import asyncio
+from typing import Optional
+
+
+class Shutdown:
+    def __init__(self):
+        self._event: Optional[asyncio.Event] = None
+
+    def reset(self) -> None:
+        """lifespan 시작 시 (TestClient 처럼 같은 프로세스에서 여러 번 시작될 수 있음)"""
+        self._event = asyncio.Event()
+
+    def set(self) -> None:
+        if self._event is not None:
+            self._event.set()
+
+    @property
+    def stopping(self) -> bool:
+        return self._event is not None and self._event.is_set()
+
+    async def sleep(self, seconds: float) -> bool:
+        """seconds 동안 대기. 그 사이 종료 신호가 오면 바로 깨어남. 종료 중이면 True"""
+        if self._event is None:
+            self.reset()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        return self._event.is_set()
+
+
+shutdown = Shutdown()
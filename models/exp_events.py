@@ -0,0 +1,106 @@
+# models/exp_events.py
+"""
+경험치/활동 통계 이벤트 큐.
+
+- 글/댓글/추천/히트 때 (user_id, exp 증감, 통계 증감, 사유) 이벤트만 메모리에 쌓고 바로 응답
+- EXP_FLUSH_SEC 마다 사용자별로 합쳐서 한 트랜잭션으로 반영
+  UPDATE users SET exp = exp + :d, level = (SQL 로 계산) ... → 동시 적립도 유실 없음
+- 사유는 exp_events 테이블에 이벤트 단위로 기록
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from database.connection import database
+from models.background import shutdown
+from models.users import level_sql
+from models.user_repo import user_repo
+
+EXP_FLUSH_SEC = float(os.getenv("EXP_FLUSH_SEC", "2"))
+
+# 이벤트로 올릴 수 있는 통계 컬럼
+STAT_COLUMNS = ("total_posts", "total_comments", "total_likes")
+
+_APPLY_SQL = f"""
+    UPDATE users SET
+      exp = MAX(COALESCE(exp, 0) + :exp, 0),
+      level = {level_sql("MAX(COALESCE(exp, 0) + :exp, 0)")},
+      {", ".join(f"{c} = MAX(COALESCE({c}, 0) + :{c}, 0)" for c in STAT_COLUMNS)}
+    WHERE id = :id
+"""
+
+_LOG_SQL = """
+    INSERT INTO exp_events (user_id, reason, exp_delta, created_at)
+    VALUES (:user_id, :reason, :exp_delta, :created_at)
+"""
+
+
+class ExpEventQueue:
+    def __init__(self):
+        self._events: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+
+    def add(self, user_id: Optional[int], exp: int = 0, reason: str = "activity", **stats: int) -> None:
+        """이벤트 1건 적재 (DB 접근 없음). stats 키는 STAT_COLUMNS 중 하나"""
+        if not user_id:
+            return
+        for col in stats:
+            if col not in STAT_COLUMNS:
+                raise ValueError(f"알 수 없는 통계 컬럼: {col}")
+        if not exp and not any(stats.values()):
+            return
+        self._events.append({
+            "user_id": user_id, "exp": exp, "reason": reason, "stats": stats,
+            # 적재 시각 기준 (DB 반영은 최대 EXP_FLUSH_SEC 늦음)
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+        })
+
+    def pending(self) -> int:
+        return len(self._events)
+
+    @staticmethod
+    def coalesce(events: List[Dict[str, Any]]) -> Dict[int, Dict[str, int]]:
+        """사용자별 증감 합계"""
+        totals: Dict[int, Dict[str, int]] = {}
+        for ev in events:
+            t = totals.setdefault(ev["user_id"], {"exp": 0, **dict.fromkeys(STAT_COLUMNS, 0)})
+            t["exp"] += ev["exp"]
+            for col, d in ev["stats"].items():
+                t[col] += d
+        return totals
+
+    async def flush(self) -> int:
+        """쌓인 이벤트를 한 트랜잭션으로 반영. 반영한 사용자 수 반환"""
+        async with self._lock:
+            if not self._events:
+                return 0
+            batch, self._events = self._events, []
+            totals = self.coalesce(batch)
+            try:
+                async with database.transaction():
+                    await database.execute_many(
+                        _APPLY_SQL, [{"id": uid, **t} for uid, t in totals.items()]
+                    )
+                    await database.execute_many(_LOG_SQL, [
+                        {"user_id": ev["user_id"], "reason": ev["reason"],
+                         "exp_delta": ev["exp"], "created_at": ev["created_at"]}
+                        for ev in batch
+                    ])
+            except Exception:
+                # 실패하면 다음 주기에 다시 시도 (경험치 유실 방지)
+                self._events[:0] = batch
+                raise
+            user_repo.invalidate(*totals)
+            return len(totals)
+
+    async def run(self) -> None:
+        """lifespan 에서 백그라운드 태스크로 실행 (shutdown 신호로 종료, 남은 분량은 lifespan 이 flush)"""
+        while not await shutdown.sleep(EXP_FLUSH_SEC):
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"경험치 반영 오류: {e}")
+
+
+exp_queue = ExpEventQueue()
@@ -0,0 +1,200 @@
+# models/metrics.py
+"""
+Prometheus 텍스트 형식 메트릭 (외부 라이브러리/서비스 없이 프로세스 메모리에 집계).
+
+- Counter / Gauge / Histogram: 라벨 값 튜플 → 값. observe 는 bisect 1번 + 리스트 갱신
+- MetricsMiddleware: 라우트(경로 템플릿, 예 /{board}/view/{post_id})·메서드·상태 코드별 요청 수와 지연, 처리 중 요청 수
+- 커넥션 풀 대기(database/pool.py), 템플릿 렌더링(routers/templating.py) 시간도 여기로 기록
+- loop_lag_monitor(): 주기적으로 잠들었다 깨어난 시각의 지연 = 이벤트 루프가 막혀 있던 시간
+- render() 결과를 /metrics (관리자 또는 METRICS_TOKEN) 가 그대로 내보냄
+- 워커(프로세스)별 값이라 여러 워커면 수집기에서 합산
+"""
+import asyncio
+import os
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+
+# 초 단위 기본 구간 (요청 지연용)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+
+    def lines(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        return [f"{self.name}{_labels(self.label_names, k)} {_num(v)}" for k, v in sorted(self._values.items())]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def set(self, value: float, *labels) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def samples(self):
+        return [f"{self.name}{_labels(self.label_names, k)} {_num(v)}" for k, v in sorted(self._values.items())]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 → [구간별 개수..., +Inf 개수, 합계]
+        self._values: Dict[Tuple, List[float]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        row = self._values.get(labels)
+        if row is None:
+            row = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def samples(self):
+        out = []
+        bounds = self.buckets + (float("inf"),)
+        for key, row in sorted(self._values.items()):
+            acc = 0
+            for le, n in zip(bounds, row):
+                acc += n
+                le_label = 'le="' + _num(le) + '"'
+                out.append(f"{self.name}_bucket{_labels(self.label_names, key, le_label)} {acc}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, key)} {_num(row[-1])}")
+            out.append(f"{self.name}_count{_labels(self.label_names, key)} {acc}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics:
+            lines.extend(m.lines())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP 요청 수", ("method", "route", "status")))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간 (응답 본문 전송까지)", ("method", "route")))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "처리 중인 HTTP 요청 수"))
+db_pool_wait = registry.register(Histogram(
+    "db_pool_wait_seconds", "DB 커넥션 풀에서 커넥션을 얻기까지 기다린 시간", ("pool",), FAST_BUCKETS))
+db_pool_waiting = registry.register(Gauge(
+    "db_pool_waiting", "DB 커넥션을 기다리는 중인 코루틴 수", ("pool",)))
+template_render = registry.register(Histogram(
+    "template_render_seconds", "Jinja2 템플릿 렌더링 시간", ("template",), FAST_BUCKETS))
+loop_lag = registry.register(Histogram(
+    "event_loop_lag_seconds", "이벤트 루프 지연 (예정보다 늦게 깨어난 시간)", (), FAST_BUCKETS))
+loop_lag_last = registry.register(Gauge(
+    "event_loop_lag_last_seconds", "마지막으로 잰 이벤트 루프 지연"))
+
+
+def route_label(scope) -> str:
+    """라우트 경로 템플릿 (/{board}/view/{post_id}). Mount(/static) 는 마운트 경로, 매칭 실패는 <unmatched>"""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", "<unmatched>")
+    return scope.get("root_path") or "<unmatched>"
+
+
+class MetricsMiddleware:
+    """요청 수 / 지연 / 처리 중 요청 수 (맨 바깥에 두어야 캐시 응답·미들웨어 시간까지 포함)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            method, route = scope["method"], route_label(scope)
+            http_requests.inc(method, route, str(status))
+            http_latency.observe(time.perf_counter() - started, method, route)
+
+
+async def loop_lag_monitor(interval: float = LOOP_LAG_INTERVAL) -> None:
+    """lifespan 에서 백그라운드 태스크로 실행"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        loop_lag.observe(lag)
+        loop_lag_last.set(lag)
@@ -0,0 +1,223 @@
+# models/page_cache.py
+"""
+비로그인(세션 쿠키 없는) GET 전체 응답 마이크로 캐시.
+
+- 링크 공유 등으로 같은 URL 에 익명 요청이 몰려도 URL 당 PAGE_CACHE_TTL 초에 한 번만 라우터(DB)까지 감
+- 세션 쿠키가 있는 요청은 그대로 통과 (로그인/관리자/세션을 읽고 쓰는 화면은 캐시와 무관)
+- Set-Cookie 가 붙은 응답(세션을 쓴 응답)과 200 이 아닌 응답은 저장하지 않음
+- 같은 URL 을 동시에 놓치면 한 번만 계산 (single-flight, 계산은 별도 태스크라 첫 요청이 끊겨도 계속)
+- TTL 이 지난 뒤 PAGE_CACHE_STALE 초 동안은 옛 응답을 바로 주고 백그라운드에서 한 번만 다시 계산
+- 캐시로 응답하면 라우터가 안 돌기 때문에, 조회수처럼 요청마다 해야 하는 일은 on_hit() 훅으로 등록
+- 바이트 합계 기준 LRU (PAGE_CACHE_BYTES)
+"""
+import asyncio
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from starlette.requests import HTTPConnection
+
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "2"))         # 0 이면 사용 안 함
+PAGE_CACHE_STALE = float(os.getenv("PAGE_CACHE_STALE", "10"))
+PAGE_CACHE_BYTES = int(os.getenv("PAGE_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+CacheKey = Tuple[str, bytes]
+
+_CONDITIONAL = (b"if-none-match", b"if-modified-since")
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    fresh_until: float = 0.0
+    stale_until: float = 0.0
+    route: Any = None           # 응답을 만든 라우트 (캐시 응답도 같은 라우트로 메트릭 집계)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+    @property
+    def sets_cookie(self) -> bool:
+        return any(k.lower() == b"set-cookie" for k, _ in self.headers)
+
+    @property
+    def etag(self) -> Optional[str]:
+        for k, v in self.headers:
+            if k.lower() == b"etag":
+                return v.decode("latin-1")
+        return None
+
+
+class PageCache:
+    def __init__(self, ttl: float = PAGE_CACHE_TTL, stale: float = PAGE_CACHE_STALE,
+                 max_bytes: int = PAGE_CACHE_BYTES):
+        self.ttl = ttl
+        self.stale = stale
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        self._hooks: List[Tuple[Pattern, Callable]] = []
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def on_hit(self, pattern: str, fn: Callable) -> None:
+        """캐시로 응답할 때 경로가 pattern 에 맞으면 fn(scope, match) 호출"""
+        self._hooks.append((re.compile(pattern), fn))
+
+    def run_hooks(self, scope) -> None:
+        for pattern, fn in self._hooks:
+            m = pattern.match(scope["path"])
+            if m:
+                try:
+                    fn(scope, m)
+                except Exception as e:
+                    print(f"페이지 캐시 훅 오류: {e}")
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.stale_until:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _drop(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+
+    def _store(self, key: CacheKey, entry: CachedResponse) -> None:
+        if entry.status != 200 or entry.sets_cookie or entry.size > self.max_bytes:
+            return
+        now = time.monotonic()
+        entry.fresh_until = now + self.ttl
+        entry.stale_until = entry.fresh_until + self.stale
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = entry
+        self.bytes += entry.size
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def fill(self, key: CacheKey, app, scope) -> "asyncio.Task":
+        """key 를 계산하는 태스크 (이미 계산 중이면 그 태스크)"""
+        task = self._inflight.get(key)
+        if task is None:
+            # 조건부 헤더는 빼고 계산 (304 는 요청마다 _send 에서 판단)
+            scope = dict(scope, headers=[(k, v) for k, v in scope["headers"] if k not in _CONDITIONAL])
+            task = asyncio.get_running_loop().create_task(self._render(key, app, scope))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    def _done(self, key: CacheKey, task: "asyncio.Task") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            # 백그라운드 재계산은 기다리는 요청이 없을 수 있음 → 여기서 기록
+            print(f"페이지 캐시 계산 오류 ({key[0]}): {task.exception()}")
+
+    async def _render(self, key: CacheKey, app, scope) -> CachedResponse:
+        entry = CachedResponse(status=500, headers=[], body=b"")
+        chunks: List[bytes] = []
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                entry.status = message["status"]
+                entry.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await app(scope, receive, send)
+        entry.body = b"".join(chunks)
+        entry.route = scope.get("route")
+        self._store(key, entry)
+        return entry
+
+
+class PageCacheMiddleware:
+    """paths 중 하나에 맞는 세션 없는 GET 만 PageCache 로 응답"""
+
+    def __init__(self, app, cache: PageCache, paths: Tuple[str, ...] = (r"^/$",),
+                 skip_paths: Tuple[str, ...] = ("/static", "/admin"), session_cookie: str = "session"):
+        self.app = app
+        self.cache = cache
+        self.paths = re.compile("|".join(f"(?:{p})" for p in paths))
+        self.skip_paths = skip_paths
+        self.session_cookie = session_cookie
+
+    def _cacheable(self, scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "GET" or self.cache.ttl <= 0:
+            return False
+        path = scope["path"]
+        if path.startswith(self.skip_paths) or not self.paths.match(path):
+            return False
+        conn = HTTPConnection(scope)
+        return self.session_cookie not in conn.cookies and "authorization" not in conn.headers
+
+    async def __call__(self, scope, receive, send):
+        if not self._cacheable(scope):
+            return await self.app(scope, receive, send)
+
+        cache = self.cache
+        key = (scope["path"], scope.get("query_string", b""))
+        entry = cache.get(key)
+        if entry is not None:
+            if time.monotonic() < entry.fresh_until:
+                cache.hits += 1
+                state = "HIT"
+            else:
+                # 옛 응답을 주고 백그라운드에서 다시 계산 (이미 계산 중이면 그대로)
+                cache.stale_hits += 1
+                cache.fill(key, self.app, scope)
+                state = "STALE"
+            cache.run_hooks(scope)
+            return await self._send(entry, state, scope, send)
+
+        leader = key not in cache._inflight
+        entry = await asyncio.shield(cache.fill(key, self.app, scope))
+        if leader:
+            cache.misses += 1
+            return await self._send(entry, "MISS", scope, send)
+        if entry.sets_cookie:
+            # 세션을 만든 응답은 나눠 줄 수 없음 → 직접 처리
+            return await self.app(scope, receive, send)
+        cache.hits += 1
+        cache.run_hooks(scope)
+        await self._send(entry, "HIT", scope, send)
+
+    async def _send(self, entry: CachedResponse, state: str, scope, send) -> None:
+        if entry.route is not None:
+            scope.setdefault("route", entry.route)
+        etag = entry.etag
+        inm = HTTPConnection(scope).headers.get("if-none-match")
+        if etag and inm and etag in [t.strip() for t in inm.split(",")]:
+            headers = [(k, v) for k, v in entry.headers
+                       if k.lower() in (b"etag", b"cache-control", b"vary")]
+            await send({"type": "http.response.start", "status": 304,
+                        "headers": headers + [(b"x-page-cache", state.encode())]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": entry.status,
+                    "headers": entry.headers + [(b"x-page-cache", state.encode())]})
+        await send({"type": "http.response.body", "body": entry.body})
+
+
+page_cache = PageCache()
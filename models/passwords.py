@@ -0,0 +1,222 @@
+# models/passwords.py
+"""
+비밀번호 해시/검증 서비스.
+
+- bcrypt 는 1회 ~200ms CPU 작업 → 이벤트 루프에서 돌리지 않고 프로세스 풀에서 실행
+- 대기열(PASSWORD_QUEUE_MAX)이 차면 PasswordBusy → main 의 핸들러가 429 로 응답 (부하 차단)
+- 로그인 시도 제한(계정/IP 별, 메모리)
+- 저장된 해시의 cost 가 BCRYPT_ROUNDS 와 다르면 로그인 성공 시 새 해시를 돌려줌 (투명한 재해시)
+- 사용자(passlib)/관리자(bcrypt 직접) 두 갈래였던 경로를 bcrypt 하나로 통일 ($2b$ 해시 형식 동일)
+
+워커는 lifespan 시작 시(DB 연결 전) start() 로 미리 띄운다. POSIX 는 fork, 그 외(Windows)는 spawn.
+워커가 죽어 풀이 깨지면(BrokenProcessPool) 풀을 버리고 다시 만든다. 이때는 이미 스레드가 있어
+fork 가 안전하지 않으므로 forkserver(없으면 spawn)로 띄운다.
+spawn/forkserver 워커는 이 모듈만 import 하므로 DB 등 무거운 의존성을 두지 않는다.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Deque, Optional, Tuple
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) // 2)))))
+PASSWORD_QUEUE_MAX = int(os.getenv("PASSWORD_QUEUE_MAX", str(PASSWORD_WORKERS * 8)))
+PASSWORD_MP_START = os.getenv(
+    "PASSWORD_MP_START", "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+)
+PASSWORD_MP_RESTART = os.getenv(   # 풀이 깨진 뒤 다시 만들 때 (스레드가 생긴 뒤라 fork 금지)
+    "PASSWORD_MP_RESTART", "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# 로그인 시도 제한: 창(초) 안에서 실패 허용 횟수
+LOGIN_WINDOW_SEC = int(os.getenv("LOGIN_WINDOW_SEC", "300"))
+LOGIN_MAX_PER_ACCOUNT = int(os.getenv("LOGIN_MAX_PER_ACCOUNT", "5"))
+LOGIN_MAX_PER_IP = int(os.getenv("LOGIN_MAX_PER_IP", "30"))
+
+
+class PasswordBusy(Exception):
+    """해시 대기열이 가득 참 (429)"""
+
+
+class TooManyAttempts(Exception):
+    """로그인 시도 제한 초과 (429)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+# ── 워커 프로세스에서 실행되는 함수 (pickle 가능해야 하므로 모듈 최상위) ──
+def _secret(plain: str) -> bytes:
+    # bcrypt 는 72바이트까지만 사용 (bcrypt>=5 는 초과 시 예외 → 예전 해시와 같게 잘라서 사용)
+    return plain.encode("utf-8")[:72]
+
+
+def _hash(plain: str, rounds: int) -> str:
+    return bcrypt.hashpw(_secret(plain), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(plain: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(_secret(plain), hashed.encode("utf-8"))
+    except ValueError:
+        # 해시 형식이 아닌 값(깨진 데이터)
+        return False
+
+
+def _noop() -> None:
+    return None
+
+
+def hash_cost(hashed: str) -> Optional[int]:
+    """$2b$12$... 에서 cost(12) 추출"""
+    parts = (hashed or "").split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class AttemptLimiter:
+    """키별 실패 시각을 창 크기만큼만 보관하는 슬라이딩 윈도우 (키 수는 max_keys 로 제한)"""
+
+    def __init__(self, limit: int, window_sec: int, max_keys: int = 100000):
+        self.limit = limit
+        self.window_sec = window_sec
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def _trim(self, key: str, now: float) -> Deque[float]:
+        q = self._hits.get(key)
+        if q is None:
+            return deque()
+        cutoff = now - self.window_sec
+        while q and q[0] <= cutoff:
+            q.popleft()
+        if not q:
+            del self._hits[key]
+        return q
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> int:
+        """제한 중이면 남은 초, 아니면 0"""
+        now = time.monotonic() if now is None else now
+        q = self._trim(key, now)
+        if len(q) < self.limit:
+            return 0
+        return max(1, int(q[0] + self.window_sec - now) + 1)
+
+    def fail(self, key: str, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        q = self._hits.setdefault(key, deque())
+        q.append(now)
+        self._hits.move_to_end(key)
+        while len(self._hits) > self.max_keys:
+            self._hits.popitem(last=False)
+
+    def reset(self, key: str) -> None:
+        self._hits.pop(key, None)
+
+
+class PasswordService:
+    def __init__(self, workers: int = PASSWORD_WORKERS, queue_max: int = PASSWORD_QUEUE_MAX,
+                 rounds: int = BCRYPT_ROUNDS):
+        self.workers = workers
+        self.queue_max = queue_max
+        self.rounds = rounds
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._mp_start = PASSWORD_MP_START
+        self._inflight = 0
+        self.restarts = 0
+        self.accounts = AttemptLimiter(LOGIN_MAX_PER_ACCOUNT, LOGIN_WINDOW_SEC)
+        self.ips = AttemptLimiter(LOGIN_MAX_PER_IP, LOGIN_WINDOW_SEC)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context(self._mp_start)
+            )
+        return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        """깨진 풀을 버림 (동시에 실패한 요청들이 여러 번 버리지 않도록 같은 풀일 때만)"""
+        if self._pool is not pool:
+            return
+        self._pool = None
+        self._mp_start = PASSWORD_MP_RESTART
+        self.restarts += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+        print(f"비밀번호 해시 워커 풀이 깨져 다시 만듦 ({PASSWORD_MP_RESTART}, {self.restarts}회째)")
+
+    async def start(self) -> None:
+        """워커 미리 기동 (첫 로그인이 프로세스 생성 비용을 떠안지 않도록)"""
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        await asyncio.gather(*[loop.run_in_executor(pool, _noop) for _ in range(self.workers)])
+
+    async def _submit(self, fn, *args):
+        if self._inflight >= self.queue_max:
+            raise PasswordBusy()
+        self._inflight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            pool = self._executor()
+            try:
+                return await loop.run_in_executor(pool, fn, *args)
+            except BrokenProcessPool:
+                # 워커가 죽음(OOM kill 등) → 새 풀에서 한 번만 다시 시도
+                self._discard(pool)
+                return await loop.run_in_executor(self._executor(), fn, *args)
+        finally:
+            self._inflight -= 1
+
+    async def hash(self, plain: str) -> str:
+        return await self._submit(_hash, plain, self.rounds)
+
+    async def verify(self, plain: str, hashed: Optional[str]) -> bool:
+        if not hashed:
+            return False
+        return await self._submit(_verify, plain, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return hash_cost(hashed) != self.rounds
+
+    async def verify_and_update(self, plain: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """(일치 여부, 새 해시 또는 None). cost 가 바뀌었으면 새 해시를 만들어 돌려줌"""
+        ok = await self.verify(plain, hashed)
+        if ok and self.needs_rehash(hashed):
+            try:
+                return True, await self.hash(plain)
+            except PasswordBusy:
+                # 재해시는 다음 로그인으로 미룸
+                return True, None
+        return ok, None
+
+    # ── 로그인 시도 제한 ──
+    def check_login(self, account: str, ip: str) -> None:
+        wait = max(self.accounts.retry_after(account), self.ips.retry_after(ip))
+        if wait:
+            raise TooManyAttempts(wait)
+
+    def login_failed(self, account: str, ip: str) -> None:
+        self.accounts.fail(account)
+        self.ips.fail(ip)
+
+    def login_succeeded(self, account: str) -> None:
+        self.accounts.reset(account)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+passwords = PasswordService()
@@ -0,0 +1,218 @@
+# models/profiler.py
+"""
+운영 중 켜고 끄는 프로파일러 (관리자 전용 /admin/profile/*).
+
+- StackSampler: 별도 스레드가 PROFILE_INTERVAL_MS 마다 이벤트 루프 스레드의 파이썬 스택을 읽어 개수만 셈
+  (sys._current_frames, 코드 객체 튜플 → 횟수). 10ms 간격이면 부하는 1% 안팎
+  · 시간 지정: N 초 동안 루프 스레드 전체 (벽시계 기준, idle=False 면 selector 대기 샘플 제외)
+  · 요청 지정: 경로가 맞는 다음 N 개 요청을 처리하는 태스크가 실행 중일 때만 기록 (ProfileMiddleware)
+  · 결과는 collapsed stack 텍스트 ("a;b;c 12") → flamegraph.pl / speedscope 에 바로 넣을 수 있음
+  · 샘플러 스레드도 GIL 을 얻어야 읽을 수 있어 GIL 을 놓는 지점(대기, I/O)에 샘플이 몰리는 편향이 있음
+    → 짧게 여러 번보다 한 번 길게(또는 요청 수를 넉넉히) 잡을 것
+- MemoryTracker: tracemalloc 시작 → 스냅샷 → 이전 스냅샷과 비교 (캐시 누수 찾기). 켜져 있는 동안은 느려지므로 다 쓰면 stop
+"""
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, Optional, Pattern, Set, Tuple
+
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+PROFILE_MAX_SEC = float(os.getenv("PROFILE_MAX_SEC", "120"))
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._counts: Counter = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        # 요청 지정 모드
+        self.match: Optional[Pattern] = None
+        self.remaining = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self._done: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def _start(self, interval_ms: float, idle: bool, only_tasks: bool) -> None:
+        if self.running:
+            raise ProfilerBusy()
+        loop = asyncio.get_running_loop()
+        target = threading.get_ident()   # 이벤트 루프 스레드
+        self._counts = Counter()
+        self.samples = 0
+        self.started_at = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(loop, target, interval_ms / 1000.0, idle, only_tasks),
+            name="stack-sampler", daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, loop, target: int, interval: float, idle: bool, only_tasks: bool) -> None:
+        counts, tasks = self._counts, self._tasks
+        while not self._stop.wait(interval):
+            if only_tasks:
+                try:
+                    if asyncio.current_task(loop) not in tasks:
+                        continue
+                except RuntimeError:
+                    continue
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            if not idle and os.path.basename(frame.f_code.co_filename) == "selectors.py":
+                continue
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            counts[tuple(codes)] += 1
+            self.samples += 1
+
+    def _finish(self) -> str:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+        self.match = None
+        self._tasks.clear()
+        self._done = None
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        """root;...;leaf 횟수 (많은 순)"""
+        labels: Dict[object, str] = {}
+        merged: Counter = Counter()
+        for codes, n in self._counts.items():
+            parts = []
+            for code in reversed(codes):
+                name = labels.get(code)
+                if name is None:
+                    name = labels[code] = _label(code).replace(";", ":")
+                parts.append(name)
+            merged[";".join(parts)] += n
+        return "".join(f"{stack} {n}\n" for stack, n in merged.most_common())
+
+    async def profile_for(self, seconds: float, interval_ms: float = PROFILE_INTERVAL_MS, idle: bool = True) -> str:
+        """seconds 동안 루프 스레드 전체 샘플링"""
+        self._start(interval_ms, idle, only_tasks=False)
+        try:
+            await asyncio.sleep(min(seconds, PROFILE_MAX_SEC))
+        finally:
+            result = self._finish()
+        return result
+
+    async def profile_requests(self, pattern: str, count: int, timeout: float,
+                               interval_ms: float = PROFILE_INTERVAL_MS) -> str:
+        """경로가 pattern 에 맞는 다음 count 개 요청만 샘플링 (timeout 초가 지나면 그때까지 결과)"""
+        match = re.compile(pattern)
+        self._start(interval_ms, idle=False, only_tasks=True)
+        self.match, self.remaining = match, count
+        self._done = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=min(timeout, PROFILE_MAX_SEC))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            result = self._finish()
+        return result
+
+    def request_started(self, path: str) -> bool:
+        """ProfileMiddleware 가 호출. 이번 요청을 샘플링하면 True"""
+        if self.match is None or self.remaining <= 0 or not self.match.search(path):
+            return False
+        self.remaining -= 1
+        self._tasks.add(asyncio.current_task())
+        return True
+
+    def request_finished(self) -> None:
+        self._tasks.discard(asyncio.current_task())
+        if self.remaining <= 0 and not self._tasks and self._done is not None:
+            self._done.set()
+
+
+class ProfileMiddleware:
+    """요청 지정 프로파일링 중일 때만 해당 요청의 태스크를 등록 (평소에는 속성 확인 1번)"""
+
+    def __init__(self, app, sampler: StackSampler):
+        self.app = app
+        self.sampler = sampler
+
+    async def __call__(self, scope, receive, send):
+        sampler = self.sampler
+        if scope["type"] != "http" or sampler.match is None or not sampler.request_started(scope["path"]):
+            return await self.app(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.request_finished()
+
+
+class MemoryTracker:
+    def __init__(self):
+        self._last: Optional[tracemalloc.Snapshot] = None
+        self._last_at = 0.0
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._last = None
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._last = None
+
+    def snapshot(self, limit: int = 30, key: str = "lineno") -> Tuple[str, bool]:
+        """
+        스냅샷을 찍고 이전 스냅샷과의 차이(증가량 순) 텍스트 반환. 이번 스냅샷이 다음 비교 기준.
+        (텍스트, 비교했는지) - 첫 스냅샷이면 현재 상위 할당만 보여줌
+        """
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        now = time.time()
+        lines = [f"# traced {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB)"]
+        if self._last is None:
+            lines.append(f"# 기준 스냅샷 (상위 {limit}, key={key})")
+            for stat in snap.statistics(key)[:limit]:
+                lines.append(str(stat))
+                if key == "traceback":
+                    lines.extend("    " + l for l in stat.traceback.format())
+            compared = False
+        else:
+            lines.append(f"# {now - self._last_at:.0f}초 전 스냅샷 대비 증가량 (상위 {limit}, key={key})")
+            for stat in snap.compare_to(self._last, key)[:limit]:
+                lines.append(str(stat))
+                if key == "traceback":
+                    lines.extend("    " + l for l in stat.traceback.format())
+            compared = True
+        self._last, self._last_at = snap, now
+        return "\n".join(lines) + "\n", compared
+
+
+sampler = StackSampler()
+memory = MemoryTracker()
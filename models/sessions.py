@@ -0,0 +1,220 @@
+# models/sessions.py
+"""
+서버 저장 세션.
+
+- 쿠키에는 랜덤 세션 ID 만 (서명/직렬화된 세션 전체를 매 응답마다 보내지 않음)
+- 세션 데이터는 sessions 테이블 + 메모리 LRU (write-through, SESSION_CACHE_TTL 지나면 DB 재확인)
+- 만료는 슬라이딩: 마지막 연장 후 SESSION_TOUCH_SEC 가 지난 요청에서만 expires_at 갱신 + 쿠키 재발급
+- 만료된 세션은 run() 이 주기적으로 한 번에 삭제, revoke_user() 로 사용자의 모든 세션 폐기
+- session["user"] 의 포인트/등급/닉네임은 요청마다 user_repo(캐시)에서 다시 채움 → 값이 낡지 않음
+- 로그인/로그아웃(사용자·관리자)으로 주체가 바뀌면 세션 ID 를 새로 발급 (세션 고정 방지)
+"""
+import json
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+from database.connection import database
+from models.background import shutdown
+from models.user_repo import user_repo
+
+SESSION_MAX_AGE = int(os.getenv("SESSION_MAX_AGE", str(14 * 24 * 60 * 60)))
+SESSION_TOUCH_SEC = int(os.getenv("SESSION_TOUCH_SEC", "300"))
+SESSION_SWEEP_SEC = int(os.getenv("SESSION_SWEEP_SEC", "600"))
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "20000"))
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "30"))
+
+
+def _session_user_id(data: Dict[str, Any]) -> Optional[int]:
+    user = data.get("user")
+    return user.get("id") if isinstance(user, dict) else None
+
+
+def _auth_key(data: Dict[str, Any]) -> Tuple[Optional[int], bool]:
+    """로그인 주체 (사용자 id, 관리자 로그인 여부). 바뀌면 세션 ID 재발급"""
+    return _session_user_id(data), bool(data.get("admin_logged_in"))
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+class SessionStore:
+    def __init__(self, max_age: int = SESSION_MAX_AGE, cache_size: int = SESSION_CACHE_SIZE):
+        self.max_age = max_age
+        self.cache_size = cache_size
+        # sid → (data_json, user_id, expires_at, cached_at)
+        self._cache: "OrderedDict[str, Tuple[str, Optional[int], int, float]]" = OrderedDict()
+
+    @staticmethod
+    def new_id() -> str:
+        return secrets.token_urlsafe(32)
+
+    def _remember(self, sid: str, data_json: str, user_id: Optional[int], expires_at: int) -> None:
+        self._cache[sid] = (data_json, user_id, expires_at, time.monotonic())
+        self._cache.move_to_end(sid)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def load(self, sid: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """(데이터, expires_at). 없거나 만료면 None"""
+        now = int(time.time())
+        entry = self._cache.get(sid)
+        if entry and time.monotonic() - entry[3] > SESSION_CACHE_TTL:
+            entry = None
+        if entry is None:
+            row = await database.fetch_one(
+                "SELECT data, user_id, expires_at FROM sessions WHERE id = :id", {"id": sid}
+            )
+            if not row:
+                self._cache.pop(sid, None)
+                return None
+            entry = (row["data"], row["user_id"], row["expires_at"], time.monotonic())
+            self._remember(sid, *entry[:3])
+        else:
+            self._cache.move_to_end(sid)
+        if entry[2] <= now:
+            return None
+        return json.loads(entry[0]), entry[2]
+
+    async def save(self, sid: str, data: Dict[str, Any]) -> None:
+        data_json = _dumps(data)
+        user_id = _session_user_id(data)
+        expires_at = int(time.time()) + self.max_age
+        await database.execute("""
+            INSERT INTO sessions (id, user_id, data, expires_at)
+            VALUES (:id, :user_id, :data, :expires_at)
+            ON CONFLICT(id) DO UPDATE SET
+              user_id = excluded.user_id, data = excluded.data, expires_at = excluded.expires_at
+        """, {"id": sid, "user_id": user_id, "data": data_json, "expires_at": expires_at})
+        self._remember(sid, data_json, user_id, expires_at)
+
+    async def touch(self, sid: str) -> None:
+        """슬라이딩 만료 연장"""
+        expires_at = int(time.time()) + self.max_age
+        await database.execute(
+            "UPDATE sessions SET expires_at = :expires_at WHERE id = :id",
+            {"id": sid, "expires_at": expires_at},
+        )
+        entry = self._cache.get(sid)
+        if entry:
+            self._remember(sid, entry[0], entry[1], expires_at)
+
+    async def delete(self, sid: str) -> None:
+        await database.execute("DELETE FROM sessions WHERE id = :id", {"id": sid})
+        self._cache.pop(sid, None)
+
+    async def revoke_user(self, user_id: int) -> int:
+        """사용자의 모든 세션 폐기 (탈퇴/정지/비밀번호 변경 시)"""
+        rows = await database.fetch_all(
+            "DELETE FROM sessions WHERE user_id = :user_id RETURNING id", {"user_id": user_id}
+        )
+        for sid in [sid for sid, e in self._cache.items() if e[1] == user_id]:
+            del self._cache[sid]
+        return len(rows)
+
+    async def sweep(self) -> int:
+        """만료 세션 일괄 삭제"""
+        now = int(time.time())
+        rows = await database.fetch_all(
+            "DELETE FROM sessions WHERE expires_at <= :now RETURNING id", {"now": now}
+        )
+        for sid in [sid for sid, e in self._cache.items() if e[2] <= now]:
+            del self._cache[sid]
+        return len(rows)
+
+    async def run(self) -> None:
+        """lifespan 에서 백그라운드 태스크로 실행 (shutdown 신호로 종료)"""
+        while not shutdown.stopping:
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"세션 정리 오류: {e}")
+            if await shutdown.sleep(SESSION_SWEEP_SEC):
+                return
+
+
+async def refresh_session_user(session: Dict[str, Any]) -> None:
+    """session["user"] 의 가변 정보를 user_repo 기준으로 갱신. 삭제된 사용자면 로그아웃"""
+    uid = _session_user_id(session)
+    if uid is None:
+        return
+    rec = await user_repo.get(uid)
+    if not rec or rec["deleted"]:
+        session.pop("user", None)
+        return
+    session["user"].update({
+        "user_id": rec["user_id"],
+        "name": rec["name"],
+        "nickname": rec["nickname"],
+        "is_admin": rec["role"] == "admin",
+        "points": rec["points"],
+        "level": rec["level"],
+    })
+
+
+class ServerSessionMiddleware:
+    """starlette SessionMiddleware 와 같은 scope["session"] 인터페이스, 저장은 SessionStore"""
+
+    def __init__(self, app, store: SessionStore, session_cookie: str = "session",
+                 same_site: str = "lax", https_only: bool = False, skip_paths: Tuple[str, ...] = ("/static",)):
+        self.app = app
+        self.store = store
+        self.session_cookie = session_cookie
+        self.skip_paths = skip_paths
+        self.security_flags = "httponly; samesite=" + same_site
+        if https_only:
+            self.security_flags += "; secure"
+
+    def _cookie(self, value: str, max_age: Optional[int]) -> str:
+        age = f"Max-Age={max_age}; " if max_age is not None else "expires=Thu, 01 Jan 1970 00:00:00 GMT; "
+        return f"{self.session_cookie}={value}; path=/; {age}{self.security_flags}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+        if scope["path"].startswith(self.skip_paths):
+            scope["session"] = {}
+            return await self.app(scope, receive, send)
+
+        sid = HTTPConnection(scope).cookies.get(self.session_cookie)
+        loaded = await self.store.load(sid) if sid else None
+        data, expires_at = loaded if loaded else ({}, 0)
+        await refresh_session_user(data)
+        scope["session"] = data
+        before = _dumps(data)
+        before_auth = _auth_key(data)
+        needs_touch = bool(loaded) and expires_at - time.time() < self.store.max_age - SESSION_TOUCH_SEC
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                session = scope["session"]
+                headers = MutableHeaders(scope=message)
+                if not session:
+                    if loaded:
+                        await self.store.delete(sid)
+                    if sid:
+                        headers.append("Set-Cookie", self._cookie("null", None))
+                elif not loaded or _dumps(session) != before:
+                    new_sid = sid
+                    if not loaded or _auth_key(session) != before_auth:
+                        # 새 세션이거나 로그인 주체가 바뀜 → 새 ID
+                        if loaded:
+                            await self.store.delete(sid)
+                        new_sid = self.store.new_id()
+                    await self.store.save(new_sid, session)
+                    headers.append("Set-Cookie", self._cookie(new_sid, self.store.max_age))
+                elif needs_touch:
+                    await self.store.touch(sid)
+                    headers.append("Set-Cookie", self._cookie(sid, self.store.max_age))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+session_store = SessionStore()
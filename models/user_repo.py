@@ -0,0 +1,156 @@
+# models/user_repo.py
+"""
+사용자 조회 저장소 (read-through 캐시).
+
+- id / user_id / nickname / email 어느 키로 찾든 같은 레코드를 LRU+TTL 캐시에 보관
+- 쓰기 경로(가입, 관리자 수정/삭제, 포인트/경험치 반영, 비밀번호 재해시)는 invalidate() 호출
+- 무효화와 동시에 진행 중이던 조회 결과는 캐시에 넣지 않음 (세대 번호 비교)
+- UserMemoMiddleware 가 요청마다 memo 를 열어 한 요청 안에서는 같은 사용자를 두 번 읽지 않음
+"""
+import os
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from database.connection import database
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+
+LOOKUP_COLUMNS = ("id", "user_id", "nickname", "email")
+
+_SELECT = """
+    SELECT id, user_id, email, name, nickname, password, role, status,
+           level, exp, points, total_posts, total_comments, total_likes, deleted
+    FROM users
+"""
+
+# 요청 단위 memo: (컬럼, 값) → 레코드(없으면 None)
+_memo: ContextVar[Optional[Dict[Tuple[str, Any], Optional[Dict[str, Any]]]]] = ContextVar("user_memo", default=None)
+
+
+def _to_record(row) -> Dict[str, Any]:
+    d = dict(row)
+    d["password_hash"] = d.pop("password")
+    d["deleted"] = bool(d["deleted"])
+    d["level"] = d["level"] or 1
+    for k in ("exp", "points", "total_posts", "total_comments", "total_likes"):
+        d[k] = d[k] or 0
+    return d
+
+
+class UserRepository:
+    def __init__(self, maxsize: int = USER_CACHE_SIZE, ttl: float = USER_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._by_id: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._keys: Dict[Tuple[str, Any], int] = {}
+        self._gen = 0
+        self.hits = 0
+        self.misses = 0
+
+    # ── 캐시 내부 ──
+    def _drop(self, uid: int) -> None:
+        entry = self._by_id.pop(uid, None)
+        if not entry:
+            return
+        rec = entry[1]
+        for col in LOOKUP_COLUMNS[1:]:
+            key = (col, rec.get(col))
+            if self._keys.get(key) == uid:
+                del self._keys[key]
+
+    def _cached(self, column: str, value: Any) -> Optional[Dict[str, Any]]:
+        uid = value if column == "id" else self._keys.get((column, value))
+        if uid is None:
+            return None
+        entry = self._by_id.get(uid)
+        if not entry or entry[0] < time.monotonic() or entry[1].get(column) != value:
+            self._drop(uid)
+            self._keys.pop((column, value), None)
+            return None
+        self._by_id.move_to_end(uid)
+        return entry[1]
+
+    def _put(self, rec: Dict[str, Any]) -> None:
+        uid = rec["id"]
+        self._drop(uid)
+        self._by_id[uid] = (time.monotonic() + self.ttl, rec)
+        for col in LOOKUP_COLUMNS[1:]:
+            if rec.get(col) is not None:
+                self._keys[(col, rec[col])] = uid
+        while len(self._by_id) > self.maxsize:
+            self._drop(next(iter(self._by_id)))
+
+    # ── 조회 ──
+    async def get_by(self, column: str, value: Any) -> Optional[Dict[str, Any]]:
+        """레코드 사본 반환 (소프트 삭제된 사용자 포함, deleted 로 구분). 없으면 None"""
+        if column not in LOOKUP_COLUMNS:
+            raise ValueError(f"조회할 수 없는 컬럼: {column}")
+        if value is None:
+            return None
+
+        memo = _memo.get()
+        mkey = (column, value)
+        if memo is not None and mkey in memo:
+            rec = memo[mkey]
+            return dict(rec) if rec else None
+
+        rec = self._cached(column, value)
+        if rec is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            gen = self._gen
+            row = await database.fetch_one(f"{_SELECT} WHERE {column} = :v LIMIT 1", {"v": value})
+            rec = _to_record(row) if row else None
+            if rec and gen == self._gen:
+                self._put(rec)
+
+        if memo is not None:
+            memo[mkey] = rec
+        return dict(rec) if rec else None
+
+    async def get(self, id: int) -> Optional[Dict[str, Any]]:
+        return await self.get_by("id", id)
+
+    async def get_active_by(self, column: str, value: Any) -> Optional[Dict[str, Any]]:
+        """소프트 삭제된 사용자는 None"""
+        rec = await self.get_by(column, value)
+        return rec if rec and not rec["deleted"] else None
+
+    # ── 무효화 ──
+    def invalidate(self, *ids: Optional[int]) -> None:
+        """ids 를 캐시에서 제거. ids 없이 호출하면(가입 등) 진행 중인 조회만 무효화"""
+        self._gen += 1
+        for uid in ids:
+            if uid is not None:
+                self._drop(uid)
+        memo = _memo.get()
+        if memo is not None:
+            memo.clear()
+
+    def clear(self) -> None:
+        self._gen += 1
+        self._by_id.clear()
+        self._keys.clear()
+
+
+class UserMemoMiddleware:
+    """요청마다 빈 memo 를 열어주는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = _memo.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _memo.reset(token)
+
+
+user_repo = UserRepository()
@@ -2,10 +2,12 @@
 from typing import Optional, Dict, Any
 import datetime
 
-from passlib.context import CryptContext
-from sqlalchemy import Table, Column, Integer, String, DateTime, Boolean, select, insert
+from sqlalchemy import Table, Column, Integer, String, DateTime, Boolean, insert
 
 from database.connection import metadata, database  # ✅ connect_db 대신 database 사용
+from models.passwords import passwords
+from models.user_repo import user_repo
+from models.availability import availability
 
 # =========================
 # 유저 테이블 정의
@@ -80,6 +82,14 @@ def calculate_level(exp: int) -> int:
             return level
     return 1
 
+def level_sql(exp_expr: str) -> str:
+    """calculate_level 과 같은 계산을 SQL CASE 식으로 (UPDATE 안에서 등급까지 한 번에 갱신)"""
+    whens = " ".join(
+        f"WHEN {exp_expr} >= {LEVEL_EXP_REQUIREMENTS[level]} THEN {level}"
+        for level in range(10, 1, -1)
+    )
+    return f"CASE {whens} ELSE 1 END"
+
 def get_level_name(level: int) -> str:
     """등급 번호로 등급 이름 반환"""
     return LEVEL_NAMES.get(level, "새내기")
@@ -97,170 +107,54 @@ def get_exp_progress(exp: int, level: int) -> float:
     return ((exp - current_level_exp) / (next_level_exp - current_level_exp)) * 100
 
 # =========================
-# 비밀번호 해시/검증
+# 비밀번호 해시/검증 (models.passwords 프로세스 풀에서 실행)
 # =========================
-pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+async def hash_password(plain: str) -> str:
+    return await passwords.hash(plain)
 
-def hash_password(plain: str) -> str:
-    return pwd_ctx.hash(plain)
+async def verify_password(plain: str, hashed: str) -> bool:
+    return await passwords.verify(plain, hashed)
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_ctx.verify(plain, hashed)
+async def update_password_hash(id: int, hashed: str) -> None:
+    """cost 변경 등으로 다시 만든 해시 저장"""
+    await database.execute(
+        "UPDATE users SET password = :password WHERE id = :id", {"password": hashed, "id": id}
+    )
+    user_repo.invalidate(id)
 
 # =========================
 # DB 헬퍼 함수 (Databases 사용)
 # =========================
+# 조회는 모두 user_repo(LRU+TTL 캐시, 요청 단위 memo)를 거친다
 async def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     """
     email로 사용자 1명 조회. 소프트삭제(deleted=True)면 None 반환.
     """
-    q = (
-        select(
-            users.c.id,
-            users.c.user_id,
-            users.c.email,
-            users.c.name,
-            users.c.nickname,
-            users.c.password,   # 해시
-            users.c.role,
-            users.c.deleted,
-        )
-        .where(users.c.email == email)
-        .limit(1)
-    )
-    row = await database.fetch_one(q)
-    if not row:
-        return None
-    # 일부 DB에서 Boolean이 0/1로 들어올 수 있으니 bool 처리
-    if bool(row["deleted"]):
-        return None
-    return {
-        "id": row["id"],
-        "user_id": row["user_id"],
-        "email": row["email"],
-        "name": row["name"],
-        "nickname": row["nickname"],
-        "password_hash": row["password"],
-        "role": row["role"],
-    }
+    return await user_repo.get_active_by("email", email)
 
 async def get_user_by_user_id(user_id: str) -> Optional[Dict[str, Any]]:
     """
     user_id로 사용자 1명 조회. 소프트삭제(deleted=True)면 None 반환.
     """
-    q = (
-        select(
-            users.c.id,
-            users.c.user_id,
-            users.c.email,
-            users.c.name,
-            users.c.nickname,
-            users.c.password,   # 해시
-            users.c.role,
-            users.c.deleted,
-        )
-        .where(users.c.user_id == user_id)
-        .limit(1)
-    )
-    row = await database.fetch_one(q)
-    if not row:
-        return None
-    # 일부 DB에서 Boolean이 0/1로 들어올 수 있으니 bool 처리
-    if bool(row["deleted"]):
-        return None
-    return {
-        "id": row["id"],
-        "user_id": row["user_id"],
-        "email": row["email"],
-        "name": row["name"],
-        "nickname": row["nickname"],
-        "password_hash": row["password"],
-        "role": row["role"],
-    }
+    return await user_repo.get_active_by("user_id", user_id)
 
 async def get_user_by_nickname(nickname: str) -> Optional[Dict[str, Any]]:
     """
     nickname으로 사용자 1명 조회. 소프트삭제(deleted=True)면 None 반환.
     """
-    q = (
-        select(
-            users.c.id,
-            users.c.user_id,
-            users.c.email,
-            users.c.name,
-            users.c.nickname,
-            users.c.password,   # 해시
-            users.c.role,
-            users.c.deleted,
-        )
-        .where(users.c.nickname == nickname)
-        .limit(1)
-    )
-    row = await database.fetch_one(q)
-    if not row:
-        return None
-    # 일부 DB에서 Boolean이 0/1로 들어올 수 있으니 bool 처리
-    if bool(row["deleted"]):
-        return None
-    return {
-        "id": row["id"],
-        "user_id": row["user_id"],
-        "email": row["email"],
-        "name": row["name"],
-        "nickname": row["nickname"],
-        "password_hash": row["password"],
-        "role": row["role"],
-    }
+    return await user_repo.get_active_by("nickname", nickname)
 
 async def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
     """
     id로 사용자 1명 조회. 소프트삭제(deleted=True)면 None 반환.
     """
-    q = (
-        select(
-            users.c.id,
-            users.c.user_id,
-            users.c.email,
-            users.c.name,
-            users.c.nickname,
-            users.c.password,   # 해시
-            users.c.role,
-            users.c.level,
-            users.c.exp,
-            users.c.total_posts,
-            users.c.total_comments,
-            users.c.total_likes,
-            users.c.deleted,
-        )
-        .where(users.c.id == user_id)
-        .limit(1)
-    )
-    row = await database.fetch_one(q)
-    if not row:
-        return None
-    # 일부 DB에서 Boolean이 0/1로 들어올 수 있으니 bool 처리
-    if bool(row["deleted"]):
-        return None
-    return {
-        "id": row["id"],
-        "user_id": row["user_id"],
-        "email": row["email"],
-        "name": row["name"],
-        "nickname": row["nickname"],
-        "password_hash": row["password"],
-        "role": row["role"],
-        "level": row["level"],
-        "exp": row["exp"],
-        "total_posts": row["total_posts"],
-        "total_comments": row["total_comments"],
-        "total_likes": row["total_likes"],
-    }
+    return await user_repo.get_active_by("id", user_id)
 
 async def create_user(user_id: str, nickname: str, email: str, name: str, plain_password: str, role: str = "user") -> int:
     """
     사용자 생성 후 id 반환. 비밀번호는 bcrypt 해시로 저장.
     """
-    ph = hash_password(plain_password)
+    ph = await hash_password(plain_password)
     now = datetime.datetime.utcnow()
     q = (
         insert(users)
@@ -283,60 +177,19 @@ async def create_user(user_id: str, nickname: str, email: str, name: str, plain_
     )
     # databases execute는 PK를 반환합니다(SQLite/SQLite3 OK)
     new_id = await database.execute(q)
+    user_repo.invalidate()
+    if new_id is not None:
+        availability.set_user(int(new_id), user_id, nickname, email)
     return int(new_id) if new_id is not None else 0
 
 # =========================
 # 등급 시스템 DB 함수
 # =========================
-async def add_user_exp(user_id: int, exp_amount: int, reason: str = "activity") -> bool:
-    """
-    사용자 경험치 추가 및 등급 업데이트
-    """
-    from sqlalchemy import update
-    
-    # 현재 사용자 정보 조회
-    user = await get_user_by_id(user_id)
-    if not user:
-        return False
-    
-    current_exp = user.get("exp", 0)
-    current_level = user.get("level", 1)
-    
-    # 새로운 경험치와 등급 계산
-    new_exp = current_exp + exp_amount
-    new_level = calculate_level(new_exp)
-    
-    # DB 업데이트
-    q = (
-        update(users)
-        .where(users.c.id == user_id)
-        .values(exp=new_exp, level=new_level)
-    )
-    await database.execute(q)
-    
-    # 등급 업 확인
-    if new_level > current_level:
-        return True  # 등급 업 발생
-    return False
-
 async def get_user_level_info(user_id: int) -> Optional[Dict[str, Any]]:
     """
     사용자의 등급 정보 조회
     """
-    q = (
-        select(
-            users.c.id,
-            users.c.nickname,
-            users.c.level,
-            users.c.exp,
-            users.c.total_posts,
-            users.c.total_comments,
-            users.c.total_likes,
-        )
-        .where(users.c.id == user_id)
-        .limit(1)
-    )
-    row = await database.fetch_one(q)
+    row = await user_repo.get(user_id)
     if not row:
         return None
     
@@ -355,21 +208,3 @@ async def get_user_level_info(user_id: int) -> Optional[Dict[str, Any]]:
         "total_comments": row["total_comments"],
         "total_likes": row["total_likes"],
     }
-
-async def increment_user_stats(user_id: int, stat_type: str) -> bool:
-    """
-    사용자 통계 증가 (게시글, 댓글, 추천 수)
-    """
-    from sqlalchemy import update
-    
-    if stat_type == "posts":
-        q = update(users).where(users.c.id == user_id).values(total_posts=users.c.total_posts + 1)
-    elif stat_type == "comments":
-        q = update(users).where(users.c.id == user_id).values(total_comments=users.c.total_comments + 1)
-    elif stat_type == "likes":
-        q = update(users).where(users.c.id == user_id).values(total_likes=users.c.total_likes + 1)
-    else:
-        return False
-    
-    await database.execute(q)
-    return True
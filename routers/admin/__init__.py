@@ -5,6 +5,9 @@ from .users import router as users_router
 from .login import router as login_router
 from .posts import router as posts_router
 from .views import router as views_router
+from .queries import router as queries_router
+from .metrics import router as metrics_router
+from .profile import router as profile_router
 
 router = APIRouter()
 
@@ -14,3 +17,6 @@ router.include_router(dashboard_router)
 router.include_router(users_router)
 router.include_router(posts_router)
 router.include_router(views_router)
+router.include_router(queries_router)
+router.include_router(metrics_router)
+router.include_router(profile_router)
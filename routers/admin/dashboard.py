@@ -1,11 +1,10 @@
 # routers/admin/dashboard.py
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 from starlette import status
 
 router = APIRouter(prefix="/admin", tags=["admin"])
-templates = Jinja2Templates(directory="templates")
 
 @router.get("/", include_in_schema=False)
 async def admin_root():
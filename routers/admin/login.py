@@ -1,12 +1,11 @@
 # routers/admin/login.py
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 from starlette import status                      # ✅ 변경: status 모듈 사용
 from urllib.parse import urlparse
 
 router = APIRouter(prefix="/admin", tags=["admin"])
-templates = Jinja2Templates(directory="templates")
 
 ADMIN_ID = "admin"
 ADMIN_PW = "1234"
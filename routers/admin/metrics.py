@@ -0,0 +1,32 @@
+# routers/admin/metrics.py
+import os
+import secrets
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse, Response
+from starlette import status
+from models.metrics import registry
+
+router = APIRouter(tags=["admin"])
+
+# 수집기(Prometheus)용 토큰: Authorization: Bearer <METRICS_TOKEN>. 비어 있으면 관리자 세션만 허용
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+def _authorized(request: Request) -> bool:
+    if request.session.get("admin_logged_in"):
+        return True
+    auth = request.headers.get("authorization", "")
+    return bool(METRICS_TOKEN) and secrets.compare_digest(auth, f"Bearer {METRICS_TOKEN}")
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus 텍스트 형식 메트릭 (models/metrics.py)"""
+    if not _authorized(request):
+        return Response("Admin only", status_code=status.HTTP_403_FORBIDDEN)
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+        headers={"Cache-Control": "no-store"},
+    )
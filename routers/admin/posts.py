@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, Request, Form, UploadFile, File
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 from starlette.status import HTTP_302_FOUND
 from typing import List, Optional
 from datetime import datetime, timezone
@@ -12,7 +12,6 @@ from database.connection import database
 from .utils import save_upload
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 def check_admin_session(request: Request) -> bool:
     """어드민 세션이 유효한지 확인"""
@@ -8,6 +8,8 @@ from routers.admin.security import require_admin  # is_admin 세션 확인
 
 # ▶ 시간 포맷(KST) 재사용
 from routers.users.board.utils import format_dt_to_kst
+from routers.users.board.fragment_cache import fragment_cache
+from routers.users.board.etag import versions
 
 from datetime import datetime, timezone  # updated_at 갱신용
 from typing import List
@@ -167,6 +169,8 @@ async def admin_board_edit_save(
             "board": board.value,
         },
     )
+    fragment_cache.bump(board.value)
+    versions.bump_post(post_id)
     url = request.url_for("admin_board_list", board=board.value)
     return RedirectResponse(url=url, status_code=status.HTTP_303_SEE_OTHER)
 
@@ -182,6 +186,8 @@ async def admin_board_delete(
         "UPDATE posts SET deleted=1 WHERE id=:id AND board=:board",
         {"id": post_id, "board": board.value},
     )
+    fragment_cache.bump(board.value)
+    versions.bump_post(post_id)
     url = request.url_for("admin_board_list", board=board.value)
     return RedirectResponse(url=url, status_code=status.HTTP_303_SEE_OTHER)
 
@@ -278,6 +284,7 @@ async def admin_board_write_post(
     }
 
     await database.execute(sql, params)
+    fragment_cache.bump(board.value)
 
     # 디버깅: 저장된 글 확인
     print(f"✅ 어드민 투자게시판 글 저장 완료:")
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Request
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 @router.get("/posts/invest")
 async def invest_board(request: Request):
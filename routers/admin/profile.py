@@ -0,0 +1,77 @@
+# routers/admin/profile.py
+import time
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from starlette import status
+from routers.admin.security import require_admin_session
+from models.profiler import sampler, memory, ProfilerBusy, PROFILE_INTERVAL_MS, PROFILE_MAX_SEC
+
+router = APIRouter(prefix="/admin/profile", tags=["admin"], dependencies=[Depends(require_admin_session)])
+
+
+def _collapsed(text: str, kind: str) -> PlainTextResponse:
+    filename = f"profile-{kind}-{time.strftime('%Y%m%d-%H%M%S')}.collapsed"
+    return PlainTextResponse(text, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Profile-Samples": str(sampler.samples),
+        "Cache-Control": "no-store",
+    })
+
+
+def _busy() -> PlainTextResponse:
+    return PlainTextResponse("이미 프로파일링 중입니다.", status_code=status.HTTP_409_CONFLICT)
+
+
+@router.get("/cpu")
+async def profile_cpu(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SEC),
+    interval_ms: float = Query(PROFILE_INTERVAL_MS, ge=1, le=1000),
+    idle: bool = Query(False),
+):
+    """seconds 동안 이벤트 루프 스레드 샘플링 → collapsed stack 파일"""
+    try:
+        text = await sampler.profile_for(seconds, interval_ms, idle=idle)
+    except ProfilerBusy:
+        return _busy()
+    return _collapsed(text, "cpu")
+
+
+@router.get("/requests")
+async def profile_requests(
+    path: str = Query(..., min_length=1, max_length=200, description="경로 정규식 (예: ^/invest)"),
+    count: int = Query(20, ge=1, le=10000),
+    timeout: float = Query(60, gt=0, le=PROFILE_MAX_SEC),
+    interval_ms: float = Query(PROFILE_INTERVAL_MS, ge=1, le=1000),
+):
+    """경로가 맞는 다음 count 개 요청을 처리하는 동안만 샘플링 → collapsed stack 파일"""
+    try:
+        text = await sampler.profile_requests(path, count, timeout, interval_ms)
+    except ProfilerBusy:
+        return _busy()
+    except Exception as e:
+        return PlainTextResponse(f"잘못된 경로 패턴: {e}", status_code=status.HTTP_400_BAD_REQUEST)
+    return _collapsed(text, "requests")
+
+
+@router.post("/memory/start")
+async def memory_start(frames: int = Query(10, ge=1, le=64)):
+    """tracemalloc 시작 (켜져 있는 동안 할당이 느려지므로 다 쓰면 stop)"""
+    memory.start(frames)
+    return PlainTextResponse(f"tracemalloc 시작 (frames={frames})\n")
+
+
+@router.post("/memory/snapshot")
+async def memory_snapshot(limit: int = Query(30, ge=1, le=500),
+                          key: str = Query("lineno", pattern="^(lineno|filename|traceback)$")):
+    """스냅샷을 찍어 직전 스냅샷과 비교한 증가량 (첫 호출은 기준만 잡음)"""
+    if not memory.tracing:
+        return PlainTextResponse("먼저 /admin/profile/memory/start 를 호출하세요.", status_code=status.HTTP_400_BAD_REQUEST)
+    text, compared = memory.snapshot(limit, key)
+    return PlainTextResponse(text, headers={"X-Snapshot-Diff": "1" if compared else "0", "Cache-Control": "no-store"})
+
+
+@router.post("/memory/stop")
+async def memory_stop():
+    memory.stop()
+    return PlainTextResponse("tracemalloc 중지\n")
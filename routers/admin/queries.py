@@ -0,0 +1,52 @@
+# routers/admin/queries.py
+from fastapi import APIRouter, Request, Query
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from routers.templating import templates
+from starlette import status
+from database.instrument import query_stats, BUCKETS_MS
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+ORDERS = ("total_ms", "avg_ms", "max_ms", "p99_ms", "count", "rows")
+
+
+@router.get("/queries", response_class=HTMLResponse)
+async def admin_queries(request: Request, order: str = Query("total_ms"), limit: int = Query(100, ge=1, le=1000)):
+    """문장별 쿼리 통계 + 느린 쿼리 로그"""
+    if not request.session.get("admin_logged_in"):
+        return RedirectResponse("/admin/login", status_code=status.HTTP_302_FOUND)
+    if order not in ORDERS:
+        order = "total_ms"
+
+    response = templates.TemplateResponse(
+        "admin/queries.html",
+        {
+            "request": request,
+            "active_page": "queries",
+            "order": order,
+            "orders": ORDERS,
+            "buckets": BUCKETS_MS,
+            "enabled": query_stats.enabled,
+            **query_stats.snapshot(order=order, limit=limit),
+        },
+    )
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+@router.get("/queries.json")
+async def admin_queries_json(request: Request, order: str = Query("total_ms"), limit: int = Query(100, ge=1, le=1000)):
+    """같은 내용 JSON (수집/스크립트용)"""
+    if not request.session.get("admin_logged_in"):
+        return JSONResponse({"detail": "Admin only"}, status_code=status.HTTP_403_FORBIDDEN)
+    if order not in ORDERS:
+        order = "total_ms"
+    return JSONResponse(query_stats.snapshot(order=order, limit=limit), headers={"Cache-Control": "no-store"})
+
+
+@router.post("/queries/reset")
+async def admin_queries_reset(request: Request):
+    if not request.session.get("admin_logged_in"):
+        return RedirectResponse("/admin/login", status_code=status.HTTP_302_FOUND)
+    query_stats.reset()
+    return RedirectResponse("/admin/queries", status_code=status.HTTP_302_FOUND)
@@ -28,3 +28,11 @@ async def require_admin(request: Request, user=Depends(get_current_user_optional
         return True
 
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+
+async def require_admin_session(request: Request):
+    """
+    관리자 로그인(/admin/login 의 admin_logged_in) 또는 require_admin 조건 중 하나면 통과.
+    """
+    if request.session.get("admin_logged_in"):
+        return True
+    return await require_admin(request, request.session.get("user"))
@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 from starlette import status as status_codes
 from database.connection import database
 from .utils import hash_password
 from routers.admin.security import require_admin
 from models.users import get_level_name, LEVEL_NAMES
+from models.user_repo import user_repo
+from models.sessions import session_store
+from models.availability import availability
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 @router.get("/admin/users", response_class=HTMLResponse, dependencies=[Depends(require_admin)])
 async def admin_users(request: Request):
@@ -61,7 +63,7 @@ async def create_user(
     level: int = Form(1),
     exp: int = Form(0)
 ):
-    hashed_pw = hash_password(password)
+    hashed_pw = await hash_password(password)
     
     # 빈 이메일을 None으로 처리
     email_value = email if email.strip() else None
@@ -118,11 +120,14 @@ async def create_user(
                   "level": level, "exp": exp}
 
     try:
-        await database.execute(sql, values)
+        new_id = await database.execute(sql, values)
     except Exception as e:
         msg = str(e)
         return HTMLResponse(f"❌ 사용자 생성 중 오류 발생: {msg}", status_code=400)
 
+    user_repo.invalidate()
+    availability.set_user(id_value or new_id, user_id, nickname, email_value)
+
     # ✅ 팝업 닫기 로직을 위해 동일 URL로 success=true (303)
     return RedirectResponse("/admin/users/create?success=true", status_code=status_codes.HTTP_303_SEE_OTHER)
 
@@ -197,7 +202,7 @@ async def edit_user(
             WHERE id = :user_id
         """
         values = {"name": name, "nickname": nickname, "email": email_value,
-                  "password": hash_password(password),
+                  "password": await hash_password(password),
                   "role": role, "status": status, "user_id": user_id,
                   "level": level, "exp": exp}
     else:
@@ -216,6 +221,13 @@ async def edit_user(
     except Exception as e:
         msg = str(e)
         return HTMLResponse(f"❌ 사용자 수정 중 오류 발생: {msg}", status_code=400)
+    user_repo.invalidate(user_id)
+    row = await database.fetch_one("SELECT user_id FROM users WHERE id = :id", {"id": user_id})
+    if row:
+        availability.set_user(user_id, row["user_id"], nickname, email_value)
+    if password:
+        # 비밀번호가 바뀌면 기존 로그인 세션 모두 폐기
+        await session_store.revoke_user(user_id)
 
     # ✅ 팝업 닫기 로직과 일치 (success=true)
     return RedirectResponse(f"/admin/users/edit/{user_id}?success=true", status_code=status_codes.HTTP_303_SEE_OTHER)
@@ -224,4 +236,7 @@ async def edit_user(
 @router.get("/admin/users/delete/{user_id}", dependencies=[Depends(require_admin)])
 async def delete_user(user_id: int):
     await database.execute("UPDATE users SET deleted = 1 WHERE id = :user_id", {"user_id": user_id})
+    user_repo.invalidate(user_id)
+    await session_store.revoke_user(user_id)
+    # 소프트 삭제 행도 UNIQUE 제약에 걸리므로 중복 검사 색인의 값은 그대로 둔다
     return RedirectResponse("/admin/users?deleted=1", status_code=status_codes.HTTP_302_FOUND)
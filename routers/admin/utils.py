@@ -1,15 +1,15 @@
-import bcrypt
 import os
 from fastapi import UploadFile
 from datetime import datetime
+from models.passwords import passwords
 
-# 비밀번호 해싱
-def hash_password(plain_password: str) -> str:
-    return bcrypt.hashpw(plain_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# 비밀번호 해싱 (사용자 쪽과 같은 프로세스 풀/설정 사용)
+async def hash_password(plain_password: str) -> str:
+    return await passwords.hash(plain_password)
 
 # 비밀번호 검증
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await passwords.verify(plain_password, hashed_password)
 
 # 파일 업로드 저장
 async def save_upload(upload_dir: str, file: UploadFile) -> str:
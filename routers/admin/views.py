@@ -1,11 +1,10 @@
 # routers/admin/views.py
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 from starlette.status import HTTP_302_FOUND
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # ✅ 관리자 계정 정보
 ADMIN_ID = "admin"
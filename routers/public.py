@@ -1,16 +1,29 @@
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
+
+from routers.users.board.trending import trending
+from routers.users.board.utils import format_dt_to_kst
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+TRENDY_SIZE = 20
+
+
+async def trendy_posts():
+    """홈/trendy 탭 인기글 (post_trending 인덱스 순서대로 읽기 1번)"""
+    posts = await trending.top(TRENDY_SIZE)
+    for d in posts:
+        d["created_at_fmt"] = format_dt_to_kst(d.get("created_at"))
+    return posts
 
 # ✅ 메인 홈 페이지
 @router.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     return templates.TemplateResponse("index.html", {
         "request": request,
-        "category": "trendy"
+        "category": "trendy",
+        "posts": await trendy_posts()
     })
 
 # ✅ 상단 탭 페이지 (trendy, game, sports 등)
@@ -32,5 +45,5 @@ async def show_category(request: Request, category: str):
     return templates.TemplateResponse("index.html", {
         "request": request,
         "category": category,
-        "posts": []
+        "posts": await trendy_posts() if category == "trendy" else []
     })
@@ -0,0 +1,94 @@
+# routers/templating.py
+"""
+앱 전체가 함께 쓰는 Jinja2 환경.
+
+- 라우터마다 Jinja2Templates 를 만들면 같은 템플릿을 모듈 수만큼 파싱/보관 → 하나로 공유
+- 컴파일 결과는 FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)에 저장 → 재시작/다른 워커는 파싱 생략
+- precompile() 로 시작 시(lifespan) 전부 미리 로드. 빌드 단계에서는 `python -m routers.templating`
+- 운영에서는 auto_reload 끔 (요청마다 파일 mtime 확인 안 함). 개발은 TEMPLATE_AUTO_RELOAD=1
+- index.html 의 게시판 본문 include 이름은 board_partial() 이 계산 + 캐시
+"""
+import os
+import time
+from functools import lru_cache
+from typing import Optional
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from models.metrics import template_render
+
+TEMPLATE_DIR = "templates"
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", ".jinja_cache")
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "0") == "1"
+
+# index.html 탭 카테고리 중 boards/<cat>_content.html 로 매핑되는 것
+TAB_BOARDS = ("trendy", "game", "sports", "invest", "gallery", "free", "humor", "report", "counsel")
+
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    try:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+        return FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+    except OSError as e:
+        # 읽기 전용 배포 등 → 메모리 캐시만 사용
+        print(f"템플릿 바이트코드 캐시 사용 불가: {e}")
+        return None
+
+
+class TimedTemplate(Template):
+    """render() 시간을 template_render_seconds 에 기록"""
+
+    def render(self, *args, **kwargs) -> str:
+        started = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            template_render.observe(time.perf_counter() - started, self.name or "<string>")
+
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+    bytecode_cache=_bytecode_cache(),
+    cache_size=-1,  # 템플릿 수가 정해져 있으므로 전부 보관
+)
+env.template_class = TimedTemplate
+
+
+@lru_cache(maxsize=256)
+def board_partial(cat: str) -> Optional[str]:
+    """
+    index.html 본문에 include 할 템플릿 이름.
+    cat='invest' → boards/invest_content.html, cat='invest_view' → boards/invest_view.html (없으면 None)
+    """
+    if not cat:
+        return None
+    name = f"boards/{cat}_content.html" if cat in TAB_BOARDS else f"boards/{cat}.html"
+    return name if name in _template_names() else None
+
+
+@lru_cache(maxsize=1)
+def _template_names() -> frozenset:
+    return frozenset(env.list_templates())
+
+
+def precompile() -> int:
+    """모든 템플릿을 미리 컴파일해 환경 캐시(+바이트코드 캐시)에 올림. 개수 반환"""
+    count = 0
+    for name in env.list_templates(filter_func=lambda n: n.endswith(".html")):
+        try:
+            env.get_template(name)
+            count += 1
+        except Exception as e:
+            print(f"템플릿 컴파일 오류 ({name}): {e}")
+    return count
+
+
+env.globals["board_partial"] = board_partial
+templates = Jinja2Templates(env=env)
+
+
+if __name__ == "__main__":
+    print(f"✅ 템플릿 {precompile()}개 컴파일 → {TEMPLATE_CACHE_DIR}")
@@ -1,15 +1,16 @@
 # routers/users/auth.py
 from fastapi import APIRouter, Request, Form, Query, Depends, HTTPException
 from fastapi.responses import RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 from starlette import status
 from urllib.parse import urlparse
 import re
 
-from models.users import get_user_by_user_id, get_user_by_email, get_user_by_nickname, verify_password, create_user
+from models.users import get_user_by_user_id, get_user_by_email, get_user_by_nickname, create_user, update_password_hash
+from models.passwords import passwords, PasswordBusy, TooManyAttempts
+from models.availability import availability, normalize, KINDS
 
 router = APIRouter(prefix="", tags=["auth"])
-templates = Jinja2Templates(directory="templates")
 
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
@@ -33,26 +34,25 @@ def safe_next(next_url: str | None, default: str = "/") -> str:
     return next_url
 
 @router.get("/check-duplicate")
-async def check_duplicate(type: str = Query(...), value: str = Query(...)):
-    """중복 검사 API"""
+async def check_duplicate(request: Request, type: str = Query(...), value: str = Query(...)):
+    """중복 검사 API (메모리 색인 조회 - 타이핑마다 호출돼도 DB 를 읽지 않음)"""
     if not value or len(value.strip()) < 2:
         return JSONResponse({"available": False, "message": "최소 2자 이상 입력해주세요"})
-    
-    value = value.strip()
-    
+    if type not in KINDS:
+        return JSONResponse({"available": False, "message": "잘못된 검사 타입입니다"})
+
+    client_ip = request.client.host if request.client else "-"
+    wait = availability.check_rate(client_ip)
+    if wait:
+        return JSONResponse(
+            {"available": False, "message": "요청이 너무 많습니다. 잠시 후 다시 시도해주세요."},
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(wait)},
+        )
+
     try:
-        if type == "user_id":
-            existing = await get_user_by_user_id(value)
-        elif type == "nickname":
-            # 닉네임 중복 검사를 위한 함수가 필요합니다
-            from models.users import get_user_by_nickname
-            existing = await get_user_by_nickname(value)
-        elif type == "email":
-            existing = await get_user_by_email(value)
-        else:
-            return JSONResponse({"available": False, "message": "잘못된 검사 타입입니다"})
-        
-        return JSONResponse({"available": existing is None, "message": "이미 사용 중입니다" if existing else "사용 가능합니다"})
+        taken = await availability.is_taken(type, normalize(type, value))
+        return JSONResponse({"available": not taken, "message": "이미 사용 중입니다" if taken else "사용 가능합니다"})
     
     except Exception as e:
         return JSONResponse({"available": False, "message": f"검사 중 오류가 발생했습니다: {str(e)}"})
@@ -82,13 +82,37 @@ async def login_submit(
             status_code=status.HTTP_401_UNAUTHORIZED
         )
 
-    user = await get_user_by_user_id(user_id)
-    if not user or not verify_password(password, user["password_hash"]):
+    # 계정/IP 별 시도 제한 + 해시 대기열 포화 시 429
+    client_ip = request.client.host if request.client else "-"
+    try:
+        passwords.check_login(user_id, client_ip)
+        user = await get_user_by_user_id(user_id)
+        ok, new_hash = await passwords.verify_and_update(password, user["password_hash"]) if user else (False, None)
+    except TooManyAttempts as e:
+        return templates.TemplateResponse(
+            "users/login.html",
+            {"request": request, "next": next, "error": f"로그인 시도가 너무 많습니다. {e.retry_after}초 후 다시 시도해주세요."},
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except PasswordBusy:
+        return templates.TemplateResponse(
+            "users/login.html",
+            {"request": request, "next": next, "error": "접속자가 많습니다. 잠시 후 다시 시도해주세요."},
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": "1"}
+        )
+
+    if not ok:
+        passwords.login_failed(user_id, client_ip)
         return templates.TemplateResponse(
             "users/login.html",
             {"request": request, "next": next, "error": "아이디 또는 비밀번호가 올바르지 않습니다."},
             status_code=status.HTTP_401_UNAUTHORIZED
         )
+    passwords.login_succeeded(user_id)
+    if new_hash:
+        await update_password_hash(user["id"], new_hash)
     # ✅ 유저 세션만 세팅 (관리자와 분리)
     request.session["user"] = {
         "id": user["id"],
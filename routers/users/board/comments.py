@@ -1,15 +1,16 @@
 from fastapi import APIRouter, Request, HTTPException, Form, Depends
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 from database.connection import database
 from .utils import format_dt_to_kst
+from .etag import versions
 from ..auth import get_current_user
 from models.posts import comments
-from models.users import add_user_exp, increment_user_stats, EXP_RULES
+from models.users import EXP_RULES
+from models.exp_events import exp_queue
 import datetime
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 @router.post("/{board}/comment/{post_id}")
 async def create_comment(
@@ -42,12 +43,10 @@ async def create_comment(
     })
     
     # ✅ 등급 시스템: 댓글 작성 경험치 추가
-    try:
-        await add_user_exp(current_user.get("id"), EXP_RULES["comment_created"], "comment_created")
-        await increment_user_stats(current_user.get("id"), "comments")
-    except Exception as e:
-        print(f"등급 시스템 오류: {e}")
+    # (exp_queue 가 모아서 반영하므로 응답을 기다리게 하지 않음)
+    exp_queue.add(current_user.get("id"), EXP_RULES["comment_created"], "comment_created", total_comments=1)
     
+    versions.bump_post(post_id)
     return RedirectResponse(url=f"/{board}/view/{post_id}", status_code=303)
 
 @router.post("/{board}/comment/{post_id}/edit/{comment_id}")
@@ -86,6 +85,7 @@ async def edit_comment(
         "id": comment_id
     })
     
+    versions.bump_post(post_id)
     return RedirectResponse(url=f"/{board}/view/{post_id}", status_code=303)
 
 @router.post("/{board}/comment/{post_id}/delete/{comment_id}")
@@ -114,4 +114,5 @@ async def delete_comment(
         UPDATE comments SET deleted = 1 WHERE id = :id
     """, {"id": comment_id})
     
+    versions.bump_post(post_id)
     return RedirectResponse(url=f"/{board}/view/{post_id}", status_code=303)
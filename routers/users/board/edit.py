@@ -4,6 +4,8 @@ from starlette import status
 from datetime import datetime, timezone
 from database.connection import database
 from .utils import validate_board, normalize_category
+from .fragment_cache import fragment_cache
+from .etag import versions
 from . import config
 
 router = APIRouter()
@@ -49,6 +51,8 @@ async def edit_save(
           "updated": updated_iso, "id": post_id, "board": board})
     if not row:
         raise HTTPException(status_code=404, detail="게시글이 없습니다.")
+    fragment_cache.bump(board)
+    versions.bump_post(post_id)
 
     return RedirectResponse(
         url=request.url_for("user_board_view", board=board, post_id=post_id),
@@ -65,5 +69,7 @@ async def delete_post(board: str, post_id: int, request: Request):
     """, {"id": post_id, "board": board})
     if not row:
         raise HTTPException(status_code=404, detail="이미 삭제되었거나 없습니다.")
+    fragment_cache.bump(board)
+    versions.bump_post(post_id)
     return RedirectResponse(url=request.url_for("user_board_list", board=board),
                             status_code=status.HTTP_303_SEE_OTHER)
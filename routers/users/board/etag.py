@@ -0,0 +1,89 @@
+# routers/users/board/etag.py
+"""
+조건부 GET (ETag / If-None-Match).
+
+- 게시판별 / 글별 버전 번호를 메모리에 유지, 쓰기 경로가 bump_board() / bump_post() 호출
+- ETag = 프로세스 시작 id + 버전 + 요청 조건(쿼리) + 로그인 상태 요약
+  → 재시작하면 모든 ETag 가 바뀌므로 버전을 DB 에 둘 필요 없음
+- If-None-Match 가 맞으면 쿼리/템플릿 없이 304
+- 로그인 사용자별로 다른 화면(헤더, 내 반응, 포인트)이라 세션 사용자 정보를 ETag 에 섞고 Vary: Cookie
+- 글 버전은 POST_VERSION_MAX 개까지만 보관. 밀려난 글은 지금까지 밀려난 값 중 최대값(floor)을 버전으로 씀
+  (전역 카운터라 floor 는 그 글이 예전에 받았던 어떤 버전보다 커서 옛 ETag 와 겹치지 않음)
+"""
+import hashlib
+import json
+import os
+import secrets
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+POST_VERSION_MAX = int(os.getenv("POST_VERSION_MAX", "100000"))
+
+_BOOT = secrets.token_hex(4)
+
+
+class ContentVersions:
+    def __init__(self, max_posts: int = POST_VERSION_MAX):
+        self.max_posts = max_posts
+        self._counter = 0
+        self._boards: Dict[str, int] = {}
+        self._posts: "OrderedDict[int, int]" = OrderedDict()
+        self._post_floor = 0
+
+    def board(self, board: str) -> int:
+        return self._boards.get(board, 0)
+
+    def post(self, post_id: int) -> int:
+        return self._posts.get(post_id, self._post_floor)
+
+    def bump_board(self, *boards: Optional[str]) -> None:
+        for board in boards:
+            if board:
+                self._counter += 1
+                self._boards[board] = self._counter
+
+    def bump_post(self, *post_ids: int) -> None:
+        for pid in post_ids:
+            self._counter += 1
+            self._posts[pid] = self._counter
+            self._posts.move_to_end(pid)
+        while len(self._posts) > self.max_posts:
+            _, v = self._posts.popitem(last=False)
+            self._post_floor = max(self._post_floor, v)
+
+
+versions = ContentVersions()
+
+
+def viewer_tag(request: Request) -> str:
+    """화면을 바꾸는 세션 값(사용자 정보, 관리자 로그인) 요약"""
+    session = request.session if "session" in request.scope else {}
+    user = session.get("user")
+    if not user and not session.get("admin_logged_in"):
+        return "anon"
+    return json.dumps([user, bool(session.get("admin_logged_in"))], sort_keys=True, ensure_ascii=False)
+
+
+def make_etag(request: Request, *parts: Any) -> str:
+    raw = "|".join(str(p) for p in (*parts, request.url.query, viewer_tag(request)))
+    return f'W/"{_BOOT}-{hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """If-None-Match 가 일치하면 304 응답, 아니면 None"""
+    inm = request.headers.get("if-none-match")
+    if inm and (inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]):
+        return Response(status_code=304, headers=validator_headers(etag))
+    return None
+
+
+def validator_headers(etag: str) -> Dict[str, str]:
+    # 매번 재검증(no-cache) - 변경 여부는 ETag 로 판단, 사용자별 화면이라 private
+    return {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Cookie"}
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    response.headers.update(validator_headers(etag))
+    return response
@@ -0,0 +1,98 @@
+# routers/users/board/fragment_cache.py
+"""
+게시판 목록 본문 HTML 캐시.
+
+- 키 = (게시판 버전, board, category, sort, page, size). 앞쪽 FRAGMENT_MAX_PAGE 페이지만 캐시
+- 글 작성/수정/삭제/게시 상태 변경, 조회수·추천 반영 시 bump(board) → 버전(etag.versions, ETag 와 공용)이 올라가 이전 본문은 안 쓰임
+- 바이트 합계 기준 LRU (FRAGMENT_CACHE_BYTES 를 넘으면 오래된 것부터 제거)
+- 같은 키를 여러 요청이 동시에 놓치면 한 요청만 렌더링하고 나머지는 그 결과를 기다림 (single-flight)
+"""
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+from .etag import versions
+
+FRAGMENT_CACHE_BYTES = int(os.getenv("FRAGMENT_CACHE_BYTES", str(32 * 1024 * 1024)))
+FRAGMENT_MAX_PAGE = int(os.getenv("FRAGMENT_MAX_PAGE", "3"))
+
+
+class FragmentCache:
+    def __init__(self, max_bytes: int = FRAGMENT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[Tuple, Tuple[str, int]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, board: str) -> int:
+        return versions.board(board)
+
+    def bump(self, *boards: str) -> None:
+        """게시판 목록이 바뀜 → 해당 게시판 본문 폐기"""
+        for board in boards:
+            if not board:
+                continue
+            versions.bump_board(board)
+            for key in [k for k in self._entries if k[1] == board]:
+                self._drop(key)
+
+    def _drop(self, key: Tuple) -> None:
+        html, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def _store(self, key: Tuple, html: str) -> None:
+        size = len(html.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (html, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    async def get_or_render(self, board: str, key: Hashable, render: Callable[[], Awaitable[str]]) -> str:
+        full_key = (self.version(board), board, key)
+        entry = self._entries.get(full_key)
+        if entry is not None:
+            self._entries.move_to_end(full_key)
+            self.hits += 1
+            return entry[0]
+
+        pending = self._inflight.get(full_key)
+        if pending is not None:
+            try:
+                html = await asyncio.shield(pending)
+                self.hits += 1
+                return html
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # 렌더링하던 요청이 끊김 → 직접 렌더링
+                return await self.get_or_render(board, key, render)
+
+        self.misses += 1
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = fut
+        try:
+            html = await render()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # 기다리는 요청이 없어도 경고가 남지 않게
+            raise
+        finally:
+            self._inflight.pop(full_key, None)
+        fut.set_result(html)
+        # 렌더링 중에 버전이 올라갔으면 저장하지 않음
+        if full_key[0] == self.version(board):
+            self._store(full_key, html)
+        return html
+
+
+fragment_cache = FragmentCache()
@@ -0,0 +1,135 @@
+# routers/users/board/hot_posts.py
+"""
+"지금 뜨는 글" 스트리밍 집계 (게시판 목록의 인기 탭).
+
+- 조회(user_board_view)와 반응(react) 이벤트를 게시판별 Count-Min Sketch 에 누적
+- 1분 단위 버킷 HOT_WINDOW_MIN 개를 돌려 쓰고, 창 전체 합 스케치를 따로 유지
+  (버킷이 밀려날 때 그 버킷만큼 빼면 됨)
+- 창 안의 상위 후보는 HOT_CANDIDATES 개까지만 보관 (가득 차면 추정치가 가장 작은 후보를 교체)
+- 메모리는 게시판 수 × (버킷 수 + 1) × 폭 × 깊이 로 고정 (글이 몇 개든 늘지 않음)
+- 프로세스 메모리 기준이라 재시작하면 비어서 시작, 워커가 여럿이면 워커별 집계
+"""
+import heapq
+import os
+import random
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+HOT_WINDOW_MIN = int(os.getenv("HOT_WINDOW_MIN", "15"))
+HOT_SKETCH_WIDTH = int(os.getenv("HOT_SKETCH_WIDTH", "1024"))
+HOT_SKETCH_DEPTH = int(os.getenv("HOT_SKETCH_DEPTH", "4"))
+HOT_CANDIDATES = int(os.getenv("HOT_CANDIDATES", "256"))
+
+_MASK64 = (1 << 64) - 1
+
+# 이벤트 가중치
+VIEW_WEIGHT = 1
+REACTION_WEIGHT = 5
+
+
+class HeavyHitters:
+    """슬라이딩 윈도우(분 단위 버킷) Count-Min Sketch + 상위 후보"""
+
+    def __init__(self, window_min: int = HOT_WINDOW_MIN, width: int = HOT_SKETCH_WIDTH,
+                 depth: int = HOT_SKETCH_DEPTH, candidates: int = HOT_CANDIDATES):
+        self.window_min = window_min
+        self.depth = depth
+        self.max_candidates = candidates
+        # 행마다 다른 multiply-shift 해시 (폭은 2의 거듭제곱으로 올림)
+        self._bits = max(1, (width - 1).bit_length())
+        self.width = width = 1 << self._bits
+        rng = random.Random(0x5EED)
+        self._seeds = [(rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(depth)]
+        size = width * depth
+        self._buckets = [array("q", bytes(8 * size)) for _ in range(window_min)]
+        self._bucket_minute = [-1] * window_min
+        self._total = array("q", bytes(8 * size))
+        self._candidates: Dict[int, int] = {}
+        self._minute = -1
+
+    def _cells(self, key: int) -> List[int]:
+        w, shift = self.width, 64 - self._bits
+        return [row * w + (((a * key + b) & _MASK64) >> shift) for row, (a, b) in enumerate(self._seeds)]
+
+    def _estimate(self, cells: List[int]) -> int:
+        total = self._total
+        return min(total[c] for c in cells)
+
+    def _advance(self, minute: int) -> None:
+        """지난 버킷을 창 합계에서 빼고 비움"""
+        if minute == self._minute:
+            return
+        self._minute = minute
+        slot = minute % self.window_min
+        if self._bucket_minute[slot] == minute:
+            return
+        expired = False
+        for i, m in enumerate(self._bucket_minute):
+            if m != -1 and m <= minute - self.window_min:
+                bucket, total = self._buckets[i], self._total
+                for c in range(len(bucket)):
+                    if bucket[c]:
+                        total[c] -= bucket[c]
+                self._buckets[i] = array("q", bytes(8 * len(bucket)))
+                self._bucket_minute[i] = -1
+                expired = True
+        self._bucket_minute[slot] = minute
+        if expired:
+            # 창에서 빠진 만큼 후보 추정치 재계산, 0 이 된 후보 제거
+            for key in list(self._candidates):
+                est = self._estimate(self._cells(key))
+                if est > 0:
+                    self._candidates[key] = est
+                else:
+                    del self._candidates[key]
+
+    def add(self, key: int, weight: int = 1, now: Optional[float] = None) -> None:
+        minute = int((time.time() if now is None else now) // 60)
+        self._advance(minute)
+        bucket, total = self._buckets[minute % self.window_min], self._total
+        cells = self._cells(key)
+        for c in cells:
+            bucket[c] += weight
+            total[c] += weight
+        est = self._estimate(cells)
+
+        cands = self._candidates
+        if key in cands or len(cands) < self.max_candidates:
+            cands[key] = est
+        else:
+            low_key = min(cands, key=cands.__getitem__)
+            if cands[low_key] < est:
+                del cands[low_key]
+                cands[key] = est
+
+    def top(self, k: int = 20, now: Optional[float] = None) -> List[Tuple[int, int]]:
+        """최근 window_min 분 상위 k 개 [(key, 추정치)]"""
+        self._advance(int((time.time() if now is None else now) // 60))
+        return heapq.nlargest(k, self._candidates.items(), key=lambda kv: kv[1])
+
+
+class HotPosts:
+    """게시판별 HeavyHitters (게시판 목록은 고정이라 전체 메모리도 고정)"""
+
+    def __init__(self):
+        self._boards: Dict[str, HeavyHitters] = {}
+
+    def _tracker(self, board: str) -> HeavyHitters:
+        hh = self._boards.get(board)
+        if hh is None:
+            hh = self._boards[board] = HeavyHitters()
+        return hh
+
+    def viewed(self, board: str, post_id: int) -> None:
+        self._tracker(board).add(post_id, VIEW_WEIGHT)
+
+    def reacted(self, board: str, post_id: int) -> None:
+        self._tracker(board).add(post_id, REACTION_WEIGHT)
+
+    def top(self, board: str, k: int = 20) -> List[int]:
+        hh = self._boards.get(board)
+        return [post_id for post_id, _ in hh.top(k)] if hh else []
+
+
+hot_posts = HotPosts()
@@ -0,0 +1,152 @@
+# routers/users/board/pagination.py
+"""
+게시판 목록 키셋(커서) 페이지네이션.
+
+- 정렬별 키: new=(created_at, id) / view=(views, created_at, id) / like=(likes, created_at, id)
+- 다음/이전 페이지는 불투명 토큰(base64)으로 전달 → OFFSET 없이 인덱스 seek 1번
+- "N페이지로 이동"은 주기적으로 갱신되는 앵커 테이블(post_page_anchors)에서
+  가장 가까운 앵커를 찾아 seek + 최대 ANCHOR_STRIDE-1 건만 건너뜀
+"""
+import base64
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from database.connection import database
+from models.background import shutdown
+from . import config
+
+SORT_KEYS: Dict[str, Tuple[str, ...]] = {
+    "new":  ("created_at", "id"),
+    "view": ("views", "created_at", "id"),
+    "like": ("likes", "created_at", "id"),
+}
+
+# 앵커 간격(행 수) / 갱신 주기(초)
+ANCHOR_STRIDE = int(os.getenv("PAGE_ANCHOR_STRIDE", "200"))
+ANCHOR_REFRESH_SEC = int(os.getenv("PAGE_ANCHOR_REFRESH_SEC", "300"))
+
+
+def order_by(sort: str, reverse: bool = False, prefix: str = "p.") -> str:
+    direction = "ASC" if reverse else "DESC"
+    return ", ".join(f"{prefix}{k} {direction}" for k in SORT_KEYS[sort])
+
+
+def row_key(sort: str, row: Dict[str, Any]) -> List[Any]:
+    return [row[k] for k in SORT_KEYS[sort]]
+
+
+# ── 커서 토큰 ───────────────────────────────────────────────
+def encode_cursor(sort: str, key: List[Any], direction: str = "next") -> str:
+    raw = json.dumps([sort, direction, *key], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str], sort: str) -> Optional[Tuple[str, List[Any]]]:
+    """(direction, key) 반환. 깨졌거나 정렬이 다른 토큰이면 None"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw.decode("utf-8"))
+    except Exception:
+        return None
+    if not isinstance(data, list) or len(data) != 2 + len(SORT_KEYS.get(sort, ())):
+        return None
+    tok_sort, direction, *key = data
+    if tok_sort != sort or direction not in ("next", "prev"):
+        return None
+    return direction, key
+
+
+def keyset_condition(sort: str, op: str, prefix: str = "p.") -> Tuple[str, List[str]]:
+    """
+    (k1, k2, ...) < (:ck0, :ck1, ...) 형태의 row-value 비교식.
+    모든 키가 DESC 이므로 다음 페이지는 '<', 이전 페이지는 '>'.
+    """
+    keys = SORT_KEYS[sort]
+    names = [f"ck{i}" for i in range(len(keys))]
+    cols = ", ".join(f"{prefix}{k}" for k in keys)
+    binds = ", ".join(f":{n}" for n in names)
+    return f"({cols}) {op} ({binds})", names
+
+
+# ── 페이지 앵커 ─────────────────────────────────────────────
+async def find_anchor(board: str, category: Optional[str], sort: str, offset: int) -> Optional[Dict[str, Any]]:
+    """offset 이하에서 가장 가까운 앵커 (첫 구간은 앵커 없이 OFFSET 으로 충분)"""
+    if offset < ANCHOR_STRIDE:
+        return None
+    row = await database.fetch_one("""
+        SELECT row_offset, k1, created_at, id
+        FROM post_page_anchors
+        WHERE board = :board AND category = :category AND sort = :sort
+          AND row_offset <= :offset
+        ORDER BY row_offset DESC
+        LIMIT 1
+    """, {"board": board, "category": category or "", "sort": sort, "offset": offset})
+    if not row:
+        return None
+    d = dict(row)
+    key_cols = SORT_KEYS[sort]
+    d["key"] = ([d["k1"]] if len(key_cols) == 3 else []) + [d["created_at"], d["id"]]
+    return d
+
+
+async def refresh_anchors(board: str, category: Optional[str], sort: str) -> int:
+    """(board, category, sort) 조합의 앵커를 다시 계산. 계산은 reader, 교체는 writer"""
+    keys = SORT_KEYS[sort]
+    k1 = f"p.{keys[0]}" if len(keys) == 3 else "NULL"
+    cat_sql = "AND p.category = :category" if category else ""
+    params: Dict[str, Any] = {"board": board, "stride": ANCHOR_STRIDE}
+    if category:
+        params["category"] = category
+
+    rows = await database.fetch_all(f"""
+        SELECT rn, k1, created_at, id FROM (
+            SELECT {k1} AS k1, p.created_at, p.id,
+                   ROW_NUMBER() OVER (ORDER BY {order_by(sort)}) - 1 AS rn
+            FROM posts p
+            WHERE p.board = :board
+              AND p.deleted = 0
+              AND (p.is_published = 1 OR p.is_published IS NULL)
+              {cat_sql}
+        )
+        WHERE rn > 0 AND (rn / :stride) * :stride = rn
+    """, params)
+
+    values = [
+        {"board": board, "category": category or "", "sort": sort,
+         "row_offset": r["rn"], "k1": r["k1"], "created_at": r["created_at"], "id": r["id"]}
+        for r in rows
+    ]
+    async with database.transaction():
+        await database.execute("""
+            DELETE FROM post_page_anchors
+            WHERE board = :board AND category = :category AND sort = :sort
+        """, {"board": board, "category": category or "", "sort": sort})
+        if values:
+            await database.execute_many("""
+                INSERT INTO post_page_anchors (board, category, sort, row_offset, k1, created_at, id)
+                VALUES (:board, :category, :sort, :row_offset, :k1, :created_at, :id)
+            """, values)
+    return len(values)
+
+
+async def refresh_all_anchors() -> None:
+    for board in sorted(config.ALLOWED_BOARDS):
+        if shutdown.stopping:   # 게시판 사이에서 종료 확인 (트랜잭션 도중 cancel 방지)
+            return
+        for category in [None, *config.USER_BOARD_TABS.get(board, [])]:
+            for sort in SORT_KEYS:
+                await refresh_anchors(board, category, sort)
+
+
+async def anchor_refresh_loop() -> None:
+    """lifespan 에서 백그라운드 태스크로 실행 (shutdown 신호로 종료)"""
+    while not shutdown.stopping:
+        try:
+            await refresh_all_anchors()
+        except Exception as e:
+            print(f"페이지 앵커 갱신 오류: {e}")
+        if await shutdown.sleep(ANCHOR_REFRESH_SEC):
+            return
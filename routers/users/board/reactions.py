@@ -0,0 +1,164 @@
+# routers/users/board/reactions.py
+"""
+게시글 반응(추천/히트/폭망) 원장.
+
+- post_reactions 한 테이블에 (post_id, user_id) 당 반응 1개 → 추천과 히트가 likes 를 이중 집계하지 않음
+- 같은 반응을 다시 누르면 취소(kind = NULL), 다른 반응이면 전환. 직전 상태는 prev_kind
+- 전이는 UPSERT ... RETURNING 1번으로 판정하고 posts 카운터 / users 포인트는 같은 트랜잭션에서 상대값으로 반영
+- 작성자 경험치/받은 추천 수는 exp_queue 로 넘겨 일괄 반영
+- 새 반응은 hot_posts(인기 탭 실시간 집계)에도 기록
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from database.connection import database
+from models.exp_events import exp_queue
+from models.user_repo import user_repo
+from models.users import EXP_RULES
+from .hot_posts import hot_posts
+from .fragment_cache import fragment_cache
+from .etag import versions
+
+# 히트/폭망 1건에 드는 포인트 / 히트 받은 작성자 경험치
+VOTE_COST = 5
+HIT_EXP = 10
+
+# 반응 종류별 효과 (키 = post_reactions.kind CHECK 제약과 동일)
+REACTION_EFFECTS: Dict[str, Dict[str, int]] = {
+    "like": {"likes": 1, "dislikes": 0, "cost": 0, "author_points": 0,
+             "author_exp": EXP_RULES["post_liked"], "author_likes": 1},
+    "hit":  {"likes": 1, "dislikes": 0, "cost": VOTE_COST, "author_points": VOTE_COST,
+             "author_exp": HIT_EXP, "author_likes": 1},
+    "bomb": {"likes": 0, "dislikes": 1, "cost": VOTE_COST, "author_points": -VOTE_COST,
+             "author_exp": 0, "author_likes": 0},
+}
+_NO_EFFECT = dict.fromkeys(REACTION_EFFECTS["like"], 0)
+_PAID_KINDS = ", ".join(f"'{k}'" for k, e in REACTION_EFFECTS.items() if e["cost"])
+
+# 상태 조회 한 번에 받을 글 수
+MAX_STATUS_IDS = 100
+
+# 포인트가 드는 반응은 새로 낼 때만 포인트 확인 (이미 히트/폭망을 냈으면 전환/취소는 추가 비용 없음)
+_REACTION_UPSERT = f"""
+    INSERT INTO post_reactions (post_id, user_id, kind, prev_kind)
+    SELECT p.id, :user_id, :kind, NULL
+    FROM posts p
+    WHERE p.id = :post_id AND p.deleted = 0
+      AND p.user_id IS NOT :user_id
+      AND (
+        :cost = 0
+        OR (SELECT COALESCE(points, 0) FROM users WHERE id = :user_id) >= :cost
+        OR EXISTS (
+          SELECT 1 FROM post_reactions r
+          WHERE r.post_id = :post_id AND r.user_id = :user_id AND r.kind IN ({_PAID_KINDS})
+        )
+      )
+    ON CONFLICT(post_id, user_id) DO UPDATE SET
+      prev_kind = post_reactions.kind,
+      kind = CASE WHEN post_reactions.kind IS excluded.kind THEN NULL ELSE excluded.kind END,
+      created_at = datetime('now')
+    RETURNING kind, prev_kind, (SELECT user_id FROM posts WHERE id = :post_id) AS author_id
+"""
+
+# 반응한 사람과 작성자 포인트를 한 문장으로 (작성자 포인트는 0 아래로 내려가지 않음)
+# 포인트는 반응 가능 여부 판단에 쓰이므로 트랜잭션 안에서, 경험치/통계는 exp_queue 로 비동기 반영
+_POINTS_DELTA = """
+    UPDATE users SET
+      points = CASE WHEN id = :voter_id
+                    THEN COALESCE(points, 0) + :voter_points
+                    ELSE MAX(COALESCE(points, 0) + :author_points, 0) END
+    WHERE id IN (:voter_id, :author_id)
+"""
+
+
+def reaction_deltas(prev: Optional[str], new: Optional[str]) -> Dict[str, int]:
+    """전이(prev → new)에 따른 카운터/포인트 증감"""
+    before = REACTION_EFFECTS.get(prev, _NO_EFFECT)
+    after = REACTION_EFFECTS.get(new, _NO_EFFECT)
+    d = {k: after[k] - before[k] for k in _NO_EFFECT}
+    d["voter_points"] = -d.pop("cost")
+    return d
+
+
+async def react(post_id: int, user_id: int, kind: str) -> Optional[Dict[str, Any]]:
+    """
+    반응 전이를 한 트랜잭션으로 처리 (UPSERT 1 + posts 1 + users 포인트 1).
+    모든 증감은 상대값(likes = likes + :d)이라 같은 글에 동시에 반응해도 유실되지 않음.
+    반응할 수 없으면(글 없음/본인 글/포인트 부족) None.
+    """
+    effect = REACTION_EFFECTS[kind]
+    async with database.transaction():
+        row = await database.fetch_one(_REACTION_UPSERT, {
+            "post_id": post_id, "user_id": user_id, "kind": kind, "cost": effect["cost"],
+        })
+        if not row:
+            return None
+        prev, new, author_id = row["prev_kind"], row["kind"], row["author_id"]
+        d = reaction_deltas(prev, new)
+
+        counts = await database.fetch_one("""
+            UPDATE posts SET likes = likes + :likes, dislikes = dislikes + :dislikes
+            WHERE id = :post_id
+            RETURNING likes, dislikes, board
+        """, {"post_id": post_id, "likes": d["likes"], "dislikes": d["dislikes"]})
+
+        if d["voter_points"] or (author_id is not None and d["author_points"]):
+            await database.execute(_POINTS_DELTA, {
+                "voter_id": user_id,
+                "author_id": author_id if author_id is not None else -1,
+                "voter_points": d["voter_points"],
+                "author_points": d["author_points"],
+            })
+
+    user_repo.invalidate(user_id, author_id)
+    if new:
+        hot_posts.reacted(counts["board"], post_id)
+    fragment_cache.bump(counts["board"])
+    versions.bump_post(post_id)
+    exp_queue.add(
+        author_id, d["author_exp"], f"reaction:{prev or 'none'}>{new or 'none'}",
+        total_likes=d["author_likes"],
+    )
+
+    return {
+        "prev": prev, "kind": new, "deltas": d,
+        "likes_count": counts["likes"], "dislikes_count": counts["dislikes"],
+    }
+
+
+async def react_failure_reason(post_id: int, user_id: int, kind: str) -> tuple[int, str]:
+    """react() 가 None 일 때만 호출 - (HTTP 상태, 메시지)"""
+    row = await database.fetch_one("""
+        SELECT p.user_id,
+               (SELECT points FROM users WHERE id = :user_id) AS points
+        FROM posts p
+        WHERE p.id = :post_id AND p.deleted = 0
+    """, {"post_id": post_id, "user_id": user_id})
+    if not row:
+        return 404, "게시글을 찾을 수 없습니다"
+    if row["user_id"] == user_id:
+        return 400, "자신의 게시글에는 반응할 수 없습니다"
+    if row["points"] is None:
+        return 404, "사용자를 찾을 수 없습니다"
+    cost = REACTION_EFFECTS[kind]["cost"]
+    return 400, f"포인트가 부족합니다. 필요: {cost}, 보유: {row['points']}"
+
+
+async def reaction_status(user_id: Optional[int], post_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """여러 글의 (내 반응, 추천/폭망 수)를 쿼리 1번으로"""
+    ids: List[int] = list(dict.fromkeys(post_ids))[:MAX_STATUS_IDS]
+    if not ids:
+        return {}
+    params: Dict[str, Any] = {f"p{i}": pid for i, pid in enumerate(ids)}
+    params["user_id"] = user_id if user_id is not None else -1
+    binds = ", ".join(f":p{i}" for i in range(len(ids)))
+    rows = await database.fetch_all(f"""
+        SELECT p.id, p.likes, p.dislikes, r.kind
+        FROM posts p
+        LEFT JOIN post_reactions r
+          ON r.post_id = p.id AND r.user_id = :user_id
+        WHERE p.id IN ({binds}) AND p.deleted = 0
+    """, params)
+    return {
+        r["id"]: {"reaction": r["kind"], "likes_count": r["likes"], "dislikes_count": r["dislikes"]}
+        for r in rows
+    }
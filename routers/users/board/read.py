@@ -1,8 +1,16 @@
 from fastapi import APIRouter, Request, Query
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 from database.connection import database
 from .utils import validate_board, clamp_page, format_dt_to_kst
+from .pagination import order_by, row_key, encode_cursor, decode_cursor, keyset_condition, find_anchor
+from .search import search_posts, like_clause
+from .trending import trending
+from .hot_posts import hot_posts
+from .fragment_cache import fragment_cache, FRAGMENT_MAX_PAGE
+from .etag import versions, make_etag, not_modified, with_etag
+from jinja2 import TemplateNotFound
+from markupsafe import Markup
 from . import config
 from models.users import get_user_level_info, get_level_name
 import logging
@@ -11,7 +19,179 @@ import logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+def render_fragment(name: str, context: dict) -> str:
+    """목록 본문만 렌더링 (index.html 의 include ignore missing 과 같게 없으면 빈 문자열)"""
+    try:
+        return templates.get_template(name).render(context)
+    except TemplateNotFound:
+        return ""
+
+async def count_posts(board: str, category: str | None = None) -> int:
+    """목록에 보이는 글 수 (board_counters, 카테고리 수만큼의 행만 읽음)"""
+    if category:
+        row = await database.fetch_one(
+            "SELECT post_count AS cnt FROM board_counters WHERE board = :board AND category = :category",
+            {"board": board, "category": category},
+        )
+    else:
+        row = await database.fetch_one(
+            "SELECT COALESCE(SUM(post_count), 0) AS cnt FROM board_counters WHERE board = :board",
+            {"board": board},
+        )
+    return row["cnt"] if row else 0
+
+async def fetch_hot(board: str, size: int) -> list[dict]:
+    """인기 탭 - 최근 HOT_WINDOW_MIN 분 조회/반응 상위 글 (메모리 집계 → PK 조회 1번)"""
+    ids = hot_posts.top(board, size)
+    if not ids:
+        return []
+    params = {f"id{i}": pid for i, pid in enumerate(ids)}
+    rows = await database.fetch_all(f"""
+        SELECT p.id, p.title, p.author, p.category,
+               p.created_at, p.updated_at,
+               p.views, p.likes
+        FROM posts p
+        WHERE p.id IN ({", ".join(":" + k for k in params)})
+          AND p.board = :board AND p.deleted = 0
+          AND (p.is_published = 1 OR p.is_published IS NULL)
+    """, dict(params, board=board))
+    by_id = {r["id"]: dict(r) for r in rows}
+    return [by_id[pid] for pid in ids if pid in by_id]
+
+async def _fetch_page(board, category, sort, where, params, page, size, cursor, use_anchor=True):
+    """목록 조회 - 키셋(커서) 우선, 없으면 앵커 seek, 앵커도 없으면 OFFSET"""
+    select_sql = """
+    SELECT
+      p.id, p.title, p.author, p.category,
+      p.created_at, p.updated_at,
+      p.views, p.likes
+    FROM posts p
+    """
+    decoded = decode_cursor(cursor, sort)
+    list_params = dict(params, limit=size + 1)
+    direction = "next"
+    if decoded:
+        direction, key = decoded
+        cond, names = keyset_condition(sort, "<" if direction == "next" else ">")
+        list_params.update(zip(names, key))
+        rows = await database.fetch_all(f"""
+            {select_sql}
+            WHERE {where} AND {cond}
+            ORDER BY {order_by(sort, reverse=(direction == "prev"))}
+            LIMIT :limit
+        """, list_params)
+    else:
+        offset = (page - 1) * size
+        anchor = await find_anchor(board, category, sort, offset) if use_anchor else None
+        if anchor:
+            cond, names = keyset_condition(sort, "<=")
+            list_params.update(zip(names, anchor["key"]))
+            list_params["offset"] = offset - anchor["row_offset"]
+            rows = await database.fetch_all(f"""
+                {select_sql}
+                WHERE {where} AND {cond}
+                ORDER BY {order_by(sort)}
+                LIMIT :limit OFFSET :offset
+            """, list_params)
+        else:
+            list_params["offset"] = offset
+            rows = await database.fetch_all(f"""
+                {select_sql}
+                WHERE {where}
+                ORDER BY {order_by(sort)}
+                LIMIT :limit OFFSET :offset
+            """, list_params)
+
+    # size+1 건을 읽어 다음/이전 페이지 존재 여부 판단
+    rows = [dict(r) for r in rows]
+    has_more = len(rows) > size
+    rows = rows[:size]
+    if direction == "prev":
+        rows.reverse()
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = page > 1, has_more
+
+    next_cursor = encode_cursor(sort, row_key(sort, rows[-1]), "next") if rows and has_next else None
+    prev_cursor = encode_cursor(sort, row_key(sort, rows[0]), "prev") if rows and has_prev else None
+    return rows, next_cursor, prev_cursor
+
+async def board_list_context(board: str, page: int, size: int, sort: str,
+                             q: str | None, category: str | None, cursor: str | None) -> dict:
+    """목록 본문(boards/<board>_content.html) 렌더링에 필요한 값"""
+    tabs = config.USER_BOARD_TABS.get(board, [])
+
+    # 공통 WHERE (category 는 값이 있을 때만 붙여야 인덱스를 탄다)
+    where = """
+        p.board = :board
+        AND p.deleted = 0
+        AND (p.is_published = 1 OR p.is_published IS NULL)
+    """
+    params = {"board": board}
+    # 인기 탭은 말머리가 아니라 실시간 집계 (베스트 게시판은 아래 순위표 사용)
+    hot_tab = category == "인기" and board != "best" and not q
+    if category and not hot_tab:
+        where += " AND p.category = :category"
+        params["category"] = category
+
+    # 베스트 게시판(공지 외)은 전 게시판 인기글 순위 (post_trending 점수 인덱스)
+    best_ranking = board == "best" and not q and category != "공지"
+    # 검색어가 있으면 FTS5 (bm25 순위, 검색 결과는 OFFSET 페이지)
+    found = await search_posts(where, params, q, page, size) if q else None
+    if hot_tab:
+        rows = await fetch_hot(board, size)
+        total, page, total_pages = len(rows), 1, 1
+        next_cursor = prev_cursor = None
+    elif best_ranking:
+        total = trending.total
+        total_pages = max((total + size - 1) // size, 1)
+        page = min(page, total_pages)
+        rows = await trending.top(size, (page - 1) * size)
+        next_cursor = prev_cursor = None
+    elif found:
+        total, page, rows = found
+        total_pages = max((total + size - 1) // size, 1)
+        next_cursor = prev_cursor = None
+    else:
+        if q:
+            # 한 글자/기호뿐인 검색 → LIKE 스캔 (두 글자 단어는 search_posts 가 bigram 색인으로 처리)
+            where += " AND " + like_clause(q.split(), params)
+
+        # 총 개수 - 검색이 아니면 트리거로 유지되는 board_counters 에서 바로 읽음
+        if q:
+            total_row = await database.fetch_one(f"SELECT COUNT(*) AS cnt FROM posts p WHERE {where}", params)
+            total = total_row["cnt"] if total_row else 0
+        else:
+            total = await count_posts(board, category)
+        total_pages = max((total + size - 1) // size, 1)
+
+        if page > total_pages:
+            page = total_pages
+            cursor = None
+
+        rows, next_cursor, prev_cursor = await _fetch_page(board, category, sort, where, params, page, size, cursor, use_anchor=not q)
+
+    posts = []
+    for d in rows:
+        d["created_at_fmt"] = format_dt_to_kst(d.get("created_at"))
+        d["updated_at_fmt"] = format_dt_to_kst(d.get("updated_at"))
+        
+        # 등급 정보는 기본값 사용
+        d["level"] = 1
+        d["level_name"] = "새내기"
+        
+        posts.append(d)
+
+    return {
+        "tabs": tabs,
+        "selected_category": category,
+        "posts": posts,
+        "page": page, "size": size, "total": total,
+        "total_pages": total_pages, "sort": sort,
+        "q": q,
+        "next_cursor": next_cursor, "prev_cursor": prev_cursor,
+    }
 
 @router.get("/{board}", response_class=HTMLResponse, name="user_board_list")
 async def user_board_list(
@@ -22,78 +202,36 @@ async def user_board_list(
     sort: str = Query("new", pattern="^(new|view|like)$"),
     q: str | None = Query(None, min_length=1, max_length=50),
     category: str | None = Query(None),
+    cursor: str | None = Query(None, max_length=512),
 ):
     validate_board(board)
     page, size = clamp_page(page, size)
-    offset = (page - 1) * size
 
     tabs = config.USER_BOARD_TABS.get(board, [])
     if category and tabs and category not in tabs:
         category = None
 
-    order_by = {
-        "new":  "created_at DESC",
-        "view": "views DESC, created_at DESC",
-        "like": "likes DESC, created_at DESC",
-    }[sort]
-
-    # 총 개수
-    total_row = await database.fetch_one("""
-        SELECT COUNT(*) AS cnt
-        FROM posts
-        WHERE board = :board
-          AND deleted = 0
-          AND (is_published = 1 OR is_published IS NULL)
-          AND (:category IS NULL OR category = :category)
-          AND (:q IS NULL OR (title LIKE '%%' || :q || '%%' OR content LIKE '%%' || :q || '%%'))
-    """, {"board": board, "q": q, "category": category})
-    total = total_row["cnt"] if total_row else 0
-    total_pages = max((total + size - 1) // size, 1)
-
-    if page > total_pages:
-        page = total_pages
-        offset = (page - 1) * size
+    shell = {"request": request, "category": f"{board}_content", "board": board}
 
-    # 목록 조회 - 어드민과 동일한 로직 적용
-    rows = await database.fetch_all(f"""
-    SELECT
-      p.id, p.title, p.author, p.category,
-      p.created_at, p.updated_at,
-      p.views, p.likes
-    FROM posts p
-    WHERE p.board = :board
-      AND p.deleted = 0
-      AND (p.is_published = 1 OR p.is_published IS NULL)
-      AND (:category IS NULL OR p.category = :category)
-      AND (:q IS NULL OR (p.title LIKE '%%' || :q || '%%' OR p.content LIKE '%%' || :q || '%%'))
-    ORDER BY {order_by}
-    LIMIT :limit OFFSET :offset
-    """, {"board": board, "limit": size, "offset": offset, "q": q, "category": category})
+    # 게시판 버전이 그대로면 304 (인기 탭은 실시간 집계라 제외)
+    etag = None
+    if not (category == "인기" and board != "best"):
+        etag = make_etag(request, "list", board, versions.board(board))
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
 
-    posts = []
-    for r in rows:
-        d = dict(r)
-        d["created_at_fmt"] = format_dt_to_kst(d.get("created_at"))
-        d["updated_at_fmt"] = format_dt_to_kst(d.get("updated_at"))
-        
-        # 등급 정보는 기본값 사용
-        d["level"] = 1
-        d["level_name"] = "새내기"
-        
-        posts.append(d)
+    # 앞쪽 페이지는 렌더링된 목록 본문을 캐시 (SQL + 목록 렌더링 생략, 글/카운터 변경 시 게시판 버전으로 무효화)
+    # 본문은 로그인 상태와 무관. 검색/커서/인기 탭(실시간 집계)은 캐시하지 않음
+    if not q and not cursor and category != "인기" and page <= FRAGMENT_MAX_PAGE:
+        async def render() -> str:
+            ctx = await board_list_context(board, page, size, sort, q, category, cursor)
+            return render_fragment(f"boards/{board}_content.html", dict(ctx, request=request))
 
-    # 모든 게시판은 index.html을 사용하여 일관성 유지
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "category": f"{board}_content",
-            "board": board,
-            "tabs": tabs,
-            "selected_category": category,
-            "posts": posts,
-            "page": page, "size": size, "total": total,
-            "total_pages": total_pages, "sort": sort,
-            "q": q,
-        }
-    )
+        html = await fragment_cache.get_or_render(board, (board, category, sort, page, size), render)
+        response = templates.TemplateResponse("index.html", dict(shell, content_html=Markup(html)))
+    else:
+        # 모든 게시판은 index.html을 사용하여 일관성 유지
+        ctx = await board_list_context(board, page, size, sort, q, category, cursor)
+        response = templates.TemplateResponse("index.html", dict(shell, **ctx))
+    return with_etag(response, etag) if etag else response
@@ -0,0 +1,131 @@
+# routers/users/board/search.py
+"""
+게시글 전문 검색 (FTS5, trigram 토크나이저 + 두 글자 bigram 색인).
+
+- posts_fts 는 posts 를 content 로 쓰는 외부 콘텐츠 테이블이며 트리거로 동기화
+  (작성/수정/소프트 삭제 모두 반영, deleted=1 인 글은 색인에서 빠짐)
+- trigram 은 한글도 부분 문자열로 매칭하지만 3글자 미만 단어는 색인으로 찾을 수 없음
+  → 3글자 이상 단어는 MATCH, 짧은 단어는 MATCH 결과 안에서 LIKE 로 거름
+  → 모든 단어가 짧으면 두 글자 단어(주식, 코인 …)로 posts_bigram 을 MATCH 하고 LIKE 로 확인
+    (posts_bigram: 두 글자 조각 색인, 마이그레이션 014)
+  → 한 글자/기호뿐인 검색만 기존 LIKE 스캔으로 대체
+"""
+import html
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from markupsafe import Markup
+
+from database.connection import database
+
+MIN_TERM_LEN = 3
+BIGRAM_LEN = 2
+
+# 하이라이트 구분자 (HTML 이스케이프 후 <mark> 로 치환)
+_HL_OPEN, _HL_CLOSE = "\x02", "\x03"
+
+
+def split_terms(q: str) -> Tuple[List[str], List[str]]:
+    """(MATCH 가능한 단어, 짧은 단어)"""
+    long_terms, short_terms = [], []
+    for t in q.split():
+        (long_terms if len(t) >= MIN_TERM_LEN else short_terms).append(t)
+    return long_terms, short_terms
+
+
+def bigram_terms(terms: List[str]) -> List[str]:
+    """posts_bigram 으로 찾을 수 있는 두 글자 단어 (기호가 섞이면 토크나이저가 쪼개므로 제외)"""
+    return [t for t in terms if len(t) == BIGRAM_LEN and t.isalnum()]
+
+
+def build_match_query(terms: List[str]) -> str:
+    # 각 단어를 큰따옴표 문자열로 감싸 FTS5 문법 문자를 무력화 (공백 = AND)
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def highlight_markup(text: Optional[str]) -> Optional[Markup]:
+    if text is None:
+        return None
+    escaped = html.escape(text)
+    return Markup(escaped.replace(_HL_OPEN, "<mark>").replace(_HL_CLOSE, "</mark>"))
+
+
+def highlight_terms(text: Optional[str], terms: List[str]) -> Optional[Markup]:
+    """posts_bigram 은 내용이 없어 highlight() 를 못 씀 → 제목에서 직접 표시"""
+    if not text or not terms:
+        return None
+    pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE)
+    return highlight_markup(pattern.sub(lambda m: _HL_OPEN + m.group(0) + _HL_CLOSE, text))
+
+
+def like_clause(terms: List[str], params: Dict[str, Any], prefix: str = "p.") -> str:
+    parts = []
+    for i, t in enumerate(terms):
+        name = f"q{i}"
+        params[name] = t
+        parts.append(
+            f"({prefix}title LIKE '%%' || :{name} || '%%' OR {prefix}content LIKE '%%' || :{name} || '%%')"
+        )
+    return " AND ".join(parts)
+
+
+async def search_posts(
+    where: str,
+    params: Dict[str, Any],
+    q: str,
+    page: int,
+    size: int,
+) -> Optional[Tuple[int, int, List[Dict[str, Any]]]]:
+    """
+    bm25 순위 검색. (총 건수, 보정된 page, 목록) 반환.
+    색인으로 찾을 단어가 없으면(한 글자/기호뿐) None → 호출측에서 LIKE 로 처리.
+    """
+    long_terms, short_terms = split_terms(q)
+    if long_terms:
+        table, match_terms = "posts_fts", long_terms
+        hl = """highlight(posts_fts, 0, :hl_open, :hl_close) AS title_hl,
+          snippet(posts_fts, 1, :hl_open, :hl_close, '…', 16) AS snippet"""
+        hl_params = {"hl_open": _HL_OPEN, "hl_close": _HL_CLOSE}
+    else:
+        match_terms = bigram_terms(short_terms)
+        if not match_terms:
+            return None
+        table, hl, hl_params = "posts_bigram", "NULL AS title_hl, NULL AS snippet", {}
+
+    params = dict(params, match=build_match_query(match_terms))
+    cond = f"{table} MATCH :match AND {where}"
+    if short_terms:
+        # bigram 조각 일치는 후보일 뿐 (단어가 실제로 붙어 있는지, 한 글자 단어) → LIKE 로 확인
+        cond += " AND " + like_clause(short_terms, params)
+
+    total_row = await database.fetch_one(f"""
+        SELECT COUNT(*) AS cnt
+        FROM {table} JOIN posts p ON p.id = {table}.rowid
+        WHERE {cond}
+    """, params)
+    total = total_row["cnt"] if total_row else 0
+    total_pages = max((total + size - 1) // size, 1)
+    page = min(page, total_pages)
+
+    rows = await database.fetch_all(f"""
+        SELECT
+          p.id, p.title, p.author, p.category,
+          p.created_at, p.updated_at,
+          p.views, p.likes,
+          {hl}
+        FROM {table} JOIN posts p ON p.id = {table}.rowid
+        WHERE {cond}
+        ORDER BY bm25({table}, 5.0, 1.0), p.created_at DESC
+        LIMIT :limit OFFSET :offset
+    """, dict(params, **hl_params, limit=size, offset=(page - 1) * size))
+
+    posts = []
+    for r in rows:
+        d = dict(r)
+        if table == "posts_fts":
+            d["title_hl"] = highlight_markup(d.get("title_hl"))
+            d["snippet"] = highlight_markup(d.get("snippet"))
+        else:
+            d["title_hl"] = highlight_terms(d.get("title"), short_terms)
+        posts.append(d)
+    return total, page, posts
@@ -0,0 +1,156 @@
+# routers/users/board/trending.py
+"""
+실시간 인기글(trendy / best) 순위.
+
+- 점수 = 부호·log10(참여도) + 작성시각 / TRENDING_DECAY_SEC
+  (참여도 = 조회·추천·비추천·댓글 가중합, TRENDING_DECAY_SEC 만큼 늦게 쓴 글은 참여도 10배와 같은 점수)
+- 시간이 점수에 더해지는 꼴이라 손대지 않은 글끼리의 순서는 변하지 않음
+  → 주기마다 바뀐 글(trending_dirty, 트리거가 기록)만 다시 계산하면 됨
+- 읽기·계산은 reader 에서, writer 는 배치마다 짧은 트랜잭션(결과 저장 + 읽은 gen 의 표시만 삭제)만 잡음
+  (그 사이 다시 바뀐 글은 gen 이 올라가 표시가 남고 다음 주기에 재계산)
+- 결과는 post_trending(score 인덱스)에 저장 → 홈/베스트 목록은 인덱스 순서대로 읽기 1번
+- TRENDING_WINDOW_DAYS 보다 오래된 글은 순위에서 제외
+"""
+import asyncio
+import math
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from database.connection import database
+from models.background import shutdown
+from .fragment_cache import fragment_cache
+
+TRENDING_REFRESH_SEC = float(os.getenv("TRENDING_REFRESH_SEC", "60"))
+TRENDING_DECAY_SEC = float(os.getenv("TRENDING_DECAY_SEC", "45000"))
+TRENDING_WINDOW_DAYS = int(os.getenv("TRENDING_WINDOW_DAYS", "7"))
+TRENDING_BATCH = int(os.getenv("TRENDING_BATCH", "500"))
+
+# 참여도 가중치
+W_VIEW, W_LIKE, W_DISLIKE, W_COMMENT = 0.1, 3.0, -2.0, 2.0
+
+
+def _epoch(created_at: Optional[str]) -> float:
+    """'YYYY-MM-DD HH:MM:SS' / ISO8601 → epoch 초 (TZ 없으면 UTC)"""
+    if not created_at:
+        return 0.0
+    s = created_at.strip()
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def trending_score(views: int, likes: int, dislikes: int, comments: int, created_ts: float) -> float:
+    engagement = views * W_VIEW + likes * W_LIKE + dislikes * W_DISLIKE + comments * W_COMMENT
+    order = math.log10(max(abs(engagement), 1.0))
+    sign = (engagement > 0) - (engagement < 0)
+    return round(sign * order + created_ts / TRENDING_DECAY_SEC, 7)
+
+
+_DIRTY_SQL = """
+    SELECT d.post_id AS id, d.gen, p.board, p.created_at, p.views, p.likes, p.dislikes,
+           (p.deleted = 0 AND COALESCE(p.is_published, 1) = 1) AS visible,
+           (SELECT COUNT(*) FROM comments c WHERE c.post_id = d.post_id AND c.deleted = 0) AS comments
+    FROM (SELECT post_id, gen FROM trending_dirty WHERE post_id > :after ORDER BY post_id LIMIT :limit) d
+    LEFT JOIN posts p ON p.id = d.post_id
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO post_trending (post_id, board, score, comment_count, created_ts)
+    VALUES (:post_id, :board, :score, :comment_count, :created_ts)
+    ON CONFLICT(post_id) DO UPDATE SET
+      board = excluded.board, score = excluded.score,
+      comment_count = excluded.comment_count, created_ts = excluded.created_ts
+"""
+
+_LIST_SQL = """
+    SELECT p.id, p.board, p.title, p.author, p.category, p.created_at, p.updated_at,
+           p.views, p.likes, p.dislikes, t.comment_count, t.score
+    FROM post_trending t
+    JOIN posts p ON p.id = t.post_id
+"""
+
+
+class TrendingEngine:
+    def __init__(self):
+        self.total = 0          # 순위에 있는 글 수 (갱신 때마다 반영)
+        self.last_run = 0.0
+
+    async def refresh(self) -> int:
+        """바뀐 글만 점수 재계산 + 기간 지난 글 제외. 처리한 글 수 반환"""
+        done, after = 0, 0
+        cutoff = time.time() - TRENDING_WINDOW_DAYS * 86400
+        while not shutdown.stopping:
+            # 트랜잭션 밖 SELECT → reader 풀 (댓글 수 집계 동안 writer 를 잡지 않음)
+            rows = await database.fetch_all(_DIRTY_SQL, {"after": after, "limit": TRENDING_BATCH})
+            if not rows:
+                break
+            upserts, removes = [], []
+            for r in rows:
+                created_ts = _epoch(r["created_at"]) if r["board"] is not None else 0.0
+                if r["board"] is None or not r["visible"] or created_ts < cutoff:
+                    removes.append({"post_id": r["id"]})
+                    continue
+                upserts.append({
+                    "post_id": r["id"], "board": r["board"],
+                    "score": trending_score(r["views"] or 0, r["likes"] or 0, r["dislikes"] or 0,
+                                            r["comments"], created_ts),
+                    "comment_count": r["comments"], "created_ts": int(created_ts),
+                })
+            async with database.transaction():
+                if upserts:
+                    await database.execute_many(_UPSERT_SQL, upserts)
+                if removes:
+                    await database.execute_many("DELETE FROM post_trending WHERE post_id = :post_id", removes)
+                await database.execute_many(
+                    "DELETE FROM trending_dirty WHERE post_id = :post_id AND gen = :gen",
+                    [{"post_id": r["id"], "gen": r["gen"]} for r in rows],
+                )
+            done += len(rows)
+            after = rows[-1]["id"]       # 한 주기에 한 바퀴만 (계속 바뀌는 글은 다음 주기에)
+            if len(rows) < TRENDING_BATCH:
+                break
+            await asyncio.sleep(0)       # 배치 사이에 다른 요청(로그인 등 쓰기)에 양보
+
+        await database.execute("DELETE FROM post_trending WHERE created_ts < :cutoff", {"cutoff": int(cutoff)})
+        row = await database.fetch_one("SELECT COUNT(*) AS cnt FROM post_trending")
+        self.total = row["cnt"] if row else 0
+        self.last_run = time.time()
+        if done:
+            fragment_cache.bump("best")
+        return done
+
+    async def top(self, limit: int = 20, offset: int = 0, board: Optional[str] = None) -> List[Dict[str, Any]]:
+        """점수 순 목록 (board 지정 시 해당 게시판만)"""
+        if board:
+            rows = await database.fetch_all(f"""
+                {_LIST_SQL}
+                WHERE t.board = :board
+                ORDER BY t.score DESC LIMIT :limit OFFSET :offset
+            """, {"board": board, "limit": limit, "offset": offset})
+        else:
+            rows = await database.fetch_all(f"""
+                {_LIST_SQL}
+                ORDER BY t.score DESC LIMIT :limit OFFSET :offset
+            """, {"limit": limit, "offset": offset})
+        return [dict(r) for r in rows]
+
+    async def run(self) -> None:
+        """lifespan 에서 백그라운드 태스크로 실행 (shutdown 신호로 종료)"""
+        while not shutdown.stopping:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"인기글 순위 갱신 오류: {e}")
+            if await shutdown.sleep(TRENDING_REFRESH_SEC):
+                return
+
+
+trending = TrendingEngine()
@@ -1,14 +1,27 @@
 from fastapi import APIRouter, Request, HTTPException, Query
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from routers.templating import templates
 from database.connection import database
 from .utils import validate_board, format_dt_to_kst
+from .view_counter import view_counter, viewer_key
+from .hot_posts import hot_posts
+from .etag import versions, make_etag, not_modified, with_etag
 from . import config
 from urllib.parse import urlencode
 from models.users import get_level_name
+from models.page_cache import page_cache
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+
+def _count_cached_view(scope, match):
+    """페이지 캐시가 대신 응답한 글 보기도 조회수/인기 집계 (비로그인 → IP 기준)"""
+    board, post_id = match.group(1), int(match.group(2))
+    if view_counter.hit(post_id, viewer_key(Request(scope)), board=board):
+        hot_posts.viewed(board, post_id)
+
+
+page_cache.on_hit(r"^/(\w+)/view/(\d+)/?$", _count_cached_view)
 
 @router.get("/{board}/view/{post_id}", response_class=HTMLResponse, name="user_board_view")
 async def user_board_view(
@@ -23,13 +36,16 @@ async def user_board_view(
 ):
     validate_board(board)
 
-    await database.execute("""
-        UPDATE posts SET views = views + 1
-        WHERE id = :id AND board = :board AND deleted = 0
-    """, {"id": post_id, "board": board})
+    # 이미 조회수에 잡힌 사용자의 새로고침/뒤로가기 → 글이 그대로면 쿼리 없이 304
+    viewer = viewer_key(request)
+    if view_counter.seen(post_id, viewer):
+        etag = make_etag(request, "view", board, post_id, versions.post(post_id), view_counter.pending(post_id))
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
 
     row = await database.fetch_one("""
-        SELECT p.id, p.title, p.content, p.author, p.category, p.user_id,
+        SELECT p.id, p.board, p.title, p.content, p.author, p.category, p.user_id,
                p.created_at, p.updated_at, p.views, p.likes, p.dislikes,
                u.level, u.exp
         FROM posts p
@@ -40,6 +56,11 @@ async def user_board_view(
         raise HTTPException(status_code=404, detail="게시글이 없습니다.")
 
     post = dict(row)
+
+    # 조회수는 메모리에 모았다가 주기적으로 일괄 반영 (읽기 요청이 쓰기 락을 잡지 않음)
+    if view_counter.hit(post_id, viewer, board=post["board"]):
+        hot_posts.viewed(post["board"], post_id)
+    post["views"] = (post.get("views") or 0) + view_counter.pending(post_id)
     post["created_at_fmt"] = format_dt_to_kst(post.get("created_at"))
     post["updated_at_fmt"] = format_dt_to_kst(post.get("updated_at"))
     
@@ -80,7 +101,8 @@ async def user_board_view(
     # 현재 로그인한 사용자 정보 가져오기
     current_user = request.session.get("user")
 
-    return templates.TemplateResponse(
+    etag = make_etag(request, "view", board, post_id, versions.post(post_id), view_counter.pending(post_id))
+    return with_etag(templates.TemplateResponse(
         "index.html",
         {
             "request": request,
@@ -93,4 +115,4 @@ async def user_board_view(
             "page": page, "size": size, "sort": sort, "q": q, "selected_category": category,
             "back_url": back_url,
         }
-    )
+    ), etag)
@@ -0,0 +1,109 @@
+# routers/users/board/view_counter.py
+"""
+조회수 write-behind 집계.
+
+- 글을 볼 때마다 UPDATE 하지 않고 메모리에 증가분만 모아 둠
+- 같은 사용자(로그인 id 또는 IP)가 VIEW_DEDUPE_SEC 안에 다시 보면 세지 않음 (새로고침/봇)
+- VIEW_FLUSH_SEC 마다, 그리고 종료(lifespan) 시 executemany 트랜잭션 1번으로 반영 (반영한 게시판의 목록 캐시 무효화)
+- 글 보기 ETag 는 (글 버전, 미반영 조회수) → 반영하면 미반영분이 0 으로 돌아가 옛 ETag 와 겹칠 수 있으므로 글 버전도 올림
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from database.connection import database
+from models.background import shutdown
+from .etag import versions
+from .fragment_cache import fragment_cache
+
+VIEW_DEDUPE_SEC = int(os.getenv("VIEW_DEDUPE_SEC", "600"))
+VIEW_FLUSH_SEC = float(os.getenv("VIEW_FLUSH_SEC", "5"))
+VIEW_DEDUPE_MAX = int(os.getenv("VIEW_DEDUPE_MAX", "200000"))  # 중복 판정용 기록 최대 개수
+
+
+def viewer_key(request) -> str:
+    """로그인 사용자는 id, 아니면 클라이언트 IP 기준"""
+    user = request.session.get("user") if "session" in request.scope else None
+    if isinstance(user, dict) and user.get("id"):
+        return f"u:{user['id']}"
+    client = request.client.host if request.client else "-"
+    return f"ip:{client}"
+
+
+class ViewCounter:
+    def __init__(self, dedupe_sec: int = VIEW_DEDUPE_SEC, max_seen: int = VIEW_DEDUPE_MAX):
+        self.dedupe_sec = dedupe_sec
+        self.max_seen = max_seen
+        self._pending: Dict[int, int] = {}
+        self._boards: Dict[int, str] = {}   # 반영 후 목록 캐시를 무효화할 게시판
+        # (viewer, post_id) → 마지막으로 센 시각 (오래된 것부터 정렬)
+        self._seen: "OrderedDict[tuple[str, int], float]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.dedupe_sec
+        seen = self._seen
+        while seen:
+            key, ts = next(iter(seen.items()))
+            if ts > cutoff and len(seen) <= self.max_seen:
+                break
+            seen.popitem(last=False)
+
+    def hit(self, post_id: int, viewer: str, now: Optional[float] = None, board: Optional[str] = None) -> bool:
+        """조회 1건 기록. 중복이면 False"""
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        key = (viewer, post_id)
+        if key in self._seen:
+            return False
+        self._seen[key] = now
+        self._pending[post_id] = self._pending.get(post_id, 0) + 1
+        if board:
+            self._boards[post_id] = board
+        return True
+
+    def seen(self, post_id: int, viewer: str, now: Optional[float] = None) -> bool:
+        """이 사용자의 조회가 이미 집계됐는지 (다시 봐도 조회수가 안 오르는지)"""
+        now = time.monotonic() if now is None else now
+        ts = self._seen.get((viewer, post_id))
+        return ts is not None and ts > now - self.dedupe_sec
+
+    def pending(self, post_id: int) -> int:
+        """아직 DB 에 반영되지 않은 증가분 (화면 표시용)"""
+        return self._pending.get(post_id, 0)
+
+    async def flush(self) -> int:
+        """모인 증가분을 한 트랜잭션으로 반영. 반영한 글 수 반환"""
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            boards, self._boards = self._boards, {}
+            try:
+                async with database.transaction():
+                    await database.execute_many(
+                        "UPDATE posts SET views = views + :delta WHERE id = :id",
+                        [{"id": pid, "delta": d} for pid, d in batch.items()],
+                    )
+            except Exception:
+                # 실패하면 다음 주기에 다시 시도 (증가분 유실 방지)
+                for pid, d in batch.items():
+                    self._pending[pid] = self._pending.get(pid, 0) + d
+                self._boards.update(boards)
+                raise
+            versions.bump_post(*batch)
+            fragment_cache.bump(*set(boards.values()))
+            return len(batch)
+
+    async def run(self) -> None:
+        """lifespan 에서 백그라운드 태스크로 실행 (shutdown 신호로 종료, 남은 분량은 lifespan 이 flush)"""
+        while not await shutdown.sleep(VIEW_FLUSH_SEC):
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"조회수 반영 오류: {e}")
+
+
+view_counter = ViewCounter()
@@ -5,25 +5,23 @@ from typing import List, Optional
 from datetime import datetime, timezone
 from urllib.parse import urlencode, quote
 import os
-from fastapi.templating import Jinja2Templates
-from database.connection import database
+from routers.templating import templates
+from database.connection import database, schema
 from .utils import validate_board, normalize_category, save_upload
+from .fragment_cache import fragment_cache
 from . import config
-from models.users import add_user_exp, increment_user_stats, EXP_RULES
+from models.users import EXP_RULES
+from models.exp_events import exp_queue
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 LOGIN_URL = "/login"  # 로그인 페이지 경로(프로젝트에 맞게 조정 가능)
 
 # --- helpers ---------------------------------------------------------------
 
-async def table_has_column(table: str, column: str) -> bool:
-    row = await database.fetch_one(
-        "SELECT 1 FROM pragma_table_info(:t) WHERE name = :c",
-        {"t": table, "c": column},
-    )
-    return row is not None
+def table_has_column(table: str, column: str) -> bool:
+    # 부팅 시 마이그레이션이 로드한 스키마에서 조회 (쿼리 없음)
+    return schema.has_column(table, column)
 
 def get_current_user(request: Request) -> Optional[dict]:
     """
@@ -169,7 +167,7 @@ async def invest_write_post(
                 await file.close()
 
     # 저장 쿼리 구성: posts.user_id 컬럼 존재 시 함께 저장
-    has_user_id = await table_has_column("posts", "user_id")
+    has_user_id = table_has_column("posts", "user_id")
     created_iso = datetime.now(timezone.utc).isoformat(timespec="seconds")
 
     if has_user_id:
@@ -191,8 +189,8 @@ async def invest_write_post(
         }
     else:
         # user_id가 없을 때도 updated_at / deleted가 있으면 맞춰서 저장
-        has_updated_at = await table_has_column("posts", "updated_at")
-        has_deleted = await table_has_column("posts", "deleted")
+        has_updated_at = table_has_column("posts", "updated_at")
+        has_deleted = table_has_column("posts", "deleted")
 
         cols = ["board","title","content","author","category","views","likes","created_at"]
         vals = [":board",":title",":content",":author",":category",":views",":likes",":created_at"]
@@ -208,13 +206,11 @@ async def invest_write_post(
         sql = f"INSERT INTO posts ({', '.join(cols)}) VALUES ({', '.join(vals)})"
 
     await database.execute(sql, params)
+    fragment_cache.bump("invest")
 
     # ✅ 등급 시스템: 게시글 작성 경험치 추가
-    try:
-        await add_user_exp(user.get("id"), EXP_RULES["post_created"], "post_created")
-        await increment_user_stats(user.get("id"), "posts")
-    except Exception as e:
-        print(f"등급 시스템 오류: {e}")
+    # (exp_queue 가 모아서 반영하므로 응답을 기다리게 하지 않음)
+    exp_queue.add(user.get("id"), EXP_RULES["post_created"], "post_created", total_posts=1)
 
     # 저장 후 목록 상태로 복귀
     back_params = {}
@@ -1,14 +1,13 @@
 # routers/users/profile.py
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from database.connection import database
+from routers.templating import templates
+from models.user_repo import user_repo
 
 from models.users import get_user_level_info
 from routers.users.auth import get_current_user
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 @router.get("/profile", response_class=HTMLResponse)
 async def user_profile(request: Request, current_user = Depends(get_current_user)):
@@ -17,10 +16,9 @@ async def user_profile(request: Request, current_user = Depends(get_current_user
     # 사용자 등급 정보 조회
     level_info = await get_user_level_info(current_user["id"])
     
-    # 사용자 포인트 정보 조회
-    user_query = "SELECT points FROM users WHERE id = :user_id"
-    user_result = await database.fetch_one(user_query, {"user_id": current_user["id"]})
-    user_points = user_result["points"] if user_result else 0
+    # 사용자 포인트 정보 조회 (등급 정보와 같은 레코드 - 요청 memo 에서 바로 읽음)
+    user = await user_repo.get(current_user["id"])
+    user_points = user["points"] if user else 0
     
     return templates.TemplateResponse("users/profile.html", {
         "request": request,
@@ -0,0 +1,362 @@
+# seed.py
+"""
+대용량 테스트 DB 생성기 (성능 측정용).
+
+    python seed.py --db /tmp/big.sqlite3 --users 100000 --posts 1000000
+    python seed.py --db /tmp/big.sqlite3 --posts 200000 --append     # 기존 DB 에 더 넣기
+
+- 스키마는 앱과 같은 create_tables()(database/migrations.py)로 만든 뒤 sqlite3 executemany 로 적재
+- 게시판은 ALLOWED_BOARDS 전체, 말머리는 USER_BOARD_TABS (인기 탭 제외, 공지는 드물게)
+- 글/댓글/반응(post_reactions: like/hit/bomb)을 쓰는 사용자, 글의 인기(조회·댓글·반응)는 Zipf/파레토 분포
+- 글은 id 순서 = 작성 시각 순서, 최근일수록 촘촘
+- 사용자 경험치/등급/누적 수치는 실제 활동량에서 EXP_RULES 로 계산 → 등급 분포도 자연스럽게 긴 꼬리
+- 적재 중에는 posts/comments/post_reactions 의 인덱스와 트리거를 내려 두었다가 끝나고 다시 만들고,
+  트리거가 유지하던 테이블(posts_fts, posts_bigram, board_counters, trending_dirty)은 한 번에 다시 채움
+- 시드 사용자 비밀번호는 모두 SEED_PASSWORD (기본 seed1234)
+"""
+import argparse
+import asyncio
+import bisect
+import os
+import random
+import sqlite3
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import accumulate, islice
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+SEED_PASSWORD = os.getenv("SEED_PASSWORD", "seed1234")
+
+# ── 한국어 텍스트 재료 ──
+BOARD_TOPICS = {
+    "invest":  ["비트코인", "이더리움", "삼성전자", "엔비디아", "테슬라", "코스피", "나스닥", "배당주", "금리", "환율", "ETF", "공모주"],
+    "best":    ["오늘의 베스트", "화제의 글", "레전드", "명예의 전당", "실시간 이슈"],
+    "game":    ["롤", "발로란트", "메이플", "로스트아크", "배그", "스팀 세일", "닌텐도", "신작", "패치", "랭크"],
+    "sports":  ["손흥민", "김하성", "KBO", "프리미어리그", "챔스", "NBA", "국가대표", "이적시장", "직관", "하이라이트"],
+    "gallery": ["풍경 사진", "야경", "고양이", "강아지", "필름 카메라", "출사", "노을", "벚꽃", "단풍", "바다"],
+    "free":    ["점심 메뉴", "출근길", "주말 계획", "퇴근", "운동", "다이어트", "여행", "넷플릭스", "자취", "이사"],
+    "humor":   ["짤", "드립", "웃긴 썰", "레전드 댓글", "반전", "공감", "오늘의 유머", "밈"],
+    "report":  ["버그", "오류", "건의사항", "신고", "개선 요청", "불편사항", "스팸", "광고"],
+}
+TITLE_TAILS = ["어떻게 보시나요?", "질문 있습니다", "후기 남깁니다", "정리해봤습니다", "이거 실화냐", "다들 어떠세요",
+               "궁금한 점", "소식 공유", "간단 요약", "생각보다 괜찮네요", "진짜 대박", "이번엔 다르다", "의견 부탁드립니다"]
+SUBJECTS = ["요즘", "오늘", "어제", "이번 주", "개인적으로", "솔직히", "확실히", "아무래도", "생각해보면", "제가 보기엔"]
+OBJECTS = ["분위기가", "흐름이", "반응이", "가격이", "결과가", "상황이", "평가가", "전망이", "컨디션이", "퀄리티가"]
+PREDICATES = ["좋아 보입니다", "애매하네요", "나쁘지 않습니다", "심상치 않습니다", "예상보다 낫네요", "조금 걱정됩니다",
+              "완전히 달라졌어요", "계속 이어질 것 같아요", "꽤 인상적이었습니다", "기대 이상이었어요"]
+COMMENTS = ["좋은 글 감사합니다", "저도 같은 생각이에요", "정보 감사합니다!", "ㅋㅋㅋㅋ 공감", "이건 좀 아닌 듯",
+            "추천 누르고 갑니다", "출처가 어디인가요?", "와 대박이네요", "다음 글도 기대할게요", "ㄹㅇ 인정합니다",
+            "저는 반대 의견입니다", "잘 읽었습니다", "오 유익하네요", "이거 진짜인가요?", "꿀팁 감사합니다"]
+NICK_ADJ = ["행복한", "배고픈", "졸린", "용감한", "조용한", "빠른", "느긋한", "수상한", "귀여운", "성실한", "엉뚱한", "차분한"]
+NICK_NOUN = ["고양이", "호랑이", "다람쥐", "개발자", "투자자", "여행자", "직장인", "감자", "펭귄", "부엉이", "수달", "곰"]
+
+
+class Zipf:
+    """순위 k 의 확률 ∝ 1/k^s 인 표본기 (순위 → 값 매핑은 섞어서 id 와 무관하게)"""
+
+    def __init__(self, values, s: float, rng: random.Random):
+        self.values = list(values)
+        rng.shuffle(self.values)
+        self.cum = list(accumulate(1.0 / (k ** s) for k in range(1, len(self.values) + 1)))
+        self.total = self.cum[-1]
+        self.rng = rng
+
+    def pick(self):
+        return self.values[bisect.bisect_left(self.cum, self.rng.random() * self.total)]
+
+
+def _iso(ts: float) -> str:
+    # 앱(write.py)과 같은 형식
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+
+def _sentence(rng: random.Random, topic: str) -> str:
+    return f"{rng.choice(SUBJECTS)} {topic} {rng.choice(OBJECTS)} {rng.choice(PREDICATES)}."
+
+
+def _batched(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bulk(conn: sqlite3.Connection, label: str, sql: str, rows, batch: int) -> int:
+    """batch 행씩 트랜잭션 1번 + executemany"""
+    total, started = 0, time.perf_counter()
+    for chunk in _batched(rows, batch):
+        with conn:
+            conn.executemany(sql, chunk)
+        total += len(chunk)
+        rate = total / max(time.perf_counter() - started, 1e-9)
+        print(f"\r  {label}: {total:,}행 ({rate:,.0f}행/초)", end="", flush=True)
+    print()
+    return total
+
+
+def _suspend(conn: sqlite3.Connection, tables) -> list:
+    """tables 의 (자동 생성이 아닌) 인덱스/트리거 DDL 을 저장하고 삭제"""
+    marks = ",".join("?" * len(tables))
+    saved = conn.execute(f"""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND tbl_name IN ({marks}) AND sql IS NOT NULL
+    """, tables).fetchall()
+    with conn:
+        for kind, name, _ in saved:
+            conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+    return saved
+
+
+def _restore(conn: sqlite3.Connection, saved: list) -> None:
+    with conn:
+        for _, _, sql in saved:
+            conn.execute(sql)
+
+
+def _prepare_schema(db_path: str) -> None:
+    """앱과 같은 마이그레이션으로 스키마 생성/갱신"""
+    from database.connection import DB_PATH, create_tables, database
+    if DB_PATH != db_path:   # 앱 모듈이 먼저 import 되면 운영 DB 를 건드리게 됨
+        sys.exit(f"DB_PATH 불일치: {DB_PATH} != {db_path}")
+
+    async def run():
+        await create_tables()
+        await database.disconnect()
+
+    asyncio.run(run())
+
+
+def seed(args) -> None:
+    from database.migrations import bigrams
+    from models.passwords import BCRYPT_ROUNDS
+    from models.users import EXP_RULES, level_sql
+    from routers.users.board.config import ALLOWED_BOARDS, USER_BOARD_TABS
+    from routers.users.board.trending import TRENDING_WINDOW_DAYS
+    import bcrypt
+
+    rng = random.Random(args.seed)
+    _prepare_schema(args.db)
+
+    conn = sqlite3.connect(args.db)
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA cache_size=-{256 * 1024}")
+
+    existing = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+    if existing and not args.append:
+        sys.exit(f"{args.db} 에 이미 글이 {existing:,}개 있습니다. 추가하려면 --append")
+
+    user_base = conn.execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0]
+    post_base = conn.execute("SELECT COALESCE(MAX(id), 0) FROM posts").fetchone()[0]
+    comment_cols = {r[1] for r in conn.execute("PRAGMA table_info(comments)")}
+
+    now = time.time()
+    start = now - args.days * 86400
+    span = now - start
+    password = bcrypt.hashpw(SEED_PASSWORD.encode("utf-8"), bcrypt.gensalt(BCRYPT_ROUNDS)).decode("utf-8")
+
+    # ── 사용자 ──
+    user_ids = range(user_base + 1, user_base + args.users + 1)
+    nick = {}
+
+    def users():
+        for uid in user_ids:
+            nickname = f"{rng.choice(NICK_ADJ)}{rng.choice(NICK_NOUN)}{uid}"
+            nick[uid] = nickname
+            joined = _iso(start - rng.random() * 30 * 86400 + (uid - user_base) / args.users * span)
+            yield (uid, f"{args.prefix}{uid}", nickname, nickname, f"{args.prefix}{uid}@example.com",
+                   password, joined)
+
+    print(f"대상 DB: {args.db}")
+    _bulk(conn, "users", """
+        INSERT INTO users (id, user_id, name, nickname, email, password, joined_at, role, status, deleted)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 'user', 'active', 0)
+    """, users(), args.batch)
+
+    # 글쓴이 / 댓글 / 반응하는 사용자는 Zipf (소수가 대부분 활동)
+    writers = Zipf(user_ids, args.zipf, rng)
+    actors = Zipf(user_ids, args.zipf * 0.8, rng)
+    boards = sorted(ALLOWED_BOARDS)
+    board_pick = Zipf(boards, 1.0, rng)
+    categories = {
+        b: [c for c in USER_BOARD_TABS.get(b, []) if c not in ("인기", "공지")] or ["일반"]   # 말머리 NULL 이면 홈 템플릿이 깨짐
+        for b in boards
+    }
+
+    saved = _suspend(conn, ("posts", "comments", "post_reactions"))
+    comments_q, reactions_q = [], []   # 글마다 (post_id, created_ts, 개수) 를 모아 두었다가 다음 단계에서 생성
+
+    # ── 글 ── (id 순서 = 시간 순서, sqrt 로 최근일수록 촘촘)
+    def posts():
+        for i in range(args.posts):
+            pid = post_base + 1 + i
+            ts = min(start + span * ((i + rng.random()) / args.posts) ** 0.5, now)
+            board = board_pick.pick()
+            topic = rng.choice(BOARD_TOPICS.get(board, BOARD_TOPICS["free"]))
+            category = "공지" if rng.random() < 0.002 else rng.choice(categories[board])
+            uid = writers.pick()
+            # 인기(파레토) → 조회수 / 댓글 수 / 반응 수
+            pop = min(rng.paretovariate(1.2), 2000.0)
+            views = int(pop * 30 + rng.random() * 20)
+            n_comments = int(pop / 6 * args.comments * rng.uniform(0.5, 1.5))
+            n_reactions = min(int(pop / 6 * args.reactions * rng.uniform(0.5, 1.5)), args.users)
+            n_bomb = int(n_reactions * rng.uniform(0.0, 0.25))
+            n_hit = int((n_reactions - n_bomb) * rng.uniform(0.0, 0.3))
+            likes, dislikes = n_reactions - n_bomb, n_bomb
+            if n_comments:
+                comments_q.append((pid, ts, n_comments))
+            if n_reactions:
+                reactions_q.append((pid, ts, n_reactions, n_hit, n_bomb))
+            title = f"[{topic}] {rng.choice(TITLE_TAILS)}"
+            content = " ".join(_sentence(rng, topic) for _ in range(rng.randint(2, 8)))
+            created = _iso(ts)
+            yield (pid, board, title, content, nick.get(uid) or f"user{uid}", category, created, created,
+                   views, likes, dislikes, uid)
+
+    _bulk(conn, "posts", """
+        INSERT INTO posts (id, board, title, content, author, category, created_at, updated_at,
+                           views, likes, dislikes, user_id, deleted, is_published)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 1)
+    """, posts(), args.batch)
+
+    # ── 댓글 ── (옛 스키마에만 comments.user_id 가 있어 사용자별 댓글 수는 여기서 셈)
+    with_user = "user_id" in comment_cols
+    comment_counts = Counter()
+
+    def comments():
+        for pid, ts, n in comments_q:
+            for _ in range(n):
+                uid = actors.pick()
+                comment_counts[uid] += 1
+                created = _iso(min(ts + rng.expovariate(1 / 7200), now))
+                row = (pid, nick.get(uid) or f"user{uid}", rng.choice(COMMENTS), created)
+                yield row + (uid,) if with_user else row
+
+    _bulk(conn, "comments", f"""
+        INSERT INTO comments (post_id, author, content, created_at{', user_id' if with_user else ''})
+        VALUES (?, ?, ?, ?{', ?' if with_user else ''})
+    """, comments(), args.batch)
+    comments_q.clear()
+
+    # ── 반응 (추천 / 히트 / 폭망, 글마다 서로 다른 사용자) ──
+    def reactions():
+        for pid, ts, n, n_hit, n_bomb in reactions_q:
+            seen = set()
+            tries = 0
+            while len(seen) < n and tries < n * 4:
+                seen.add(actors.pick())
+                tries += 1
+            for k, uid in enumerate(seen):
+                kind = "bomb" if k < n_bomb else "hit" if k < n_bomb + n_hit else "like"
+                yield (pid, uid, kind, _iso(min(ts + rng.expovariate(1 / 3600), now)))
+
+    _bulk(conn, "post_reactions", """
+        INSERT OR IGNORE INTO post_reactions (post_id, user_id, kind, created_at) VALUES (?, ?, ?, ?)
+    """, reactions(), args.batch)
+    reactions_q.clear()
+
+    # ── 인덱스/트리거 복구 + 트리거가 유지하던 테이블 재계산 ──
+    print("  인덱스/트리거 다시 생성...", flush=True)
+    with conn:
+        # 중복 사용자로 반응이 덜 들어간 글은 실제 반응 수로 맞춤 (트리거 복구 전 → 인기글 표시가 전부 생기지 않게)
+        conn.execute("""
+            UPDATE posts SET
+              likes = (SELECT COUNT(*) FROM post_reactions r WHERE r.post_id = posts.id AND r.kind IN ('like', 'hit')),
+              dislikes = (SELECT COUNT(*) FROM post_reactions r WHERE r.post_id = posts.id AND r.kind = 'bomb')
+            WHERE id > ?
+        """, (post_base,))
+    _restore(conn, saved)
+    with conn:
+        conn.execute("""
+            INSERT INTO posts_fts(rowid, title, content)
+            SELECT id, title, content FROM posts WHERE id > ? AND deleted = 0
+        """, (post_base,))
+        new_posts = conn.execute("SELECT id, title, content FROM posts WHERE id > ? AND deleted = 0", (post_base,))
+        conn.executemany(
+            "INSERT INTO posts_bigram(rowid, title, content) VALUES (?, ?, ?)",
+            ((pid, bigrams(title), bigrams(content)) for pid, title, content in new_posts),
+        )
+        conn.execute("DELETE FROM board_counters")
+        conn.execute("""
+            INSERT INTO board_counters (board, category, post_count)
+            SELECT board, COALESCE(category, ''), COUNT(*)
+            FROM posts
+            WHERE deleted = 0 AND COALESCE(is_published, 1) = 1
+            GROUP BY board, COALESCE(category, '')
+        """)
+        conn.execute("""
+            INSERT OR IGNORE INTO trending_dirty (post_id)
+            SELECT id FROM posts WHERE id > ? AND created_at >= ?
+        """, (post_base, _iso(now - TRENDING_WINDOW_DAYS * 86400)))   # 순위 기간 안의 글만
+
+    # ── 사용자 누적 수치 / 경험치 / 등급 (EXP_RULES 기준) ──
+    print("  사용자 활동량/등급 계산...", flush=True)
+    with conn:
+        conn.execute("""
+            CREATE TEMP TABLE seed_totals (
+              user_id INTEGER PRIMARY KEY, posts INTEGER NOT NULL DEFAULT 0,
+              likes INTEGER NOT NULL DEFAULT 0, comments INTEGER NOT NULL DEFAULT 0)
+        """)
+        conn.execute("""
+            INSERT INTO seed_totals (user_id, posts, likes)
+            SELECT user_id, COUNT(*), SUM(likes) FROM posts WHERE id > ? AND deleted = 0 GROUP BY user_id
+        """, (post_base,))
+        conn.executemany("""
+            INSERT INTO seed_totals (user_id, comments) VALUES (?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET comments = excluded.comments
+        """, comment_counts.items())
+        conn.execute(f"""
+            UPDATE users SET
+              total_posts = COALESCE(total_posts, 0) + t.posts,
+              total_likes = COALESCE(total_likes, 0) + t.likes,
+              total_comments = COALESCE(total_comments, 0) + t.comments,
+              exp = COALESCE(exp, 0) + t.posts * {int(EXP_RULES['post_created'])}
+                                     + t.comments * {int(EXP_RULES['comment_created'])}
+                                     + t.likes * {int(EXP_RULES['post_liked'])}
+            FROM seed_totals t WHERE t.user_id = users.id
+        """)
+        conn.execute(f"UPDATE users SET level = {level_sql('exp')} WHERE id > ?", (user_base,))
+        conn.execute("DROP TABLE seed_totals")
+
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    for table in ("users", "posts", "comments", "post_reactions"):
+        print(f"  {table}: {conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]:,}행")
+    levels = conn.execute("SELECT level, COUNT(*) FROM users GROUP BY level ORDER BY level").fetchall()
+    print("  등급 분포: " + ", ".join(f"{lv}:{n:,}" for lv, n in levels))
+    conn.close()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="성능 측정용 대용량 DB 생성")
+    p.add_argument("--db", required=True, help="대상 SQLite 파일 (없으면 생성)")
+    p.add_argument("--users", type=int, default=10000)
+    p.add_argument("--posts", type=int, default=100000)
+    p.add_argument("--comments", type=float, default=3.0, help="글당 평균 댓글 수")
+    p.add_argument("--reactions", type=float, default=5.0, help="글당 평균 반응(추천/히트/폭망) 수")
+    p.add_argument("--days", type=int, default=365, help="글 작성 기간 (오늘까지)")
+    p.add_argument("--zipf", type=float, default=1.1, help="사용자 활동 Zipf 지수")
+    p.add_argument("--batch", type=int, default=50000, help="트랜잭션당 행 수")
+    p.add_argument("--prefix", default="seed", help="시드 사용자 아이디/이메일 접두사")
+    p.add_argument("--seed", type=int, default=42, help="난수 시드 (같은 값이면 같은 데이터)")
+    p.add_argument("--append", action="store_true", help="글이 있는 DB 에도 추가")
+    args = p.parse_args()
+    if args.users < 1:
+        p.error("--users 는 1 이상")
+    # 앱 모듈(database.connection)을 import 하기 전에 대상 DB 를 지정
+    args.db = os.path.abspath(args.db)
+    os.environ["DB_PATH"] = args.db
+
+    started = time.perf_counter()
+    seed(args)
+    print(f"✅ 완료 ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()